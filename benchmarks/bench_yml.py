@@ -0,0 +1,84 @@
+"""
+Benchmark the YAML plugin on generated Kubernetes/Helm manifests.
+Not collected by pytest; run with `make bench` or:
+
+    python3 benchmarks/bench_yml.py --size 50
+"""
+
+import argparse
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from whispers.plugins.yml import SafeLoader, Yml
+
+MANIFEST = """---
+apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: service-{idx}
+  labels:
+    app: service-{idx}
+    release: {{{{ .Release.Name }}}}
+spec:
+  replicas: 3
+  template:
+    spec:
+      containers:
+        - name: app
+          image: {{{{ .Values.image }}}}
+          env:
+            - name: DATABASE_URL
+              value: postgres://user:hardcoded{idx}@db:5432/app
+            - name: API_TOKEN
+              valueFrom:
+                secretKeyRef:
+                  name: service-{idx}
+                  key: token
+{{% if .Values.debug %}}
+            - name: DEBUG
+              value: "true"
+{{% endif %}}
+          ports:
+            - containerPort: 8080
+"""
+
+
+def make_manifests(path: Path, size: int) -> None:
+    """Write documents until the file is at least size MB"""
+    with path.open("w") as fh:
+        idx = 0
+        while fh.tell() < size * 1024 * 1024:
+            fh.write(MANIFEST.format(idx=idx))
+            idx += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", default=50, type=int, help="manifest size in MB (default: 50)")
+    parser.add_argument("--repeat", default=1, type=int, help="timed runs (default: 1)")
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir).joinpath("manifests.yml")
+        make_manifests(path, args.size)
+        size = path.stat().st_size / 1024 / 1024
+        print(f"{path.name}: {size:.1f} MB, loader {SafeLoader.__name__}")
+
+        for run in range(1, args.repeat + 1):
+            start = perf_counter()
+            Yml.preprocess(path.read_text())
+            preprocessed = perf_counter() - start
+
+            start = perf_counter()
+            pairs = sum(1 for _ in Yml().pairs(path))
+            elapsed = perf_counter() - start
+
+            print(
+                f"run {run}: preprocess {preprocessed:.2f}s, pairs {elapsed:.2f}s "
+                f"({size / elapsed:.1f} MB/s, {pairs} pairs)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,7 +31,7 @@ setup(
     setup_requires=["pytest-runner"],
     tests_require=dev_requires,
     extras_require={"dev": dev_requires},
-    entry_points={"console_scripts": ["whispers=whispers.main:main"]},
+    entry_points={"console_scripts": ["whispers=whispers.main:main", "whispers-client=whispers.client:main"]},
     classifiers=[
         "License :: OSI Approved :: BSD License",
     ],
@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def user_cache_home(tmp_path_factory):
+    """Keep rule snapshots written by tests out of the real ~/.cache"""
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("XDG_CACHE_HOME", tmp_path_factory.mktemp("cache").as_posix())
+        yield
@@ -34,6 +34,11 @@ def rule_path(filename: str = "") -> str:
     return RULE_PATH.joinpath(filename).as_posix()
 
 
+def pair_line(pair) -> int:
+    """Line of a parsed pair, found as for findings if deferred"""
+    return pair.line() if callable(pair.line) else pair.line
+
+
 def forbidden_path() -> str:
     # Linux & MacOS
     if os.name == "posix":
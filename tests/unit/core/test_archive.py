@@ -0,0 +1,111 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from whispers.core.archive import archive_members, is_archive
+from whispers.core.args import parse_args
+from whispers.main import run
+from whispers.models.source import MemoryFile
+
+
+def make_zip(files: dict) -> bytes:
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+
+    return data.getvalue()
+
+
+def make_tar(files: dict) -> bytes:
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w:gz") as archive:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+
+    return data.getvalue()
+
+
+@pytest.fixture
+def jar(tmp_path):
+    inner = make_zip({"config/.npmrc": "//registry.npmjs.org/:_authToken=hardcoded1234567890\n"})
+    outer = make_zip(
+        {
+            "META-INF/": "",
+            "BOOT-INF/classes/application.yml": "spring:\n  datasource:\n    password: hardcoded123\n",
+            "BOOT-INF/lib/inner.zip": inner,
+        }
+    )
+    path = tmp_path.joinpath("outer.jar")
+    path.write_bytes(outer)
+    return path
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("app.jar", True),
+        ("app.WAR", True),
+        ("pkg-1.0-py3-none-any.whl", True),
+        ("release.tar.gz", True),
+        ("release.tgz", True),
+        ("archive.zip", True),
+        ("data.json.gz", False),
+        ("jar.yml", False),
+    ],
+)
+def test_is_archive(name, expected):
+    assert is_archive(MemoryFile(name, b"")) is expected
+
+
+def test_archive_members_zip(jar):
+    members = {member.as_posix(): member.read_bytes() for member in archive_members(jar)}
+    assert list(members) == [
+        f"{jar.as_posix()}!/BOOT-INF/classes/application.yml",
+        f"{jar.as_posix()}!/BOOT-INF/lib/inner.zip!/config/.npmrc",
+    ]
+    assert members[f"{jar.as_posix()}!/BOOT-INF/classes/application.yml"].endswith(b"hardcoded123\n")
+
+
+def test_archive_members_tar(tmp_path):
+    path = tmp_path.joinpath("release.tar.gz")
+    path.write_bytes(make_tar({"release/beans.xml": b"<password>hardcoded</password>"}))
+    members = list(archive_members(path))
+    assert [member.as_posix() for member in members] == [f"{path.as_posix()}!/release/beans.xml"]
+    assert members[0].read_text() == "<password>hardcoded</password>"
+
+
+def test_archive_members_depth(jar, monkeypatch):
+    monkeypatch.setattr("whispers.core.archive.ARCHIVE_MAX_DEPTH", 1)
+    assert [member.name for member in archive_members(jar)] == ["application.yml"]
+
+
+def test_archive_members_size(jar, monkeypatch):
+    monkeypatch.setattr("whispers.core.archive.ARCHIVE_MAX_SIZE", 60)
+    assert [member.name for member in archive_members(jar)] == ["application.yml"]
+
+    monkeypatch.setattr("whispers.core.archive.ARCHIVE_MAX_SIZE", 10)
+    assert list(archive_members(jar)) == []
+
+
+def test_archive_members_invalid(tmp_path):
+    path = tmp_path.joinpath("invalid.jar")
+    path.write_bytes(b"not an archive")
+    assert list(archive_members(path)) == []
+
+
+def test_run_archive(jar):
+    secrets = list(run(parse_args(["-j", "1", "-F", "None", jar.as_posix()])))
+    assert [(secret.file, secret.value, secret.line) for secret in secrets if secret.key != "file"] == [
+        (f"{jar.as_posix()}!/BOOT-INF/classes/application.yml", "hardcoded123", 3),
+        (f"{jar.as_posix()}!/BOOT-INF/lib/inner.zip!/config/.npmrc", "hardcoded1234567890", 1),
+    ]
+
+
+def test_run_archive_excluded(jar):
+    secrets = list(run(parse_args(["-j", "1", "-F", ".*/BOOT-INF/lib/", jar.as_posix()])))
+    assert [secret.value for secret in secrets] == ["hardcoded123"]
@@ -11,6 +11,7 @@ import pytest
 from tests.unit.conftest import config_path, does_not_raise, tmp_path
 from whispers.__version__ import __version__, __whispers__
 from whispers.core.args import argument_parser, parse_args, show_config, show_info, show_splash
+from whispers.core.utils import cpu_count
 
 
 def test_argument_parser():
@@ -22,6 +23,19 @@ def test_argument_parser():
     [
         (["src"], "src", "src", does_not_raise()),
         (["src"], "output", stdout, does_not_raise()),
+        (["src"], "format", "json", does_not_raise()),
+        (["src"], "serve", None, does_not_raise()),
+        (["src"], "diff", None, does_not_raise()),
+        (["--diff", "main..HEAD", "src"], "diff", "main..HEAD", does_not_raise()),
+        (["--staged", "src"], "staged", True, does_not_raise()),
+        (["--history", "src"], "history", True, does_not_raise()),
+        (["--added-only", "src"], "added_only", True, does_not_raise()),
+        (["-"], "src", "-", does_not_raise()),
+        (["-"], "stdin_name", "stdin.txt", does_not_raise()),
+        (["--stdin-name", "config.yml", "-"], "stdin_name", "config.yml", does_not_raise()),
+        (["--serve", "/tmp/w.sock"], "serve", "/tmp/w.sock", does_not_raise()),
+        (["--format", "sarif", "src"], "format", "sarif", does_not_raise()),
+        (["--format", "xml", "src"], "format", None, pytest.raises(SystemExit)),
         (
             ["-c", config_path("detection_by_value.yml"), "src"],
             "config",
@@ -33,6 +47,9 @@ def test_argument_parser():
         (["-s", "a,b,c", "src"], "severity", ["a", "b", "c"], does_not_raise()),
         (["-f", "*.json", "src"], "files", ["*.json"], does_not_raise()),
         (["-F", ".*\\.(yml|json)", "src"], "xfiles", compile(r".*\.(yml|json)"), does_not_raise()),
+        (["-j", "3", "src"], "jobs", 3, does_not_raise()),
+        (["-j", "0", "src"], "jobs", cpu_count(), does_not_raise()),
+        (["src"], "jobs", cpu_count(), does_not_raise()),
         (["-a", "src"], "ast", True, does_not_raise()),
         (["src"], "ast", False, does_not_raise()),
         (["--info"], "info", True, pytest.raises(SystemExit)),
@@ -0,0 +1,132 @@
+import os
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from tests.unit.conftest import fixture_path
+from whispers.core.args import parse_args
+from whispers.core.cache import ScanCache, cache_fingerprint, evict_cache, load_cache
+from whispers.core.config import load_config
+from whispers.core.rules import load_rules
+from whispers.core.secrets import scan_file
+from whispers.main import run
+from whispers.models.pair import KeyValuePair
+
+
+def load(argv):
+    args = parse_args(argv)
+    config = load_config(args)
+    rules = load_rules(args, config)
+    return args, config, rules
+
+
+def test_load_cache(tmp_path):
+    args, config, rules = load([fixture_path()])
+    assert load_cache(args, config, rules) is None
+
+    args, config, rules = load(["--cache", tmp_path.as_posix(), fixture_path()])
+    assert isinstance(load_cache(args, config, rules), ScanCache)
+
+
+def test_cache_fingerprint():
+    _, config, rules = load([fixture_path()])
+    assert cache_fingerprint(config, rules) == cache_fingerprint(config, rules)
+    assert cache_fingerprint(config, rules) != cache_fingerprint(config, rules[1:])
+
+    _, xconfig, _ = load(["-F", "None", fixture_path()])
+    assert cache_fingerprint(config, rules) != cache_fingerprint(xconfig, rules)
+
+
+@pytest.mark.parametrize(("option", "value"), [("ast", True), ("json_stream_size", 1), ("html_scripts", True)])
+def test_cache_fingerprint_options(option, value):
+    _, config, rules = load([fixture_path()])
+    fingerprint = cache_fingerprint(config, rules)
+    setattr(config, option, value)
+    assert cache_fingerprint(config, rules) != fingerprint
+
+
+def test_scan_file_cached(tmp_path, mocker):
+    file = tmp_path.joinpath("passwords.yml")
+    shutil.copy(fixture_path("passwords.yml"), file)
+    _, config, rules = load([file.as_posix()])
+    cache = ScanCache(tmp_path.joinpath("cache"), config, rules)
+
+    expected = list(map(KeyValuePair.to_json, scan_file(config, rules, file)))
+    assert expected
+
+    miss = list(map(KeyValuePair.to_json, scan_file(config, rules, file, cache)))
+    assert miss == expected
+    assert cache.entry(cache.key(file)).exists()
+
+    make_pairs = mocker.patch("whispers.core.secrets.make_pairs")
+    hit = list(map(KeyValuePair.to_json, scan_file(config, rules, file, cache)))
+    assert hit == expected
+    make_pairs.assert_not_called()
+
+    file.write_text("password: changed_hardcoded_value\n")
+    scan_file(config, rules, file, cache)
+    make_pairs.assert_called_once()
+
+
+def test_cache_portable(tmp_path):
+    src = fixture_path("passwords.yml")
+    cachedir = tmp_path.joinpath("cache")
+    expected = list(map(KeyValuePair.to_json, run(parse_args(["--cache", cachedir.as_posix(), src]))))
+
+    restored = tmp_path.joinpath("restored")
+    shutil.copytree(cachedir, restored)
+    _, config, rules = load([src])
+    cache = ScanCache(restored, config, rules)
+    assert list(map(KeyValuePair.to_json, cache.load(cache.key(Path(src)), Path(src)))) == expected
+
+
+def test_cache_archive(tmp_path):
+    src = tmp_path.joinpath("app.jar")
+    with zipfile.ZipFile(src, "w") as archive:
+        archive.writestr("config/app.yml", "password: hardcoded123\n")
+
+    argv = ["-j", "1", "-F", "None", "--cache", tmp_path.joinpath("cache").as_posix(), src.as_posix()]
+    expected = list(map(KeyValuePair.to_json, run(parse_args(argv))))
+    assert expected[0]["file"] == f"{src.as_posix()}!/config/app.yml"
+
+    args, config, rules = load(argv)
+    cache = load_cache(args, config, rules)
+    assert list(map(KeyValuePair.to_json, cache.load(cache.key(src), src))) == expected
+
+
+@pytest.mark.parametrize(("max_size", "expected"), [(10000, 4), (250, 2), (0, 0)])
+def test_evict_cache(tmp_path, max_size, expected):
+    for idx in range(4):
+        entry = tmp_path.joinpath("ab", f"ab{idx}.json")
+        entry.parent.mkdir(exist_ok=True)
+        entry.write_text("[]" + " " * 98)
+
+    evict_cache(tmp_path, max_size)
+    assert len(list(tmp_path.glob("*/*.json"))) == expected
+
+
+def test_evict_cache_lru(tmp_path):
+    old = tmp_path.joinpath("ab", "old.json")
+    new = tmp_path.joinpath("ab", "new.json")
+    old.parent.mkdir()
+    old.write_text("[]")
+    new.write_text("[]")
+    os.utime(old, (0, 0))
+
+    evict_cache(tmp_path, 2)
+    assert not old.exists()
+    assert new.exists()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_cache_permissions(tmp_path):
+    file = fixture_path("passwords.yml")
+    cachedir = tmp_path.joinpath("cache")
+    list(run(parse_args(["--cache", cachedir.as_posix(), file])))
+
+    assert cachedir.stat().st_mode & 0o777 == 0o700
+    for entry in cachedir.glob("*/*.json"):
+        assert entry.parent.stat().st_mode & 0o777 == 0o700
+        assert entry.stat().st_mode & 0o777 == 0o600
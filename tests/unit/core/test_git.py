@@ -0,0 +1,136 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from whispers.core.args import parse_args
+from whispers.core.config import load_config
+from whispers.core.git import added_lines, diff_files, diff_path, diff_revisions, filter_added, git, git_lines, unquote
+from whispers.core.scope import load_scope
+from whispers.main import run
+from whispers.models.pair import KeyValuePair
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def commit(files: dict):
+        for name, text in files.items():
+            tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.joinpath(name).write_text(text)
+
+        subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "commit"], cwd=tmp_path, check=True)
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "config", "user.email", "test@localhost"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "config", "user.name", "test"], cwd=tmp_path, check=True)
+    commit({"unchanged.yml": "password: unchanged123\n", "sub/changed.yml": "password: old123456\n"})
+    commit({"sub/changed.yml": "password: old123456\ndb_password: added123456\n", "new file.txt": "++ x\n"})
+    tmp_path.joinpath("staged.yml").write_text("password: staged123\n")
+    subprocess.run(["git", "add", "staged.yml"], cwd=tmp_path, check=True)
+    return tmp_path
+
+
+def test_git(repo):
+    assert git(repo, "rev-parse", "--is-inside-work-tree") == "true\n"
+
+    with pytest.raises(RuntimeError):
+        git(repo, "diff", "nope")
+
+
+def test_git_lines(repo):
+    assert list(git_lines(repo, "ls-files")) == ["new file.txt", "staged.yml", "sub/changed.yml", "unchanged.yml"]
+
+    lines = git_lines(repo, "log", "--format=%H")
+    assert len(next(lines)) == 40
+    lines.close()  # Stopped early
+
+    with pytest.raises(RuntimeError):
+        list(git_lines(repo, "diff", "nope"))
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [(["--staged", "src"], ["--cached"]), (["--diff", "HEAD~1..HEAD", "src"], ["HEAD~1..HEAD"])],
+)
+def test_diff_revisions(argv, expected):
+    assert diff_revisions(parse_args(argv)) == expected
+
+
+@pytest.mark.parametrize(
+    ("root", "relpath", "expected"),
+    [(".", "a/b.yml", "a/b.yml"), ("src", "a/b.yml", "src/a/b.yml"), ("src/", "b.yml", "src/b.yml")],
+)
+def test_diff_path(root, relpath, expected):
+    assert diff_path(Path(root), relpath) == expected
+
+
+@pytest.mark.parametrize(
+    ("src", "revisions", "expected"),
+    [
+        ("", ["HEAD~1..HEAD"], ["new file.txt", "sub/changed.yml"]),
+        ("", ["--cached"], ["staged.yml"]),
+        ("", ["HEAD~1"], ["new file.txt", "staged.yml", "sub/changed.yml"]),
+        ("sub", ["HEAD~1..HEAD"], ["changed.yml"]),
+        ("sub/changed.yml", ["HEAD~1..HEAD"], ["changed.yml"]),
+        ("unchanged.yml", ["HEAD~1..HEAD"], []),
+    ],
+)
+def test_diff_files(repo, src, revisions, expected):
+    assert diff_files(repo.joinpath(src), revisions) == expected
+
+
+def test_added_lines(repo):
+    lines = added_lines(repo, ["HEAD~1..HEAD"])
+    assert lines == {
+        repo.joinpath("new file.txt").as_posix(): {1},
+        repo.joinpath("sub/changed.yml").as_posix(): {2},
+    }
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [("a/b.yml", "a/b.yml"), ('"a\\tb.yml"', "a\tb.yml"), ('"\\303\\251.yml"', "é.yml")],
+)
+def test_unquote(path, expected):
+    assert unquote(path) == expected
+
+
+def test_filter_added():
+    secrets = [
+        KeyValuePair("a", "b", file="f", line=1),
+        KeyValuePair("a", "b", file="f", line=2),
+        KeyValuePair("a", "b", file="f", line=0),
+        KeyValuePair("a", "b", file="g", line=1),
+    ]
+    result = list(filter_added(secrets, {"f": {2}}))
+    assert result == secrets[1:3]
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["--diff", "HEAD~1..HEAD", "-F", "None"], ["new file.txt", "sub/changed.yml"]),
+        (["--staged", "-F", "None"], ["staged.yml"]),
+        (["--staged", "-F", ".*staged.*"], []),
+        (["--diff", "HEAD~1..HEAD", "-F", ".*/sub/"], ["new file.txt"]),
+        (["--diff", "HEAD~1..HEAD", "-F", "None", "-f", "*.yml"], ["sub/changed.yml"]),
+    ],
+)
+def test_load_scope_diff(repo, argv, expected):
+    args = parse_args([*argv, repo.as_posix()])
+    scope = load_scope(args, load_config(args))
+    assert list(scope) == [repo.joinpath(path) for path in expected]
+
+
+@pytest.mark.parametrize(
+    ("argv", "expected"),
+    [
+        (["--diff", "HEAD~1..HEAD"], [("old123456", 1), ("added123456", 2)]),
+        (["--diff", "HEAD~1..HEAD", "--added-only"], [("added123456", 2)]),
+        (["--added-only"], [("old123456", 1), ("added123456", 2)]),
+    ],
+)
+def test_run_diff(repo, argv, expected):
+    args = parse_args(["-j", "1", "-F", "None", *argv, repo.joinpath("sub").as_posix()])
+    assert [(secret.value, secret.line) for secret in run(args)] == expected
@@ -0,0 +1,99 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from whispers.core import history
+from whispers.core.args import parse_args
+from whispers.core.config import load_config
+from whispers.core.history import history_blobs, read_blobs, scan_history
+from whispers.core.rules import load_rules
+from whispers.main import run
+
+
+@pytest.fixture
+def repo(tmp_path):
+    def commit(files: dict):
+        for name, text in files.items():
+            if text is None:
+                tmp_path.joinpath(name).unlink()
+                continue
+
+            tmp_path.joinpath(name).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.joinpath(name).write_text(text)
+
+        subprocess.run(["git", "add", "-A"], cwd=tmp_path, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "commit"], cwd=tmp_path, check=True)
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=tmp_path, capture_output=True, text=True).stdout.strip()
+
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "config", "user.email", "test@localhost"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "config", "user.name", "test"], cwd=tmp_path, check=True)
+    commits = [
+        commit({"a.yml": "password: removed123\n", "readme.md": "password: ignored123\n"}),
+        commit({"copy/a.yml": "password: removed123\n", "id_rsa": "key\n"}),
+        commit({"a.yml": None}),
+        commit({"id_rsa": "changed\n", "tab\tname.yml": "password: quoted123\n"}),
+    ]
+    return tmp_path, commits
+
+
+def load(argv):
+    args = parse_args(argv)
+    config = load_config(args)
+    return config, load_rules(args, config)
+
+
+def test_history_blobs(repo):
+    root, commits = repo
+    config, _ = load(["-F", "None", root.as_posix()])
+    blobs = history_blobs(root, config)
+    assert set(map(frozenset, blobs.values())) == {
+        frozenset([(commits[0], "a.yml"), (commits[1], "copy/a.yml")]),
+        frozenset([(commits[0], "readme.md")]),
+        frozenset([(commits[1], "id_rsa")]),
+        frozenset([(commits[3], "id_rsa")]),
+        frozenset([(commits[3], "tab\tname.yml")]),
+    }
+
+    config, _ = load(["-F", ".*/copy/", root.as_posix()])
+    assert (commits[1], "copy/a.yml") not in sum(history_blobs(root, config).values(), [])
+
+
+def test_read_blobs(repo):
+    root, _ = repo
+    config, _ = load(["-F", "None", root.as_posix()])
+    blobs = list(history_blobs(root, config))
+    contents = list(read_blobs(root, [*blobs, "0" * 40]))
+    assert sorted(contents[:-1]) == [
+        b"changed\n",
+        b"key\n",
+        b"password: ignored123\n",
+        b"password: quoted123\n",
+        b"password: removed123\n",
+    ]
+    assert contents[-1] is None
+
+
+def test_scan_history(repo, mocker):
+    root, commits = repo
+    config, rules = load(["-F", "None", root.as_posix()])
+    scan_blob = mocker.spy(history, "scan_blob")
+    secrets = list(scan_history(config, rules, root))
+
+    result = sorted((Path(secret.file).relative_to(root).as_posix(), secret.value, secret.commit) for secret in secrets)
+    assert result == sorted(
+        [
+            ("a.yml", "removed123", commits[0]),
+            ("copy/a.yml", "removed123", commits[1]),
+            ("id_rsa", root.joinpath("id_rsa").as_posix(), commits[3]),  # File name once, first in git log
+            ("tab\tname.yml", "quoted123", commits[3]),
+        ]
+    )
+    assert scan_blob.call_count == 2  # Same blob at two paths, readme.md and id_rsa have no plugin
+
+
+def test_run_history(repo):
+    root, commits = repo
+    secrets = list(run(parse_args(["-F", "None", "--history", root.as_posix()])))
+    assert {secret.to_json()["commit"] for secret in secrets} == {commits[0], commits[1], commits[3]}
@@ -0,0 +1,61 @@
+import json
+from io import StringIO
+
+import pytest
+
+from tests.unit.conftest import fixture_path
+from whispers.core.args import parse_args
+from whispers.core.output import write_output
+from whispers.main import run
+
+
+def secrets(src: str = "apikeys.json") -> list:
+    return list(run(parse_args(["-j", "1", fixture_path(src)])))
+
+
+@pytest.mark.parametrize("src", ["apikeys.json", "empty.dockercfg", "404"])
+def test_write_output_json(src):
+    found = secrets(src)
+    output = StringIO()
+    write_output(found, output, "json")
+    assert output.getvalue() == json.dumps([secret.to_json() for secret in found]) + "\n"
+
+
+def test_write_output_jsonl():
+    found = secrets()
+    output = StringIO()
+    write_output(found, output, "jsonl")
+    lines = output.getvalue().splitlines()
+    assert list(map(json.loads, lines)) == [secret.to_json() for secret in found]
+
+
+@pytest.mark.parametrize("src", ["apikeys.json", "404"])
+def test_write_output_sarif(src):
+    found = secrets(src)
+    output = StringIO()
+    write_output(found, output, "sarif")
+    sarif = json.loads(output.getvalue())
+    run = sarif["runs"][0]
+    assert sarif["version"] == "2.1.0"
+    assert len(run["results"]) == len(found)
+    assert {rule["id"] for rule in run["tool"]["driver"]["rules"]} == {secret.rule.id for secret in found}
+
+    for result, secret in zip(run["results"], found):
+        location = result["locations"][0]["physicalLocation"]
+        assert result["ruleId"] == secret.rule.id
+        assert location["artifactLocation"]["uri"] == secret.file
+        assert location.get("region", {}).get("startLine", 0) == secret.line
+
+
+def test_write_output_streaming():
+    class Output(StringIO):
+        flushed = []
+
+        def flush(self):
+            self.flushed.append(self.getvalue())
+
+    found = secrets()
+    output = Output()
+    write_output(iter(found), output, "jsonl")
+    assert len(output.flushed) == len(found)
+    assert output.flushed[0].count("\n") == 1
@@ -3,11 +3,12 @@ from pathlib import Path
 
 import pytest
 
-from tests.unit.conftest import FIXTURE_PATH, config_path, fixture_path, forbidden_path, tmp_path
+from tests.unit.conftest import FIXTURE_PATH, config_path, fixture_path, pair_line
 from whispers.core.args import parse_args
 from whispers.core.config import load_config
-from whispers.core.pairs import filter_included, filter_static, load_plugin, make_pairs, tag_file
+from whispers.core.pairs import filter_included, filter_static, import_plugin, load_plugin, make_pairs, tag_file
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import MemoryFile
 from whispers.plugins.config import Config
 from whispers.plugins.dockercfg import Dockercfg
 from whispers.plugins.dockerfile import Dockerfile
@@ -19,6 +20,7 @@ from whispers.plugins.npmrc import Npmrc
 from whispers.plugins.pip import Pip
 from whispers.plugins.plaintext import Plaintext
 from whispers.plugins.pypirc import Pypirc
+from whispers.plugins.python import Python
 from whispers.plugins.semgrep import Semgrep
 from whispers.plugins.shell import Shell
 from whispers.plugins.xml import Xml
@@ -28,8 +30,6 @@ from whispers.plugins.yml import Yml
 @pytest.mark.parametrize(
     ("filename", "expected"),
     [
-        (tmp_path("File.404"), 0),
-        (forbidden_path(), 0),
         (fixture_path("language.py2"), 0),
         (fixture_path(".npmrc"), 5),
         (fixture_path("placeholders.xml"), 0),
@@ -44,6 +44,64 @@ def test_make_pairs(filename, expected):
     assert len(pairs) == expected
 
 
+@pytest.mark.parametrize(
+    ("filename", "ast"),
+    [
+        (".dockercfg", False),
+        (".htpasswd", False),
+        (".npmrc", False),
+        (".pypirc", False),
+        ("apikeys.json", False),
+        ("apikeys.xml", False),
+        ("apikeys.yml", False),
+        ("build.gradle", False),
+        ("connection.config", False),
+        ("Dockerfile", False),
+        ("java.properties", False),
+        ("nginx.conf", False),
+        ("page.html", False),
+        ("pip.conf", False),
+        ("plaintext.txt", False),
+        ("runtime.exs", False),
+        ("script.sh", False),
+        ("settings01.ini", False),
+        ("settings.env", False),
+        ("ast/fixture.py", True),
+        ("ast/fixture.js", True),
+    ],
+)
+def test_make_pairs_memory(filename, ast):
+    args = parse_args(["-a" if ast else "-v", fixture_path(filename)])
+    config = load_config(args)
+    file = Path(fixture_path(filename))
+    expected = [(pair.key, pair.value, pair_line(pair)) for pair in make_pairs(config, file)]
+    memory = [
+        (pair.key, pair.value, pair_line(pair))
+        for pair in make_pairs(config, MemoryFile(file.as_posix(), file.read_bytes()))
+    ]
+    assert expected and memory == expected
+
+
+def test_make_pairs_json_stream_size(mocker):
+    args = parse_args([fixture_path("apikeys.json")])
+    config = load_config(args)
+    config.json_stream_size = 0
+    stream = mocker.spy(Json, "stream")
+    assert list(make_pairs(config, Path(fixture_path("apikeys.json"))))
+    assert stream.called
+
+
+def test_make_pairs_html_scripts():
+    data = b'<script>var password = "hardcoded";</script>'
+    config = load_config(parse_args([fixture_path()]))
+    pairs = make_pairs(config, MemoryFile("index.html", data))
+    assert [pair.key for pair in pairs if pair.key != "file"] == []
+
+    config.html_scripts = True
+    pairs = make_pairs(config, MemoryFile("index.html", data))
+    assert [(pair.key, pair.value) for pair in pairs if pair.key != "file"] == [("password", "hardcoded")]
+
+
 def test_tag_file():
     pair = KeyValuePair("key", "value", file="")
     assert tag_file(FIXTURE_PATH, pair).file == fixture_path()
@@ -122,7 +180,9 @@ def test_filter_static(key, value, expected):
         ("invalid.yml", False, Yml),
         ("invalid.ini", False, Config),
         ("java.properties", False, Jproperties),
-        ("language/fixture.py", True, Semgrep),
+        ("language/fixture.py", True, Python),
+        ("language/fixture.py3", True, Python),
+        ("language/fixture.js", True, Semgrep),
         ("language/fixture.py", False, None),
         ("language/fixture.sh", False, Shell),
         ("page.html", False, Html),
@@ -138,3 +198,11 @@ def test_filter_static(key, value, expected):
 def test_load_plugin(filename, ast, expected):
     plugin = load_plugin(FIXTURE_PATH.joinpath(filename), ast=ast)
     assert plugin == expected
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [("yml", Yml), ("json", Json), ("jproperties", Jproperties), ("semgrep", Semgrep)],
+)
+def test_import_plugin(name, expected):
+    assert import_plugin(name) is expected
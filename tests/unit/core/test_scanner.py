@@ -0,0 +1,105 @@
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import whispers
+from tests.unit.conftest import config_path, fixture_path
+from whispers.core.scanner import Scanner, load_scanner_config
+from whispers.models.appconfig import AppConfig
+
+PASSWORD = "password: hardcoded123\n"
+
+
+def findings(secrets):
+    return [(secret.file, secret.line, secret.key, secret.value, secret.rule.id) for secret in secrets]
+
+
+def test_scanner_export():
+    assert whispers.Scanner is Scanner
+
+    with pytest.raises(AttributeError):
+        whispers.Scan
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        lambda: None,
+        lambda: config_path("integration.yml"),
+        lambda: {"exclude": {"values": ["hardcoded"]}},
+        lambda: AppConfig({"ast": True}),  # Built in the test, not at collection, to load rules under test settings
+    ],
+)
+def test_load_scanner_config(config):
+    assert isinstance(load_scanner_config(config()), AppConfig)
+
+
+def test_load_scanner_config_copy():
+    config = AppConfig()
+    scanner = Scanner(config, rules=["password"])
+    assert scanner.config is not config
+    assert config.include.rules != ["password"]
+
+
+def test_scanner_config_not_found():
+    with pytest.raises(FileNotFoundError):
+        Scanner(config_path("404.yml"))
+
+
+def test_scan_path():
+    expected = list(whispers.secrets(f"-c {config_path('integration.yml')} {fixture_path()}"))
+    result = list(Scanner(config_path("integration.yml")).scan_path(fixture_path()))
+    assert findings(result) == findings(expected)
+
+
+@pytest.mark.parametrize("text", [PASSWORD, PASSWORD.encode(), memoryview(PASSWORD.encode())])
+def test_scan_text(text):
+    result = list(Scanner().scan_text("config.yml", text))
+    assert findings(result) == [("config.yml", 1, "password", "hardcoded123", "password")]
+
+
+@pytest.mark.parametrize(
+    ("rules", "expected"),
+    [
+        (None, 1),
+        (["password"], 1),
+        (["apikey"], 0),
+        ([{"id": "inline", "group": "tests", "message": "Inline", "severity": "Info", "value": {"regex": "hard"}}], 1),
+    ],
+)
+def test_scanner_rules(rules, expected):
+    result = list(Scanner(rules=rules).scan_text("config.yml", PASSWORD))
+    assert len(result) == expected
+
+
+def test_scan_many():
+    scanner = Scanner(config_path("integration.yml"))
+    targets = [fixture_path(".npmrc"), ("config.yml", PASSWORD), fixture_path("404")]
+    expected = [*scanner.scan_path(fixture_path(".npmrc")), *scanner.scan_text("config.yml", PASSWORD)]
+    assert findings(scanner.scan_many(targets)) == findings(expected)
+
+
+def test_scanner_threads():
+    scanner = Scanner()
+    files = [fixture_path(name) for name in ["apikeys.yml", "apikeys.json", "apikeys.xml", ".npmrc", "pip.conf"]] * 8
+    serial = [findings(scanner.scan_path(file)) for file in files]
+
+    with ThreadPoolExecutor(8) as pool:
+        threaded = list(pool.map(lambda file: findings(scanner.scan_path(file)), files))
+
+    assert all(serial)
+    assert threaded == serial
+
+
+def test_scanner_logging():
+    code = (
+        "import logging, whispers\n"
+        "list(whispers.Scanner().scan_text('config.yml', 'password: hardcoded123'))\n"
+        "list(whispers.Scanner().scan_text('invalid.json', '{'))\n"
+        "print(logging.getLogger().handlers, logging.getLogger().level)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.stdout == "[] 30\n"  # Root logger left unconfigured (WARNING)
+    assert result.stderr == ""
@@ -1,17 +1,24 @@
+import re
+from io import BytesIO
+from pathlib import Path
+
 import pytest
 
-from tests.unit.conftest import FIXTURE_PATH, config_path, fixture_path
+from tests.unit.conftest import FIXTURE_PATH, config_path, fixture_path, forbidden_path, tmp_path
 from whispers.core.args import parse_args
 from whispers.core.config import load_config
-from whispers.core.scope import load_scope
+from whispers.core.scope import load_scope, walk_files
 
 
 @pytest.mark.parametrize(
     ("src", "expected"),
     [
         (fixture_path("404"), 0),
+        (tmp_path("File.404"), 0),
+        (forbidden_path(), 0),
         (fixture_path(".npmrc"), 1),
-        (fixture_path(), len(list(FIXTURE_PATH.rglob("**/*")))),
+        (fixture_path("folder"), 1),
+        (fixture_path(), len(list(filter(Path.is_file, FIXTURE_PATH.rglob("**/*"))))),
     ],
 )
 def test_load_scope(src, expected):
@@ -22,6 +29,15 @@ def test_load_scope(src, expected):
     assert len(list(scope)) == expected
 
 
+def test_load_scope_stdin(mocker):
+    mocker.patch("whispers.core.scope.stdin", mocker.Mock(buffer=BytesIO(b"password: hardcoded123\n")))
+    args = parse_args(["--stdin-name", "staged/config.yml", "-"])
+    scope = list(load_scope(args, load_config(args)))
+    assert len(scope) == 1
+    assert scope[0].as_posix() == "staged/config.yml"
+    assert scope[0].read_bytes() == b"password: hardcoded123\n"
+
+
 @pytest.mark.parametrize(
     ("config_file", "expected"),
     [("include_files.yml", [FIXTURE_PATH.joinpath(".pypirc")]), ("exclude_files.yml", [])],
@@ -31,3 +47,31 @@ def test_load_scope_config(config_file, expected):
     config = load_config(args)
     scope = load_scope(args, config)
     assert list(scope) == expected
+
+
+@pytest.mark.parametrize(
+    ("exclude", "expected"),
+    [
+        (None, True),
+        (re.compile(r".*/folder/"), False),
+        (re.compile(r".*/folder"), False),
+        (re.compile(r".*/fold$"), True),
+    ],
+)
+def test_walk_files_prune(exclude, expected):
+    files = [path for path, _ in walk_files(fixture_path(), exclude)]
+    assert (fixture_path("folder/password/.gitkeep") in files) is expected
+    assert all(Path(path).is_file() for path in files)
+
+
+def test_walk_files_relpath():
+    for path, relpath in walk_files(fixture_path()):
+        assert path == fixture_path(relpath)
+
+
+def test_load_scope_multiple_globs():
+    args = parse_args(["-F", "None", "-f", "*.yml,**/*,*.json", fixture_path()])
+    config = load_config(args)
+    scope = list(load_scope(args, config))
+    assert len(scope) == len(set(scope))
+    assert len(scope) == len(list(filter(Path.is_file, FIXTURE_PATH.rglob("**/*"))))
@@ -0,0 +1,124 @@
+import json
+import os
+import socket
+from io import BytesIO
+from pathlib import Path
+from threading import Thread
+
+import pytest
+
+from tests.unit.conftest import config_path, fixture_path
+from whispers.client import request
+from whispers.core.args import parse_args
+from whispers.main import run
+
+ScanServer = pytest.importorskip("whispers.core.server", reason="Unix domain sockets only").ScanServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    configfile = tmp_path.joinpath("config.yml")
+    configfile.write_text(Path(config_path("example.yml")).read_text())
+
+    args = parse_args(["-j", "1", "-c", configfile.as_posix(), "--serve", tmp_path.joinpath("s.sock").as_posix()])
+    server = ScanServer(args)
+    thread = Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def scan(server: ScanServer, **data) -> bytes:
+    output = BytesIO()
+    request(server.args.serve, {"cwd": os.getcwd(), "format": "jsonl", **data}, output)
+    return output.getvalue()
+
+
+def test_server_socket(server):
+    assert Path(server.args.serve).is_socket()
+    assert Path(server.args.serve).stat().st_mode & 0o777 == 0o600
+
+
+def test_server_claim_private_dir(tmp_path):
+    path = tmp_path.joinpath("whispers-1", "whispers.sock")
+    ScanServer.claim(path)
+    assert path.parent.stat().st_mode & 0o777 == 0o700
+
+
+def test_server_claim_running(server):
+    with pytest.raises(RuntimeError, match="in use"):
+        ScanServer.claim(Path(server.args.serve))
+
+    assert Path(server.args.serve).is_socket()
+
+
+def test_server_claim_stale(tmp_path):
+    path = tmp_path.joinpath("s.sock")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(path.as_posix())  # Bound, not listening
+
+    ScanServer.claim(path)
+    assert not path.exists()
+
+
+def test_server_claim_not_socket(tmp_path):
+    path = tmp_path.joinpath("s.sock")
+    path.write_text("")
+
+    with pytest.raises(RuntimeError, match="not a socket"):
+        ScanServer.claim(path)
+
+
+def test_server_claim_not_owned(mocker, tmp_path):
+    mocker.patch("whispers.core.server.os.getuid", return_value=os.getuid() + 1)
+    with pytest.raises(RuntimeError, match="not owned"):
+        ScanServer.claim(tmp_path.joinpath("s.sock"))
+
+
+@pytest.mark.parametrize("src", ["apikeys.json", "folder", "404"])
+def test_server_paths(server, src):
+    args = parse_args(["-j", "1", "-c", server.args.config, fixture_path(src)])
+    expected = [secret.to_json() for secret in run(args)]
+    result = list(map(json.loads, scan(server, paths=[fixture_path(src)]).splitlines()))
+    assert result == expected
+
+
+def test_server_absolute_path(server):
+    src = Path(fixture_path("apikeys.json")).resolve().as_posix()
+    result = list(map(json.loads, scan(server, paths=[src]).splitlines()))
+    assert result
+    assert all(secret["file"] == src for secret in result)
+
+
+def test_server_buffers(server):
+    buffers = [{"name": "staged/config.yml", "data": "password: hardcoded123\n"}]
+    result = list(map(json.loads, scan(server, buffers=buffers).splitlines()))
+    assert [(secret["file"], secret["value"], secret["line"]) for secret in result] == [
+        ("staged/config.yml", "hardcoded123", 1)
+    ]
+
+
+@pytest.mark.parametrize("fmt", ["json", "sarif"])
+def test_server_format(server, fmt):
+    output = scan(server, paths=[fixture_path("apikeys.json")], format=fmt)
+    assert json.loads(output)
+
+
+def test_server_invalid_request(server):
+    output = BytesIO()
+    request(server.args.serve, "not json", output)
+    assert output.getvalue() == b""
+
+
+def test_server_reload(server):
+    rules = server.rules
+    assert server.reload() is None
+    assert server.rules is rules
+
+    configfile = Path(server.args.config)
+    configfile.write_text(configfile.read_text() + "\n")
+    server.reload()
+    assert server.rules is not rules
@@ -0,0 +1,88 @@
+from pathlib import Path
+
+import pytest
+
+from whispers.core.snapshot import (
+    RuleSnapshot,
+    clear_snapshot,
+    compile_rule,
+    load_snapshot,
+    read_snapshot,
+    snapshot_key,
+    snapshot_path,
+    write_snapshot,
+)
+from whispers.core.utils import default_rules
+from whispers.models.rule import Rule
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", tmp_path.as_posix())
+    monkeypatch.setattr("whispers.core.snapshot.SNAPSHOT", None)
+    return tmp_path
+
+
+def test_snapshot_path(cache_home):
+    assert snapshot_path() == cache_home.joinpath("whispers", "rules.pickle")
+
+
+def test_snapshot_key(tmp_path):
+    rulefile = tmp_path.joinpath("rules.yml")
+    rulefile.write_text("- id: test")
+    key = snapshot_key([rulefile])
+    assert key == snapshot_key([rulefile])
+
+    rulefile.write_text("- id: changed")
+    assert key != snapshot_key([rulefile])
+
+
+def test_load_snapshot(cache_home):
+    snapshot = load_snapshot()
+    assert snapshot.rules == default_rules()
+    assert list(map(repr, snapshot.compiled)) == list(map(repr, map(Rule, default_rules())))
+    assert snapshot_path().stat().st_mode & 0o777 == 0o600
+    assert load_snapshot() is snapshot
+
+
+def test_load_snapshot_from_file(cache_home, monkeypatch):
+    snapshot = load_snapshot()
+    clear_snapshot()
+    monkeypatch.setattr("whispers.core.snapshot.make_snapshot", None)  # Must not parse again
+    assert load_snapshot() == snapshot
+
+
+def test_load_snapshot_once(cache_home, mocker):
+    snapshot_key = mocker.patch("whispers.core.snapshot.snapshot_key", return_value="key")
+    snapshot = load_snapshot()
+    assert load_snapshot() is snapshot
+    assert snapshot_key.call_count == 1  # Rule files are hashed once per process
+
+    clear_snapshot()
+    load_snapshot()
+    assert snapshot_key.call_count == 2
+
+
+def test_read_snapshot(tmp_path):
+    snapshot = RuleSnapshot("key", [], [])
+    path = tmp_path.joinpath("rules.pickle")
+    assert read_snapshot(path, "key") is None
+
+    write_snapshot(path, snapshot)
+    assert read_snapshot(path, "key") == snapshot
+    assert read_snapshot(path, "stale") is None
+
+    path.write_bytes(b"invalid")
+    assert read_snapshot(path, "key") is None
+
+
+def test_write_snapshot_error(tmp_path):
+    path = tmp_path.joinpath("file", "rules.pickle")
+    path.parent.write_text("not a directory")
+    write_snapshot(path, RuleSnapshot("key", [], []))
+    assert not Path(path).exists()
+
+
+def test_compile_rule():
+    assert isinstance(compile_rule(default_rules()[0]), Rule)
+    assert compile_rule({"id": "invalid"}) is None
@@ -1,5 +1,6 @@
 import re
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from yaml import safe_load
@@ -8,6 +9,8 @@ from yaml.parser import ParserError
 from tests.unit.conftest import CONFIG_PATH, does_not_raise, fixture_path
 from whispers.core.args import parse_args
 from whispers.core.utils import (
+    cgroup_cpu_quota,
+    cpu_count,
     default_rules,
     find_line_number,
     is_ascii,
@@ -20,6 +23,7 @@ from whispers.core.utils import (
     is_static,
     is_uri,
     list_rule_prop,
+    load_globs,
     load_regex,
     load_yaml_from_file,
     similar_strings,
@@ -44,6 +48,43 @@ def test_load_regex(rawstr, expected, raised):
         assert load_regex(rawstr) == expected
 
 
+@pytest.mark.parametrize(
+    ("glob", "path", "expected"),
+    [
+        ("**/*", "file.yml", True),
+        ("**/*", "dir/file.yml", True),
+        ("*.yml", "dir/sub/file.yml", True),
+        ("*.yml", "file.yaml", False),
+        ("**/.pypirc", ".pypirc", True),
+        ("**/.pypirc", "dir/.pypirc", True),
+        ("**/.pypirc", "dir/x.pypirc", False),
+        ("dir/*.json", "dir/file.json", True),
+        ("dir/*.json", "top/dir/file.json", True),
+        ("dir/*.json", "dir/sub/file.json", False),
+        ("file.py[23]", "file.py3", True),
+        ("file.py[!23]", "file.py3", False),
+        ("file.?", "file.c", True),
+        ("file.?", "file.cc", False),
+        ("a+b.txt", "a+b.txt", True),
+    ],
+)
+def test_load_globs(glob, path, expected):
+    assert bool(load_globs([glob]).match(path)) is expected
+
+
+@pytest.mark.parametrize(
+    ("globs", "path", "expected"),
+    [
+        (["*.yml", "*.json"], "dir/file.json", True),
+        (["*.yml", "*.json"], "dir/file.yml", True),
+        (["*.yml", "*.json"], "dir/file.env", False),
+        (["*.yml", "**/*"], "file.yml", True),
+    ],
+)
+def test_load_globs_multiple(globs, path, expected):
+    assert bool(load_globs(globs).match(path)) is expected
+
+
 @pytest.mark.parametrize(
     ("rawstr", "expected"),
     [
@@ -117,8 +158,13 @@ def test_find_line_number_single(src, key, value, expected):
     ("src", "linenumbers"),
     [
         ("hardcoded.yml", [12, 14, 15, 16, 19]),
-        ("privatekeys.yml", [5, 7, 11, 12, 13, 14]),
+        ("privatekeys.yml", [5, 6, 11, 12, 13, 14]),
         ("java.properties", [9, 10, 11]),
+        ("hardcoded.json", [13, 15, 16, 17, 21]),
+        ("beans.xml", [11, 12, 13]),
+        ("jdbc.xml", [24, 29, 34]),
+        ("settings01.ini", [0, 6]),
+        ("nginx.conf", [0, 16, 17, 18]),
     ],
 )
 def test_find_line_number_all(src, linenumbers):
@@ -335,3 +381,37 @@ def test_default_rules():
 def test_list_rule_prop():
     rule = {"id": "rule-id"}
     assert list_rule_prop("id", [rule]) == ["rule-id"]
+
+
+@pytest.mark.parametrize(
+    ("cpu_max", "expected"),
+    [
+        ("max 100000", 0),
+        ("200000 100000", 2),
+        ("150000 100000", 2),
+        ("50000 100000", 1),
+        ("invalid", 0),
+    ],
+)
+def test_cgroup_cpu_quota(cpu_max, expected, tmp_path):
+    cgroup = tmp_path.joinpath("cpu.max")
+    cgroup.write_text(cpu_max)
+    with patch("whispers.core.utils.CGROUP_CPU_MAX", cgroup):
+        assert cgroup_cpu_quota() == expected
+
+
+def test_cgroup_cpu_quota_v1(tmp_path):
+    quota = tmp_path.joinpath("cpu.cfs_quota_us")
+    period = tmp_path.joinpath("cpu.cfs_period_us")
+    quota.write_text("300000\n")
+    period.write_text("100000\n")
+    with patch("whispers.core.utils.CGROUP_CPU_MAX", tmp_path.joinpath("404")):
+        with patch("whispers.core.utils.CGROUP_CPU_QUOTA", quota):
+            with patch("whispers.core.utils.CGROUP_CPU_PERIOD", period):
+                assert cgroup_cpu_quota() == 3
+
+
+def test_cpu_count():
+    assert cpu_count() >= 1
+    with patch("whispers.core.utils.cgroup_cpu_quota", return_value=1):
+        assert cpu_count() == 1
@@ -2,7 +2,7 @@ import re
 
 import pytest
 
-from whispers.core.constants import DEFAULT_SEVERITY
+from whispers.core.constants import DEFAULT_SEVERITY, JSON_STREAM_SIZE
 from whispers.core.utils import default_rules, list_rule_prop
 from whispers.models.appconfig import AppConfig
 
@@ -77,3 +77,13 @@ def test_appconfig_compile():
     assert config.exclude.files == re.compile(r"test", flags=re.IGNORECASE)
     assert config.exclude.keys is None
     assert config.exclude.values is None
+
+
+@pytest.mark.parametrize(("config", "expected"), [({}, JSON_STREAM_SIZE), ({"json_stream_size": 1}, 1)])
+def test_appconfig_json_stream_size(config, expected):
+    assert AppConfig(config).json_stream_size == expected
+
+
+@pytest.mark.parametrize(("config", "expected"), [({}, False), ({"html_scripts": True}, True)])
+def test_appconfig_html_scripts(config, expected):
+    assert AppConfig(config).html_scripts == expected
@@ -0,0 +1,43 @@
+from base64 import b64decode
+from unittest.mock import patch
+
+import pytest
+
+from whispers.core.utils import default_rules
+from whispers.models.features import Features, PairFeatures
+from whispers.models.pair import KeyValuePair
+from whispers.models.rule import Rule
+
+
+@pytest.mark.parametrize(
+    ("data", "text", "raw"),
+    [
+        ("aGFyZGNvZGVk", "hardcoded", b"hardcoded"),
+        ("/w==", None, b"\xff"),
+        ("", "", None),
+        ("not base64!", None, None),
+        (123, None, None),
+    ],
+)
+def test_features_base64(data, text, raw):
+    features = Features(data)
+    assert (features.base64_text.data if features.base64_text else None) == text
+    assert (features.base64_bytes.data if features.base64_bytes else None) == raw
+
+
+@patch("whispers.models.features.b64decode", side_effect=b64decode)
+@patch("whispers.models.features.similar_strings", return_value=0.0)
+@patch("whispers.models.features.is_semver", return_value=False)
+@patch("whispers.models.features.is_ascii", return_value=True)
+def test_features_computed_once(mock_ascii, mock_semver, mock_similar, mock_b64decode):
+    rules = list(map(Rule, default_rules()))
+    pair = KeyValuePair("password", "aGFyZGNvZGVk")
+    features = PairFeatures(pair)
+
+    assert list(filter(lambda rule: rule.matches(pair, features), rules))
+
+    # At most once each for key, value and decoded value, regardless of rule count
+    assert mock_ascii.call_count <= 3
+    assert mock_semver.call_count <= 3
+    assert mock_b64decode.call_count <= 2
+    assert mock_similar.call_count == 1
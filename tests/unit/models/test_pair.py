@@ -1,4 +1,8 @@
+import pickle
+from copy import copy
+
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import MemoryFile
 
 
 def test_pair(rule_fixture):
@@ -10,6 +14,8 @@ def test_pair(rule_fixture):
         "file": "file",
         "line": 123,
         "rule": rule_fixture,
+        "commit": "",
+        "source": None,
     }
     assert pair.to_json() == {
         "key": "key",
@@ -25,3 +31,15 @@ def test_pair(rule_fixture):
 def test_pair_post_init():
     pair = KeyValuePair("key", "value")
     assert pair.keypath == ["key"]
+
+
+def test_pair_commit(rule_fixture):
+    pair = KeyValuePair("key", "value", rule=rule_fixture, commit="0" * 40)
+    assert pair.to_json()["commit"] == "0" * 40
+
+
+def test_pair_source():
+    pair = KeyValuePair("key", "value", source=MemoryFile("config.yml", b"key: value\n"))
+    assert pair == KeyValuePair("key", "value")
+    assert copy(pair).source is None
+    assert pickle.loads(pickle.dumps(pair)).source is None
@@ -0,0 +1,54 @@
+import pytest
+
+from whispers.models.source import MemoryFile
+
+
+def test_memoryfile():
+    file = MemoryFile("outer.jar!/config/app.yml", "key: välue\n".encode())
+    assert file.as_posix() == str(file) == "outer.jar!/config/app.yml"
+    assert (file.name, file.stem, file.suffix) == ("app.yml", "app", ".yml")
+    assert file.exists() and file.is_file()
+    assert file.read_bytes() == "key: välue\n".encode()
+    assert file.read_text() == "key: välue\n"
+    assert file.open().readlines() == ["key: välue\n"]
+    assert file.open("rb").read() == file.read_bytes()
+    assert list(enumerate(file.open(), 1)) == [(1, "key: välue\n")]
+
+
+def test_memoryfile_decode_error():
+    file = MemoryFile("binary.yml", b"\xff\xfe")
+    with pytest.raises(UnicodeDecodeError):
+        file.read_text()
+
+    assert file.read_text(errors="replace") == "��"
+
+
+def test_memoryfile_buffer():
+    file = MemoryFile("config.yml", memoryview(b"key: value\n"))
+    assert file.read_bytes() == b"key: value\n"
+    assert file.read_text() == "key: value\n"
+    assert file.open().readlines() == ["key: value\n"]
+
+
+def test_memoryfile_map_file(tmp_path):
+    path = tmp_path.joinpath("config.yml")
+    path.write_bytes(b"key: value\n")
+
+    file = MemoryFile.map_file(path)
+    assert file.as_posix() == path.as_posix()
+    assert file.read_text() == "key: value\n"
+
+    file = MemoryFile.map_file(path, "staged/app.yml")
+    assert (file.as_posix(), file.read_bytes()) == ("staged/app.yml", b"key: value\n")
+
+    path.write_bytes(b"")
+    assert MemoryFile.map_file(path).read_bytes() == b""  # Empty files cannot be mapped
+
+
+def test_memoryfile_on_disk():
+    file = MemoryFile("outer.zip!/nginx.conf", b"listen 80;\n")
+    with file.on_disk() as path:
+        assert path.name == "nginx.conf"
+        assert path.read_bytes() == b"listen 80;\n"
+
+    assert not path.exists()
@@ -0,0 +1,43 @@
+import pytest
+
+from whispers.models.source import MemoryFile
+from whispers.plugins.config import Config
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", "text"),
+        ("# comment\n", "text"),
+        ("[section]\nkey = value\n", "ini"),
+        ("; comment\n\n[section]\nkey: value\n", "ini"),
+        ("user www-data;\nhttp {\n}\n", "nginx"),
+        ("# comment\nserver {\n  listen 80;\n}\n", "nginx"),
+        ("password=hardcoded\n", "text"),
+        ("key = value;\n", "text"),
+        ('object ApiUser "root" {\n  password = "hardcoded"\n}\n', "text"),
+        ("export PASSWORD=hardcoded\n", "text"),
+    ],
+)
+def test_config_format(text, expected):
+    assert Config.config_format(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [
+        (b'<?xml version="1.0"?>\n<root><password>hardcoded</password></root>\n', [("password", "hardcoded", 2)]),
+        (b"[section]\npassword = hardcoded\n", [("password", "hardcoded", 2)]),
+        (b"http {\n  set $password hardcoded;\n}\n", [("$password", "hardcoded", 2)]),
+        (b"# comment\npassword = hardcoded\n", [("password", "hardcoded", 2)]),
+    ],
+)
+def test_config_pairs(document, expected):
+    pairs = Config().pairs(MemoryFile("settings.conf", document))
+    assert [(pair.key, pair.value, pair.line) for pair in pairs] == expected
+
+
+def test_nginx_args():
+    tokens = [("server", 1, False), ("{", 1, False), ("# a", 2, False), ("set", 3, False), ("$a", 3, False)]
+    tokens += [(";", 3, True), ("b", 4, False), (";", 4, False), ("}", 5, False)]
+    assert list(Config.nginx_args(tokens)) == [("$a", 3), (";", 3), ("b", 3)]
@@ -0,0 +1,125 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from tests.unit.conftest import FIXTURE_PATH, pair_line
+from whispers.models.appconfig import AppConfig
+from whispers.models.source import MemoryFile
+from whispers.plugins.json import Json, JsonStream
+
+
+def shapes(pairs):
+    return [(pair.key, pair.value, pair.keypath, pair_line(pair)) for pair in pairs]
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "apikeys.json",
+        "aws.json",
+        "cloudformation.json.template",
+        "excluded.json",
+        "falsepositive/semver.json",
+        "hardcoded.json",
+        "integration.json",
+        "passwords.json",
+        "placeholders.json",
+        "privatekeys.json",
+    ],
+)
+@pytest.mark.parametrize("chunk", [1, 7, 1024])
+def test_json_stream(filename, chunk):
+    file = FIXTURE_PATH.joinpath(filename)
+    expected = shapes(Json().pairs(file))
+    assert shapes(JsonStream(StringIO(file.read_text()), chunk).pairs()) == expected
+
+
+def test_json_stream_cloudformation():
+    file = FIXTURE_PATH.joinpath("cloudformation.json")
+    expected = shapes(Json().pairs(file))
+    result = shapes(JsonStream(StringIO(file.read_text()), 16).pairs())
+    assert sorted(map(repr, result)) == sorted(map(repr, expected))  # Parameters are yielded in document order
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [
+        ('"hardcoded"', []),
+        ("[]", []),
+        ('{"a": {}, "b": []}', []),
+        ('{"n": 1.5, "m": null, "t": true}', [("t", True, ["t"], 1)]),
+        ('{"s": "a\\"b\\u00e9"}', [("s", 'a"bé', ["s"], 1)]),
+        (
+            '{"key": "password", "value": "hardcoded"}',
+            [
+                ("key", "password", ["key"], 1),
+                ("value", "hardcoded", ["value"], 1),
+                ("password", "hardcoded", ["password"], 1),
+            ],
+        ),
+        ('[\n  "a",\n  ["b"]\n]', [(None, "a", [None], 2), (None, "b", [None], 3)]),
+    ],
+)
+def test_json_stream_values(document, expected):
+    result = shapes(JsonStream(StringIO(document), 2).pairs())
+    assert result == shapes(Json().pairs(MemoryFile("document.json", document.encode())))
+    assert [shape for shape in result if shape[0] != ""] == expected  # Without Shell variable pairs
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        '{"a": 1',
+        '{"a" 1}',
+        '{"a": 1,}',
+        "{a: 1}",
+        "[1 2]",
+        '"unterminated',
+        '{"a": 1} {}',
+        '{"a": tru}',
+        '{"a": "\x01"}',
+    ],
+)
+def test_json_stream_invalid(document):
+    with pytest.raises(ValueError):
+        list(JsonStream(StringIO(document), 3).pairs())
+
+
+@pytest.mark.parametrize(("stream_size", "streamed"), [(0, True), (1, False)])
+def test_json_stream_size(mocker, stream_size, streamed):
+    stream = mocker.spy(Json, "stream")
+    file = MemoryFile("config.json", b'{"password": "hardcoded"}')
+    assert ("password", "hardcoded", ["password"], 1) in shapes(Json(stream_size).pairs(file))
+    assert stream.called is streamed
+
+
+def test_json_stream_error_handled():
+    file = MemoryFile("config.json", b'{"password": "hardcoded", "broken": }')
+    assert ("password", "hardcoded", ["password"], 1) in shapes(Json(0).pairs(file))
+
+
+def test_json_stream_file(tmp_path):
+    path = tmp_path.joinpath("state.json")
+    path.write_text('{"resources": [' + ",".join(f'{{"password": "hardcoded{idx}"}}' for idx in range(1000)) + "]}")
+    passwords = [pair for pair in Json(0).pairs(Path(path)) if pair.key == "password"]
+    assert len(passwords) == 1000
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [
+        ('{\n  "a": {\n    "password": "one"\n  },\n  "password": "two"\n}', [3, 5]),
+        ('{"a": 1,\n "a": 2}', [2]),
+        ('[\n  {"x": [\n    "y",\n    {"z": "w"}\n  ]}\n]', [3, 4]),
+        ('{ "key" : "password" ,\n  "value" :\n "two" }', [1, 3, 3]),
+    ],
+)
+def test_json_lines(document, expected):
+    pairs = [pair for pair in Json().pairs(MemoryFile("document.json", document.encode())) if pair.key != ""]
+    assert all(callable(pair.line) for pair in pairs)  # Found only when needed
+    assert [pair_line(pair) for pair in reversed(pairs)][::-1] == expected  # In any order
+
+
+def test_json_from_config():
+    assert Json.from_config(AppConfig({"json_stream_size": 1})).stream_size == 1
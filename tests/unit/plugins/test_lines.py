@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+from tests.unit.conftest import fixture_path
+from whispers.models.source import MemoryFile
+from whispers.plugins.lines import match_lines, scan_lines
+
+
+@pytest.mark.parametrize(
+    ("text", "marker", "expected"),
+    [
+        ("", "", []),
+        ("\n", "", [(1, "")]),
+        ("a\nb", "", [(1, "a"), (2, "b")]),
+        ("a\nb\n", "", [(1, "a"), (2, "b")]),
+        ("a\r\nb\rc\n", "", [(1, "a"), (2, "b"), (3, "c")]),
+        ("a\nkey=value\nb\n", "=", [(2, "key=value")]),
+        ("a=1\nb=2\n", "=", [(1, "a=1"), (2, "b=2")]),
+        ("key=a=b\n" + "\n" * 10 + "last=1", "=", [(1, "key=a=b"), (12, "last=1")]),
+        ("\r\n" * 10 + "key=value\r\n", "=", [(11, "key=value")]),
+    ],
+)
+def test_match_lines(text, marker, expected):
+    assert list(match_lines(text, marker)) == expected
+
+
+def test_match_lines_sparse():
+    text = "".join(f"line {lineno}\n" if lineno % 10 else f"key={lineno}\n" for lineno in range(1, 101))
+    expected = [(lineno, line) for lineno, line in enumerate(text.splitlines(), 1) if "=" in line]
+    assert list(match_lines(text, "=")) == expected
+
+
+@pytest.mark.parametrize("filename", ["script.sh", "plaintext.txt", "Dockerfile"])
+def test_scan_lines(filename):
+    expected = [(lineno, line.rstrip("\n")) for lineno, line in enumerate(open(fixture_path(filename)), 1)]
+    assert list(scan_lines(Path(fixture_path(filename)))) == expected
+
+    data = Path(fixture_path(filename)).read_bytes()
+    assert list(scan_lines(MemoryFile(filename, data))) == expected
+
+
+def test_scan_lines_empty():
+    assert list(scan_lines(MemoryFile("empty.txt", b""))) == []
@@ -0,0 +1,49 @@
+import pytest
+
+from tests.unit.conftest import fixture_path
+from whispers.core.args import parse_args
+from whispers.main import run
+from whispers.plugins.python import Python
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        ("password = 'hardcoded'", [("password", "hardcoded", 1)]),
+        ("password: str = 'hardcoded'", [("password", "hardcoded", 1)]),
+        ("self.password = 'hardcoded'", [("password", "hardcoded", 1)]),
+        ("config['password'] = 'hardcoded'", [("password", "hardcoded", 1)]),
+        ("user, password = 'root', 'hardcoded'", [("user", "root", 1), ("password", "hardcoded", 1)]),
+        ("password = '{}'.format('hardcoded')", [("password", "hardcoded", 1)]),
+        ("password = getenv('PASSWORD') or 'hardcoded'", [("password", "hardcoded", 1)]),
+        ("password = f'hardcoded'", [("password", "hardcoded", 1)]),
+        ("password = f'{hardcoded}'", []),
+        ("password = variable", []),
+        ("password = 123", []),
+        ("login(\n  password='hardcoded',\n)", [("password", "hardcoded", 2)]),
+        ("login(**{'password': 'hardcoded'})", [("password", "hardcoded", 1)]),
+        (
+            "config = {\n  'user': 'root',\n  'password': 'hardcoded',\n}",
+            [("user", "root", 2), ("password", "hardcoded", 3)],
+        ),
+        ("if password == 'hardcoded': pass", [("password", "hardcoded", 1)]),
+        ("if 'hardcoded' != self.password: pass", [("password", "hardcoded", 1)]),
+        ("if password is 'hardcoded': pass", []),
+        ("password = os.getenv('PASSWORD', 'hardcoded')", [("PASSWORD", "hardcoded", 1)]),
+        ("password = os.environ.get('PASSWORD', 'hardcoded' if debug else 'default')", [("PASSWORD", "default", 1)]),
+        ("password = 'unterminated", []),
+    ],
+)
+def test_pairs(tmp_path, code, expected):
+    testfile = tmp_path.joinpath("test.py")
+    testfile.write_text(code)
+    result = [(pair.key, pair.value, pair.line) for pair in Python().pairs(testfile)]
+    assert result == expected
+
+
+def test_fixture():
+    # Same findings as Semgrep, without Semgrep
+    args = parse_args(["--ast", "-F", "None", fixture_path("ast/fixture.py")])
+    result = list(run(args))
+    assert all(["hardcoded" in pair.value for pair in result])
+    assert [pair.line for pair in result] == [2, 5, 31, 32, 33, 34, 35, 36, 37, 38]
@@ -1,5 +1,7 @@
 import json
+import logging
 from io import StringIO
+from pathlib import Path
 from sys import platform
 from unittest.mock import patch
 
@@ -8,6 +10,7 @@ import pytest
 from tests.unit.conftest import fixture_path
 from whispers.core.args import parse_args
 from whispers.main import run
+from whispers.plugins.semgrep import AST, ASTBatch, Semgrep
 
 
 @pytest.mark.parametrize(
@@ -61,3 +64,68 @@ def test_ast_dump(srcfile, expected):
 
         result = json.loads(mock_print.getvalue())
         assert len(result) == expected
+
+
+def test_semgrep_core():
+    if platform.startswith("win"):
+        return
+
+    assert AST.semgrep_core().endswith("semgrep-core")
+
+
+@patch("whispers.plugins.semgrep.run")
+def test_ast_dump_logging(mock_run, monkeypatch):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", [])
+    mock_run.return_value.stdout = b"{}"
+
+    AST.dump(fixture_path("ast/fixture.c"))
+    assert root.handlers == []  # No basicConfig() side effect for embedding programs
+
+
+def test_ast_dump_partial():
+    if platform.startswith("win"):
+        return
+
+    # semgrep-core exits with 1 on partial parsing, but the AST is still usable
+    result = json.loads(AST.dump(fixture_path("ast/fixture.c")))
+    assert len(list(Semgrep().traverse(result)))
+
+
+@patch("whispers.plugins.semgrep.AST.dump")
+def test_prefetch(mock_dump):
+    mock_dump.side_effect = lambda filepath: json.dumps({"file": filepath})
+    files = [Path(f"{idx}.py") for idx in range(10)]
+    asts = ASTBatch(jobs=4, window=3)
+
+    for file in asts.prefetch(files, lambda file: file.name != "0.py"):
+        assert json.loads(asts.dump(file.as_posix())) == {"file": file.as_posix()}
+
+    assert mock_dump.call_count == 10
+    assert sorted(call.args[0] for call in mock_dump.call_args_list) == sorted(f.as_posix() for f in files)
+    assert asts.pending == {}
+
+
+@patch("whispers.plugins.semgrep.AST.dump")
+def test_prefetch_close(mock_dump):
+    mock_dump.return_value = "{}"
+    files = [Path(f"{idx}.py") for idx in range(100)]
+    asts = ASTBatch(jobs=2, window=10)
+
+    prefetch = asts.prefetch(files, lambda file: True)
+    next(prefetch)
+    prefetch.close()
+
+    assert asts.pending == {}
+    assert mock_dump.call_count <= 20  # Never dumps beyond two windows
+
+
+@patch("whispers.plugins.semgrep.AST.dump")
+def test_prefetch_failed(mock_dump):
+    mock_dump.side_effect = RuntimeError("semgrep")
+    asts = ASTBatch()
+
+    for file in asts.prefetch([Path("fail.py")], lambda file: True):
+        assert asts.dump(file.as_posix()) == "{}"
+
+    assert asts.pending == {}
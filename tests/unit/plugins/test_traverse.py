@@ -0,0 +1,33 @@
+from itertools import zip_longest
+
+import pytest
+
+from tests.unit.conftest import pair_line
+from whispers.models.source import MemoryFile
+from whispers.plugins.json import Json
+from whispers.plugins.xml import Xml
+from whispers.plugins.yml import Yml
+
+
+def shapes(pairs):
+    return [(pair.key, pair.value, pair.keypath, pair_line(pair)) for pair in pairs]
+
+
+@pytest.mark.parametrize(
+    ("plugin", "first", "second"),
+    [
+        (Yml, b"a:\n  b:\n    password: one\n", b"x:\n  - y: two\n    z: three\n"),
+        (Json, b'{"a": {"b": {"password": "one"}}}', b'{"x": [{"y": "two", "z": "three"}]}'),
+        (Xml, b"<a><b><password>one</password></b></a>", b"<x><y>two</y><z>three</z></x>"),
+    ],
+)
+def test_pairs_reentrant(plugin, first, second):
+    """One plugin instance, two documents traversed in lockstep"""
+    first, second = MemoryFile(f"first.{plugin.__name__}", first), MemoryFile(f"second.{plugin.__name__}", second)
+    expected = shapes(plugin().pairs(first)), shapes(plugin().pairs(second))
+
+    shared = plugin()
+    interleaved = zip_longest(shared.pairs(first), shared.pairs(second))
+    result = tuple(map(shapes, map(lambda pairs: filter(None, pairs), zip(*interleaved))))
+
+    assert result == expected
@@ -0,0 +1,47 @@
+import pytest
+
+from whispers.models.source import MemoryFile
+from whispers.plugins.xml import Xml
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [
+        (b'<db password="hunter2"/>', [("password", "hunter2", ["db", "password"], 1)]),
+        (
+            b'<add key="apikey" value="s3cr3t"/>',
+            [
+                ("key", "apikey", ["add", "key"], 1),
+                ("value", "s3cr3t", ["add", "value"], 1),
+                ("apikey", "s3cr3t", ["add"], 1),
+            ],
+        ),
+        (b"<root>\n<password>hunter2</password>\n</root>", [("password", "hunter2", ["root", "password"], 2)]),
+        (b"<env>token=abc</env>", [("env", "token=abc", ["env"], 1), ("token", "abc", ["env", "token"], 1)]),
+        (
+            b"<entry>\n  <key>password</key>\n  <value>hunter2</value>\n</entry>",
+            [("key", "password", ["entry", "key"], 2), ("value", "hunter2", ["entry", "value"], 3)]
+            + [("password", "hunter2", ["entry", "password"], 3)],
+        ),
+        (
+            b"<entry><key>password</key><value>hunter2</value></entry>",
+            [("key", "password", ["entry", "key"], 1), ("value", "hunter2", ["entry", "value"], 1)]
+            + [("password", "hunter2", ["entry", "password"], 1)],
+        ),
+    ],
+)
+def test_xml_pairs(document, expected):
+    pairs = Xml().pairs(MemoryFile("config.xml", document))
+    assert [(pair.key, pair.value, pair.keypath, pair.line) for pair in pairs if pair.value.strip()] == expected
+
+
+def test_xml_pairs_release():
+    document = b"<root>" + b"<item><password>hunter2</password></item>" * 1000 + b"</root>"
+    pairs = list(Xml().pairs(MemoryFile("config.xml", document)))
+    assert len(pairs) == 1000
+    assert all(pair.keypath == ["root", "item", "password"] for pair in pairs)
+
+
+def test_xml_pairs_invalid():
+    pairs = Xml().pairs(MemoryFile("config.xml", b"<root><password>hunter2</password><broken"))
+    assert [(pair.key, pair.value) for pair in pairs] == [("password", "hunter2")]
@@ -0,0 +1,49 @@
+import pytest
+import yaml
+
+from whispers.models.source import MemoryFile
+from whispers.plugins.yml import Yml, YmlLoader
+
+
+def test_yml_loader_isolated():
+    list(Yml().pairs(MemoryFile("template.yml", b"enabled: yes\nbucket: !Ref Bucket\n")))
+
+    assert yaml.safe_load("enabled: yes") == {"enabled": True}
+    assert "" not in yaml.SafeLoader.yaml_multi_constructors
+    assert YmlLoader.yaml_implicit_resolvers is not yaml.SafeLoader.yaml_implicit_resolvers
+
+
+def test_yml_values():
+    pairs = Yml().pairs(MemoryFile("template.yml", b"enabled: yes\nbucket: !Ref Bucket\nempty: null\n"))
+    assert [(pair.key, pair.value, pair.line) for pair in pairs if pair.key] == [
+        ("enabled", "yes", 1),
+        ("bucket", "!Ref Bucket", 2),
+        ("empty", "null", 3),
+    ]
+
+
+def test_yml_documents():
+    document = b"---\npassword: one\n---\npassword: two\n...\n---\n---\nkey: [a, b]\n"
+    pairs = Yml().pairs(MemoryFile("manifest.yml", document))
+    assert [(pair.key, pair.value, pair.line) for pair in pairs if pair.key] == [
+        ("password", "one", 2),
+        ("password", "two", 4),
+        ("key", "a", 8),
+        ("key", "b", 8),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("document", "expected"),
+    [
+        ("key: value\n", "key: value\n"),
+        ("image: {{ .Values.image }}\n", "image: '{{ .Values.image }}'\n"),
+        ("{{ include }}\nkey: value", "{{ include }}\nkey: value"),
+        ("a: 1\n{% if x %}\nb: 2\n{% endif %}\n", "a: 1\n\nb: 2\n\n"),
+        ("a: <% multi\nline %>\nb: 2\n", "a: \n\nb: 2\n"),
+        ("a: {{ x }}\nb: <%= y %>\n", "a: '{{ x }}'\nb: \n"),
+    ],
+)
+def test_yml_preprocess(document, expected):
+    assert Yml.preprocess(document) == expected
+    assert Yml.preprocess(document).count("\n") == document.count("\n")  # Lines preserved
@@ -0,0 +1,44 @@
+import os
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from whispers.client import default_socket, make_request, parse_args, request
+
+
+def test_default_socket(monkeypatch):
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+    assert default_socket().endswith(".sock")
+    assert default_socket() == default_socket()
+    assert Path(default_socket()).parent.name.startswith("whispers-")
+
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert default_socket() == "/run/user/1000/whispers.sock"
+
+
+def test_request_not_owned(mocker, tmp_path):
+    mocker.patch("whispers.client.os.getuid", return_value=os.getuid() + 1)
+    with pytest.raises(PermissionError):
+        request(tmp_path.as_posix(), {}, BytesIO())
+
+
+@pytest.mark.parametrize(
+    ("arguments", "expected"),
+    [
+        ([], {"paths": [], "buffers": [], "format": "json"}),
+        (["a", "b/"], {"paths": ["a", "b/"], "buffers": [], "format": "json"}),
+        (["--format", "jsonl", "a"], {"paths": ["a"], "buffers": [], "format": "jsonl"}),
+    ],
+)
+def test_make_request(arguments, expected):
+    request = make_request(parse_args(arguments))
+    assert request == {"cwd": os.getcwd(), **expected}
+
+
+def test_make_request_stdin():
+    with patch("whispers.client.stdin", StringIO("password: hardcoded")):
+        request = make_request(parse_args(["--stdin", "config.yml"]))
+
+    assert request["buffers"] == [{"name": "config.yml", "data": "password: hardcoded"}]
@@ -0,0 +1,45 @@
+import subprocess
+import sys
+
+import pytest
+
+from tests.unit.conftest import fixture_path
+
+LAZY_MODULES = ["lxml", "crossplane", "jproperties", "whispers.plugins.semgrep", "whispers.plugins.html"]
+
+
+def run_main(*argv: str) -> subprocess.CompletedProcess:
+    """Run whispers in a fresh interpreter, reporting imported modules"""
+    code = "import sys; from whispers.main import main\ntry: main()\nfinally: print(*sys.modules)"
+    return subprocess.run([sys.executable, "-c", code, *argv], capture_output=True, text=True)
+
+
+@pytest.mark.parametrize(
+    ("argv", "imported"),
+    [
+        (["--version"], []),
+        (["-j", "1", fixture_path("apikeys.yml")], ["whispers.plugins.yml"]),
+        (["-j", "1", fixture_path("apikeys.json")], ["whispers.plugins.json"]),
+    ],
+)
+def test_lazy_imports(argv, imported):
+    result = run_main(*argv)
+    modules = set(result.stdout.splitlines()[-1].split())  # Last line, after findings
+
+    for module in imported:
+        assert module in modules
+
+    for module in LAZY_MODULES:
+        assert module not in modules
+
+
+def test_import_main():
+    """Importing the entry point loads no plugin, scan server or optional dependency"""
+    code = "import whispers.main, sys; print(*sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    modules = set(result.stdout.split())
+
+    assert "whispers.main" in modules
+    assert not {module for module in modules if module.startswith("whispers.plugins")}
+    assert "whispers.core.server" not in modules
+    assert not modules.intersection(LAZY_MODULES)
@@ -1,3 +1,6 @@
+import logging
+import socket
+from io import BytesIO
 from sys import platform
 
 import pytest
@@ -5,6 +8,7 @@ import pytest
 from tests.unit.conftest import fixture_path
 from whispers.core.args import parse_args
 from whispers.main import main, run
+from whispers.models.pair import KeyValuePair
 
 
 def test_main():
@@ -12,6 +16,14 @@ def test_main():
         main()
 
 
+def test_main_serve_unsupported(mocker, monkeypatch):
+    monkeypatch.delattr(socket, "AF_UNIX", raising=False)
+    mocker.patch("whispers.main.parse_args", return_value=parse_args(["--serve", "whispers.sock"]))
+
+    with pytest.raises(SystemExit, match="Unix domain sockets"):
+        main()
+
+
 @pytest.mark.parametrize(
     ("ast", "expected"),
     [
@@ -31,3 +43,34 @@ def test_run(ast, expected):
     args = parse_args(argv)
     secrets = list(run(args))
     assert len(secrets) == expected
+
+
+@pytest.mark.parametrize("jobs", ["2", "4"])
+def test_run_parallel(jobs):
+    serial = list(map(KeyValuePair.to_json, run(parse_args(["-j", "1", "-F", "None", fixture_path()]))))
+    parallel = list(map(KeyValuePair.to_json, run(parse_args(["-j", jobs, "-F", "None", fixture_path()]))))
+    assert parallel == serial
+
+
+@pytest.mark.parametrize("jobs", ["2", "4"])
+def test_run_parallel_ast(jobs):
+    serial = list(map(KeyValuePair.to_json, run(parse_args(["--ast", "-j", "1", "-F", "None", fixture_path("ast")]))))
+    parallel = list(
+        map(KeyValuePair.to_json, run(parse_args(["--ast", "-j", jobs, "-F", "None", fixture_path("ast")])))
+    )
+    assert parallel == serial
+
+
+def test_run_parallel_logging(caplog):
+    with caplog.at_level(logging.DEBUG):
+        list(run(parse_args(["-j", "2", "--debug", "-F", "None", fixture_path("folder")])))
+
+    assert any("load_rules" in record.getMessage() for record in caplog.records)
+
+
+def test_run_stdin(mocker):
+    mocker.patch("whispers.core.scope.stdin", mocker.Mock(buffer=BytesIO(b"password: hardcoded123\n")))
+    scan_parallel = mocker.patch("whispers.main.scan_parallel")
+    secrets = list(run(parse_args(["-j", "4", "--stdin-name", "config.yml", "-"])))
+    assert [(secret.file, secret.value) for secret in secrets] == [("config.yml", "hardcoded123")]
+    scan_parallel.assert_not_called()  # Single in-memory file
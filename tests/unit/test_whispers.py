@@ -44,3 +44,31 @@ def test_regex_filter(args, expected):
     args = f"{args} {fixture_path()}"
     for secret in whispers.secrets(args):
         assert not secret.file.endswith(expected)
+
+
+def test_secrets_jobs(mocker):
+    run = mocker.patch("whispers.main.run")
+    list(whispers.secrets(fixture_path()))
+    assert run.call_args[0][0].jobs == 1
+
+    list(whispers.secrets(f"-j 3 {fixture_path()}"))
+    assert run.call_args[0][0].jobs == 3
+
+
+@pytest.mark.parametrize(
+    ("name", "data", "expected"),
+    [
+        ("config.yml", b"password: hardcoded123\n", 1),
+        ("config.json", b'{"password": "hardcoded123"}', 1),
+        ("config.yml", memoryview(b"password: hardcoded123\n"), 1),
+        ("config.404", b"password: hardcoded123\n", 0),
+    ],
+)
+def test_scan_bytes(name, data, expected):
+    result = list(whispers.scan_bytes(name, data))
+    assert len(result) == expected
+    assert all(secret.file == name for secret in result)
+
+
+def test_scan_bytes_arguments():
+    assert list(whispers.scan_bytes("config.yml", b"password: hardcoded123\n", "-s Critical")) == []
@@ -1,4 +1,4 @@
-from typing import Iterator
+from typing import Any, Iterator
 
 
 def secrets(arguments: str) -> Iterator:
@@ -8,11 +8,47 @@ def secrets(arguments: str) -> Iterator:
     import whispers
     for secret in whispers.secrets("-r apikey tests/fixtures"):
         print(secret)
+
+    Runs in the calling process unless `--jobs N` is given explicitly.
     """
     import shlex
 
     from whispers.core.args import parse_args
     from whispers.main import run
 
-    argv = shlex.split(arguments)
+    argv = ["--jobs", "1", *shlex.split(arguments)]
     return run(parse_args(argv))
+
+
+def scan_bytes(name: str, data: bytes, arguments: str = "") -> Iterator:
+    """
+    Detect secrets in contents held in memory (bytes or any buffer), parsed as a file with given name.
+    The name selects the plugin (as for files on disk) and is reported as the secret file.
+
+    import whispers
+    for secret in whispers.scan_bytes("config.yml", b"password: hardcoded123"):
+        print(secret)
+
+    Optional `arguments` accepts the same options as `secrets()`, without src.
+    """
+    import shlex
+
+    from whispers.core.args import parse_args
+    from whispers.core.config import load_config
+    from whispers.core.rules import load_rules
+    from whispers.core.secrets import scan_files
+    from whispers.models.source import MemoryFile
+
+    args = parse_args(["--jobs", "1", *shlex.split(arguments), "-"])
+    config = load_config(args)
+    return scan_files(config, load_rules(args, config), [MemoryFile(name, data)])
+
+
+def __getattr__(name: str) -> Any:
+    """Scanner is imported on first use, like the rest of the API"""
+    if name == "Scanner":
+        from whispers.core.scanner import Scanner
+
+        return Scanner
+
+    raise AttributeError(f"module 'whispers' has no attribute '{name}'")
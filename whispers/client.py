@@ -0,0 +1,86 @@
+import json
+import os
+import socket
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from sys import argv, exit, stdin, stdout
+from tempfile import gettempdir
+
+from whispers.core.constants import OUTPUT_FORMATS
+
+
+def main() -> None:  # pragma: no cover
+    """Thin client entry point, see `whispers --serve`"""
+    args = parse_args()
+
+    try:
+        request(args.socket, make_request(args), stdout.buffer)
+
+    except BrokenPipeError:
+        pass  # Output closed early
+
+    except OSError as error:
+        exit(f"whispers-client: cannot reach {args.socket} ({error})")
+
+    exit(args.exitcode)
+
+
+def default_socket() -> str:
+    """
+    Per-user socket path shared by server and client:
+    in $XDG_RUNTIME_DIR, or in a private whispers-<uid> directory created by the server in the temporary directory.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime).joinpath("whispers.sock").as_posix()
+
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return Path(gettempdir()).joinpath(f"whispers-{uid}", "whispers.sock").as_posix()
+
+
+def parse_args(arguments: list = argv[1:]) -> Namespace:
+    """
+    Client arguments only.
+    Config, rules and filters are set when starting the server.
+    This module avoids importing plugins and rules to keep start-up fast.
+    """
+    parser = ArgumentParser("whispers-client", description="Scan files with a running `whispers --serve`")
+    parser.add_argument("--socket", default=default_socket(), help="server socket path")
+    parser.add_argument("--format", default="json", choices=OUTPUT_FORMATS, help="output format (default: json)")
+    parser.add_argument("--stdin", default=None, metavar="NAME", help="scan stdin as a file named NAME")
+    parser.add_argument("-e", "--exitcode", default=0, type=int, help="exit code on success")
+    parser.add_argument("src", nargs="*", help="target files or directories")
+    return parser.parse_args(arguments)
+
+
+def make_request(args: Namespace) -> dict:
+    """Scan request for given client args"""
+    buffers = []
+    if args.stdin:
+        buffers.append({"name": args.stdin, "data": stdin.read()})
+
+    return {"cwd": os.getcwd(), "paths": args.src, "buffers": buffers, "format": args.format}
+
+
+def request(path: str, data: dict, output) -> None:
+    """
+    Send a scan request and stream the formatted response to output.
+    Raises PermissionError if the socket is not owned by the current user,
+    who would otherwise receive the request and could forge the response.
+    """
+    if os.stat(path).st_uid != os.getuid():
+        raise PermissionError(f"{path} is not owned by the current user")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        client.sendall(json.dumps(data).encode() + b"\n")
+        client.shutdown(socket.SHUT_WR)
+
+        with client.makefile("rb") as response:
+            for line in response:
+                output.write(line)
+                output.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import logging
+import tarfile
+import zipfile
+from typing import Iterator, List, Optional, Tuple
+
+from whispers.core.constants import ARCHIVE_MAX_DEPTH, ARCHIVE_MAX_SIZE, REGEX_ARCHIVE_FILE
+from whispers.core.utils import global_exception_handler
+from whispers.models.source import MemoryFile, Source
+
+logger = logging.getLogger(__name__)
+
+
+def is_archive(file: Source) -> bool:
+    return bool(REGEX_ARCHIVE_FILE.search(file.name))
+
+
+def archive_members(file: Source, depth: int = 0, budget: Optional[List[int]] = None) -> Iterator[MemoryFile]:
+    """
+    Regular files in a zip or tar archive, read into memory without extraction.
+    Nested archives are expanded in place, up to ARCHIVE_MAX_DEPTH levels.
+    Members stop being read once ARCHIVE_MAX_SIZE bytes were read from the outermost archive.
+    Members are named `archive!/member`.
+    """
+    budget = budget if budget is not None else [ARCHIVE_MAX_SIZE]
+
+    try:
+        with file.open("rb") as fh:
+            for name, data in read_archive(fh, file.name, budget):
+                member = MemoryFile(f"{file.as_posix()}!/{name}", data)
+
+                if not is_archive(member):
+                    yield member
+
+                elif depth + 1 < ARCHIVE_MAX_DEPTH:
+                    yield from archive_members(member, depth + 1, budget)
+
+                else:
+                    logger.debug(f"archive_members skipped nested archive '{member}'")
+
+    except Exception:
+        global_exception_handler(file.as_posix(), "archive_members()")
+
+
+def read_archive(fh, name: str, budget: List[int]) -> Iterator[Tuple[str, bytes]]:
+    """Names and contents of regular files in a zip or tar archive, within size budget"""
+    if zipfile.is_zipfile(fh):
+        with zipfile.ZipFile(fh) as archive:
+            for info in archive.infolist():
+                if info.is_dir() or not within_budget(info.file_size, budget, name):
+                    continue
+
+                yield info.filename, archive.read(info)
+
+        return
+
+    fh.seek(0)
+    with tarfile.open(fileobj=fh, mode="r:*") as archive:
+        for info in archive:
+            if not info.isfile() or not within_budget(info.size, budget, name):
+                continue
+
+            yield info.name, archive.extractfile(info).read()
+
+
+def within_budget(size: int, budget: List[int], name: str) -> bool:
+    """Reserve size bytes from remaining budget"""
+    if size > budget[0]:
+        logger.debug(f"read_archive reached size limit in '{name}'")
+        budget[0] = 0
+        return False
+
+    budget[0] -= size
+    return True
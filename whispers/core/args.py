@@ -4,9 +4,10 @@ from functools import wraps
 from sys import argv, exit, stdout
 
 from whispers.__version__ import __version__, __whispers__
-from whispers.core.constants import DEFAULT_PATH
-from whispers.core.utils import default_rules, load_regex
-from whispers.plugins.semgrep import AST
+from whispers.client import default_socket
+from whispers.core.constants import DEFAULT_PATH, OUTPUT_FORMATS
+from whispers.core.snapshot import load_snapshot
+from whispers.core.utils import cpu_count, load_regex
 
 
 def argument_parser() -> ArgumentParser:
@@ -16,9 +17,23 @@ def argument_parser() -> ArgumentParser:
     args_parser.add_argument("--version", action="version", version=__version__, help="show version and exit")
     args_parser.add_argument("--init", default=False, action="store_true", help="make config and exit")
     args_parser.add_argument("--dump", action="store_true", help="dump AST and exit")
+    args_parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=default_socket(),
+        default=None,
+        metavar="SOCKET",
+        help="serve scans for whispers-client on a Unix socket (default: %(const)s)",
+    )
     args_parser.add_argument("-a", "--ast", action="store_true", help="enable AST analysis")
     args_parser.add_argument("-c", "--config", default=None, help="config filename")
     args_parser.add_argument("-o", "--output", default=None, help="output filename")
+    args_parser.add_argument(
+        "--format",
+        default="json",
+        choices=OUTPUT_FORMATS,
+        help="output format, streamed as secrets are found (default: json)",
+    )
     args_parser.add_argument("-l", "--log", default=None, help="log filename")
     args_parser.add_argument(
         "-v",
@@ -35,6 +50,23 @@ def argument_parser() -> ArgumentParser:
         default=None,
         help="show debug log",
     )
+    args_parser.add_argument(
+        "-j",
+        "--jobs",
+        default=None,
+        type=int,
+        help="number of parallel worker processes (default: CPU count)",
+    )
+    args_parser.add_argument("--cache", default=None, help="cache directory for findings in unchanged files")
+    args_parser.add_argument("--cache-size", default=512, type=int, help="cache size limit in MB (default: 512)")
+    args_parser.add_argument("--diff", default=None, metavar="BASE[..HEAD]", help="only scan files changed in git")
+    args_parser.add_argument("--history", action="store_true", help="scan all commits of a git repository")
+    args_parser.add_argument("--staged", action="store_true", help="only scan files staged in git (pre-commit)")
+    args_parser.add_argument(
+        "--added-only",
+        action="store_true",
+        help="with --diff or --staged, only report secrets on added lines",
+    )
     args_parser.add_argument("-e", "--exitcode", default=0, type=int, help="exit code on success")
     args_parser.add_argument("-f", "--files", default=None, help="csv of globs for including files")
     args_parser.add_argument("-F", "--xfiles", default=None, help="regex for excluding files")
@@ -44,7 +76,13 @@ def argument_parser() -> ArgumentParser:
     args_parser.add_argument("-R", "--xrules", default=None, help="csv of rule IDs to exclude (see --info)")
     args_parser.add_argument("-s", "--severity", default=None, help="csv of severity levels to report (see --info)")
     args_parser.add_argument("-S", "--xseverity", default=None, help="csv of severity levels to exclude (see --info)")
-    args_parser.add_argument("src", nargs="*", help="target file or directory")
+    args_parser.add_argument(
+        "--stdin-name",
+        default="stdin.txt",
+        metavar="NAME",
+        help="with src '-', scan stdin as a file named NAME (default: %(default)s)",
+    )
+    args_parser.add_argument("src", nargs="*", help="target file or directory, or '-' for stdin")
 
     args_parser.print_help = show_splash(args_parser.print_help)
 
@@ -63,13 +101,15 @@ def parse_args(arguments: list = argv[1:]) -> Namespace:
         show_config()
         exit()
 
-    if not args.src:
+    if args.src:
+        args.src = args.src[0]
+    elif not args.serve:
         argument_parser().print_help()
         exit()
-    else:
-        args.src = args.src[0]
 
     if args.dump:
+        from whispers.plugins.semgrep import AST  # Imported only for --dump
+
         print(AST.dump(args.src))
         exit()
 
@@ -86,6 +126,9 @@ def parse_args(arguments: list = argv[1:]) -> Namespace:
     else:
         args.output = stdout
 
+    if not args.jobs or args.jobs < 1:
+        args.jobs = cpu_count()
+
     if args.files:
         args.files = args.files.split(",")
 
@@ -131,7 +174,7 @@ def show_info():
     argument_parser().print_help()
     rules_table = []
     col_width = 20
-    for rule in default_rules():
+    for rule in load_snapshot().rules:
         line = (
             "    "
             + rule["group"].ljust(col_width)[:col_width]
@@ -0,0 +1,146 @@
+import json
+import os
+from argparse import Namespace
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from whispers.__version__ import __version__
+from whispers.core.utils import global_exception_handler
+from whispers.models.appconfig import AppConfig
+from whispers.models.pair import KeyValuePair
+from whispers.models.rule import Rule
+
+CACHE_CHUNK = 1024 * 1024
+
+
+class ScanCache:
+    """
+    On-disk cache of findings, content-addressed by file path, file content,
+    and a fingerprint of the active rules and config.
+    Entries are plain JSON without absolute paths, so the cache directory
+    can be saved and restored on another machine.
+    Entries contain detected secret values, so they are only readable by the owner.
+    """
+
+    def __init__(self, path: Path, config: AppConfig, rules: List[Rule]) -> None:
+        self.path = path
+        self.rules = {rule.id: rule for rule in reversed(rules)}
+        self.fingerprint = cache_fingerprint(config, rules)
+        self.path.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+    def key(self, file: Path) -> str:
+        """Cache key for the current content of given file"""
+        digest = sha256(self.fingerprint.encode())
+        digest.update(file.as_posix().encode() + b"\0")
+
+        with file.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(CACHE_CHUNK), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def entry(self, key: str) -> Path:
+        return self.path.joinpath(key[:2], f"{key}.json")
+
+    def load(self, key: str, file: Path) -> Optional[List[KeyValuePair]]:
+        """Replay stored findings, or None on cache miss"""
+        entry = self.entry(key)
+
+        try:
+            items = json.loads(entry.read_text())
+            secrets = [
+                KeyValuePair(
+                    item["key"],
+                    item["value"],
+                    item["keypath"],
+                    file=file.as_posix() + item.get("member", ""),
+                    line=item["line"],
+                    rule=self.rules[item["rule_id"]],
+                )
+                for item in items
+            ]
+
+        except Exception:
+            return None  # Missing or unusable entry
+
+        os.utime(entry)  # Mark as recently used
+        return secrets
+
+    def save(self, key: str, file: Path, secrets: List[KeyValuePair]) -> None:
+        """Atomically store findings for given key, with archive member paths relative to file"""
+        prefix = len(file.as_posix())
+        items = [
+            {
+                "key": secret.key,
+                "value": secret.value,
+                "keypath": secret.keypath,
+                "member": secret.file[prefix:],
+                "line": secret.line,
+                "rule_id": secret.rule.id,
+            }
+            for secret in secrets
+        ]
+
+        entry = self.entry(key)
+        tmpfile = entry.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            entry.parent.mkdir(mode=0o700, exist_ok=True)
+            fd = os.open(tmpfile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w") as fh:
+                fh.write(json.dumps(items, default=str))
+
+            os.replace(tmpfile, entry)
+
+        except OSError:
+            global_exception_handler(entry.as_posix(), "ScanCache.save()")
+
+
+def cache_fingerprint(config: AppConfig, rules: List[Rule]) -> str:
+    """
+    Fingerprint of everything that affects findings, other than the file itself.
+    The whole resolved config is included, so that new config options invalidate entries too.
+    """
+    state = [__version__, repr(config), repr(rules)]
+    return sha256("\0".join(state).encode()).hexdigest()
+
+
+def load_cache(args: Namespace, config: AppConfig, rules: List[Rule]) -> Optional[ScanCache]:
+    """Load scan cache if enabled in args"""
+    if not args.cache:
+        return None
+
+    return ScanCache(Path(args.cache), config, rules)
+
+
+def evict_cache(path: Path, max_size: int) -> None:
+    """Remove least recently used entries until cache size is below max_size bytes"""
+    entries = []
+    for entry in path.glob("*/*.json"):
+        try:
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        except OSError:
+            continue
+
+    size = sum(map(lambda entry: entry[1], entries))
+
+    for _, entry_size, entry in sorted(entries, key=lambda entry: entry[0]):
+        if size <= max_size:
+            break
+
+        try:
+            entry.unlink()
+            size -= entry_size
+
+        except OSError:
+            global_exception_handler(entry.as_posix(), "evict_cache()")
+
+
+def evict_after(secrets: Iterable[KeyValuePair], args: Namespace) -> Iterator[KeyValuePair]:
+    """Apply cache size cap once all secrets have been consumed"""
+    yield from secrets
+
+    evict_cache(Path(args.cache), args.cache_size * 1024 * 1024)
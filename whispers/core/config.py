@@ -7,6 +7,8 @@ from whispers.core.constants import DEFAULT_PATH
 from whispers.core.utils import load_yaml_from_file
 from whispers.models.appconfig import AppConfig
 
+logger = logging.getLogger(__name__)
+
 
 def load_config(args: Namespace) -> dict:
     """Load config given args"""
@@ -15,6 +17,24 @@ def load_config(args: Namespace) -> dict:
     else:
         configfile = DEFAULT_PATH.joinpath("config.yml")
 
+    config = read_config(configfile)
+    config.ast = args.ast or config.ast
+    config.ast ^= platform.startswith("win")  # Semgrep does not support Windows
+    config.include.rules = args.rules or config.include.rules
+    config.exclude.rules = args.xrules or config.exclude.rules
+    config.include.groups = args.groups or config.include.groups
+    config.exclude.groups = args.xgroups or config.exclude.groups
+    config.include.severity = args.severity or config.include.severity
+    config.exclude.severity = args.xseverity or config.exclude.severity
+    config.include.files = args.files or config.include.files
+    config.exclude.files = args.xfiles or config.exclude.files
+
+    logger.debug(f"load_config '{config}'")
+    return config
+
+
+def read_config(configfile: Path) -> AppConfig:
+    """Parse config file"""
     file_exists = False
 
     try:
@@ -37,20 +57,7 @@ def load_config(args: Namespace) -> dict:
         raise TypeError(f"{configfile.as_posix()} is not a file")
 
     try:
-        config = AppConfig(load_yaml_from_file(configfile))
-        config.ast = args.ast or config.ast
-        config.ast ^= platform.startswith("win")  # Semgrep does not support Windows
-        config.include.rules = args.rules or config.include.rules
-        config.exclude.rules = args.xrules or config.exclude.rules
-        config.include.groups = args.groups or config.include.groups
-        config.exclude.groups = args.xgroups or config.exclude.groups
-        config.include.severity = args.severity or config.include.severity
-        config.exclude.severity = args.xseverity or config.exclude.severity
-        config.include.files = args.files or config.include.files
-        config.exclude.files = args.xfiles or config.exclude.files
+        return AppConfig(load_yaml_from_file(configfile))
 
     except Exception:
         raise RuntimeError(f"{configfile.as_posix()} is invalid")
-
-    logging.debug(f"load_config '{config}'")
-    return config
@@ -1,10 +1,18 @@
 from pathlib import Path
-from re import IGNORECASE, compile
+from re import DOTALL, IGNORECASE, MULTILINE, compile
 
 DEFAULT_PATH = Path(__file__).parents[1]
 
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_CPU_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_CPU_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
 DEFAULT_SEVERITY = ["Critical", "High", "Medium", "Low", "Info"]
 
+OUTPUT_FORMATS = ["json", "jsonl", "sarif"]
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {"Critical": "error", "High": "error", "Medium": "warning", "Low": "note", "Info": "note"}
+
 ESCAPED_CHARS = str.maketrans({"'": r"\'", '"': r"\""})
 
 REGEX_URI = compile(r"[:\w\d]+://.+", flags=IGNORECASE)
@@ -12,12 +20,35 @@ REGEX_PATH = compile(r"^((([A-Z]|file|root):)?(\.+)?[/\\]+).*$", flags=IGNORECAS
 REGEX_IAC = compile(r"\![A-Za-z]+ .+", flags=IGNORECASE)
 REGEX_PRIVKEY_FILE = compile(r"(rsa|dsa|ed25519|ecdsa|pem|crt|cer|ca-bundle|p7b|p7c|p7s|ppk|pkcs12|pfx|p12)")
 REGEX_ENVVAR = compile(r"^\$\$?\{?[A-Z0-9_]+\}?$")
+REGEX_GLOB_RECURSIVE = "(?:[^/]*/)*"
 REGEX_SEMVER = compile(r"^[\^~\-=vV<>]{0,3}([0-9]+\.){1,2}[0-9]+(\-.*)?$")
+REGEX_LITERAL_KEY = compile(r"^\^([^.^$*+?{}\[\]\\|()]*)\$$")
+REGEX_BACKREF = compile(r"\\[1-9]|\(\?P=")
+REGEX_YAML_UNQUOTED = compile(r".+\{\{.*\}\}")  # Unquoted {{ placeholder }}
+REGEX_YAML_TEMPLATE = compile(r"[<{]%.*?%[}>]", flags=DOTALL)  # <% ... %> and {% ... %}
+REGEX_JSON_WHITESPACE = compile(r"[ \t\n\r]*")
+REGEX_JSON_SCALAR = compile(r"(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?|true|false|null")
+REGEX_CONFIG_LINE = compile(r"^[ \t]*([^\s#;].*)$", flags=MULTILINE)  # First line that is not empty or a comment
+REGEX_CONFIG_ASSIGNMENT = compile(r"^[ \t]*[\w.-]+[ \t]*=", flags=MULTILINE)  # key=value
+REGEX_NGINX_DIRECTIVE = compile(r"[\w.-]+(\s+[^\s=].*?)?\s*[;{]\s*(#.*)?$")  # directive args; or directive args {
+REGEX_SCRIPT_STRING = compile(
+    r"""(?:["']?(?P<key>[A-Za-z_$][\w$-]*)["']?\s*[:=]\s*)?(?P<quote>["'`])(?P<value>(?:\\.|(?!(?P=quote))[^\\\n])*)(?P=quote)"""
+)  # "string", and key = "string" or key: "string", in JavaScript
+REGEX_DIFF_FILE = compile(r"^\+\+\+ (.+?)\t?$")
+REGEX_DIFF_HUNK = compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
 
+REGEX_PYTHON_FILE = compile(r"py(thon)?[0-9]*$")
 REGEX_AST_FILE = compile(
     r"(py(thon)?|[jt]s|vue|java(script)?|kts?|scala|php|go(lang)?|c(pp|\+\+|s(harp)?|\#)?|lua|r[bs]?|clj|(g|prom)?ql|tf|proto|jsonnet|ocaml|hack|lisp|dart|julia|hcl|solidity|swift|(ap)?ex)[0-9]*$"
 )
 REGEX_AST_FILE_VERSION = compile(r"[0-9]*$")
+AST_PREFETCH_WINDOW = 64
+
+REGEX_ARCHIVE_FILE = compile(
+    r"\.(zip|jar|war|ear|aar|apk|whl|egg|nupkg|tar|tgz|tbz2?|txz|tar\.(gz|bz2|xz))$", flags=IGNORECASE
+)
+ARCHIVE_MAX_DEPTH = 3  # Outer archive and two levels of nested archives
+ARCHIVE_MAX_SIZE = 256 * 1024 * 1024  # Uncompressed bytes read per outer archive
 MAP_AST_LANG = {
     "kts": "kotlin",
     "clj": "clojure",
@@ -25,3 +56,7 @@ MAP_AST_LANG = {
     "rb": "ruby",
     "rs": "rust",
 }
+
+JSON_STREAM_SIZE = 64  # MB, larger JSON files are parsed incrementally (see config json_stream_size)
+JSON_STREAM_CHUNK = 1024 * 1024
+HTML_CHUNK = 1024 * 1024
@@ -0,0 +1,134 @@
+import codecs
+from argparse import Namespace
+from pathlib import Path
+from subprocess import PIPE, Popen, run
+from typing import Dict, Iterable, Iterator, List, Set
+
+from whispers.core.constants import REGEX_DIFF_FILE, REGEX_DIFF_HUNK
+from whispers.models.pair import KeyValuePair
+
+
+def git(root: Path, *argv: str) -> str:
+    """Run a git command in root, raising RuntimeError on failure"""
+    try:
+        result = run(["git", "-C", root.as_posix(), *argv], stdout=PIPE, stderr=PIPE)
+
+    except OSError:
+        raise RuntimeError("git is not available")
+
+    if result.returncode != 0:
+        error = result.stderr.decode(errors="replace").strip()
+        raise RuntimeError(f"git {argv[0]} failed: {error}")
+
+    return result.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def git_lines(root: Path, *argv: str) -> Iterator[str]:
+    """Run a git command in root, yielding output lines as they are read, raising RuntimeError on failure"""
+    try:
+        process = Popen(
+            ["git", "-C", root.as_posix(), *argv],
+            stdout=PIPE,
+            stderr=PIPE,
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+
+    except OSError:
+        raise RuntimeError("git is not available")
+
+    with process:
+        try:
+            for line in process.stdout:
+                yield line.rstrip("\n")
+
+        except BaseException:  # Stopped early
+            process.kill()
+            raise
+
+        error = process.stderr.read().strip()
+
+    if process.returncode != 0:
+        raise RuntimeError(f"git {argv[0]} failed: {error}")
+
+
+def diff_revisions(args: Namespace) -> List[str]:
+    """git diff revision arguments: staged changes, or BASE[..HEAD]"""
+    return ["--cached"] if args.staged else [args.diff]
+
+
+def diff_root(src: Path) -> Path:
+    """Directory to run git in, so that reported paths start with src"""
+    return src if src.is_dir() else src.parent
+
+
+def diff_path(root: Path, relpath: str) -> str:
+    """Path of a changed file as yielded by load_scope"""
+    return relpath if root.as_posix() == "." else f"{root.as_posix().rstrip('/')}/{relpath}"
+
+
+def diff_files(src: Path, revisions: List[str]) -> List[str]:
+    """Paths (relative to src) of files added, copied, modified or renamed in given revisions"""
+    root = diff_root(src)
+    pathspec = [] if src.is_dir() else [src.name]
+    output = git(root, "diff", "--name-only", "-z", "--diff-filter=ACMR", "--relative", *revisions, "--", *pathspec)
+    return list(filter(None, output.split("\0")))
+
+
+def added_lines(src: Path, revisions: List[str]) -> Dict[str, Set[int]]:
+    """Line numbers added in given revisions, by file path as yielded by load_scope"""
+    root = diff_root(src)
+    pathspec = [] if src.is_dir() else [src.name]
+    output = git(
+        root,
+        "diff",
+        "-U0",
+        "--no-color",
+        "--no-ext-diff",
+        "--no-prefix",
+        "--diff-filter=ACMR",
+        "--relative",
+        *revisions,
+        "--",
+        *pathspec,
+    )
+
+    lines = {}
+    added = set()
+    header = False  # Added lines may look like "+++ " file headers
+
+    for line in output.split("\n"):
+        if line.startswith("diff --git "):
+            header = True
+            continue
+
+        found = REGEX_DIFF_FILE.match(line) if header else None
+        if found:
+            added = lines.setdefault(diff_path(root, unquote(found[1])), set())
+            continue
+
+        found = REGEX_DIFF_HUNK.match(line)
+        if found:
+            header = False
+            start, count = int(found[1]), int(found[2] or 1)
+            added.update(range(start, start + count))
+
+    return lines
+
+
+def unquote(path: str) -> str:
+    """Path as quoted by git for special characters"""
+    if not path.startswith('"'):
+        return path
+
+    return codecs.escape_decode(path[1:-1])[0].decode("utf-8", errors="surrogateescape")
+
+
+def filter_added(secrets: Iterable[KeyValuePair], lines: Dict[str, Set[int]]) -> Iterator[KeyValuePair]:
+    """
+    Secrets on added lines only.
+    Secrets without a known line are kept, since they cannot be attributed.
+    """
+    for secret in secrets:
+        if not secret.line or secret.line in lines.get(secret.file, ()):
+            yield secret
@@ -0,0 +1,150 @@
+import logging
+from collections import defaultdict
+from contextlib import closing
+from copy import copy
+from pathlib import Path
+from subprocess import PIPE, Popen
+from threading import Thread
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from whispers.core.git import diff_path, git_lines, unquote
+from whispers.core.pairs import filter_included, load_plugin, make_pairs
+from whispers.core.scope import included_path
+from whispers.core.secrets import detect_secrets
+from whispers.core.utils import load_globs
+from whispers.models.appconfig import AppConfig
+from whispers.models.pair import KeyValuePair
+from whispers.models.rule import Rule
+from whispers.models.source import MemoryFile
+
+logger = logging.getLogger(__name__)
+
+BLOB_MODES = ["100644", "100755"]  # Regular files, not symlinks or submodules
+
+
+def history_blobs(root: Path, config: AppConfig) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Blobs added or modified by any commit reachable from any ref,
+    as {blob SHA: [(commit SHA, path relative to root)]}, in git log order.
+    """
+    log = git_lines(
+        root,
+        "log",
+        "--all",
+        "-m",
+        "--raw",
+        "--no-renames",
+        "--no-abbrev",
+        "--diff-filter=AM",
+        "--relative",
+        "--format=%x01%H",
+    )
+
+    globs = load_globs(config.include.files)
+    blobs = defaultdict(list)
+    commit = ""
+
+    for line in log:
+        if line.startswith("\x01"):
+            commit = line[1:]
+
+        elif line.startswith(":"):
+            status, relpath = line.split("\t", 1)
+            _, mode, _, blob, _ = status.split(" ")
+            relpath = unquote(relpath)
+
+            if mode not in BLOB_MODES or not included_path(root, relpath, globs, config.exclude.files):
+                continue
+
+            if (commit, relpath) not in blobs[blob]:
+                blobs[blob].append((commit, relpath))  # Merges are listed once per parent
+
+    return blobs
+
+
+def read_blobs(root: Path, blobs: List[str]) -> Iterator[Optional[bytes]]:
+    """Stream contents of given blobs (None if missing) from a single `git cat-file --batch` process"""
+    process = Popen(["git", "-C", root.as_posix(), "cat-file", "--batch"], stdin=PIPE, stdout=PIPE)
+    writer = Thread(target=request_blobs, args=(process.stdin, blobs), daemon=True)
+    writer.start()
+
+    try:
+        for blob in blobs:
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                logger.debug(f"read_blobs missing '{blob}'")
+                yield None
+                continue
+
+            data = process.stdout.read(int(header[2]))
+            process.stdout.read(1)  # Trailing newline
+            yield data
+
+    finally:
+        process.kill()
+        process.wait()
+        writer.join()
+
+
+def request_blobs(stdin: IO[bytes], blobs: List[str]) -> None:
+    """Feed blob SHAs to `git cat-file --batch` while contents are being read"""
+    try:
+        for blob in blobs:
+            stdin.write(f"{blob}\n".encode())
+
+        stdin.close()
+
+    except OSError:
+        pass  # Reader stopped early
+
+
+def scan_history(config: AppConfig, rules: List[Rule], src: Path) -> Iterator[KeyValuePair]:
+    """
+    Detect secrets in all commits of the git repository at src, without checking anything out.
+    Each unique blob is parsed once, and its secrets are reported for every commit and path that added it.
+    File name secrets are detected and reported once per path, with the first commit listing it.
+    """
+    blobs = history_blobs(src, config)
+
+    # Blobs without a plugin for any of their paths only have file name secrets
+    names = {}
+    for blob, commits in blobs.items():
+        for _, relpath in commits:
+            if load_plugin(Path(relpath), config.ast):
+                names[blob] = relpath
+                break
+
+    contents = read_blobs(src, list(names))
+    paths = set()
+
+    with closing(contents):
+        for blob, commits in blobs.items():
+            secrets = []
+            data = next(contents) if blob in names else None
+            if data is not None:
+                secrets = scan_blob(config, rules, MemoryFile(names[blob], data))
+
+            for commit, relpath in commits:
+                path = diff_path(src, relpath)
+                found = secrets
+                if path not in paths:
+                    paths.add(path)
+                    found = scan_path(config, rules, path) + secrets
+
+                for secret in found:
+                    secret = copy(secret)
+                    secret.file = path
+                    secret.commit = commit
+                    yield secret
+
+
+def scan_blob(config: AppConfig, rules: List[Rule], file: MemoryFile) -> List[KeyValuePair]:
+    """Secrets in blob contents, excluding the file name (see scan_path)"""
+    secrets = detect_secrets(rules, make_pairs(config, file))
+    return [copy(secret) for secret in secrets if secret.key != "file" or secret.value != file.as_posix()]
+
+
+def scan_path(config: AppConfig, rules: List[Rule], path: str) -> List[KeyValuePair]:
+    """Secrets in file path (see make_pairs)"""
+    pair = filter_included(config, KeyValuePair("file", path, file=path))
+    return list(map(copy, detect_secrets(rules, filter(None, [pair]))))
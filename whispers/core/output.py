@@ -0,0 +1,79 @@
+import json
+from typing import Dict, Iterable, Iterator, TextIO
+
+from whispers.__version__ import __version__
+from whispers.core.constants import SARIF_LEVELS, SARIF_SCHEMA
+from whispers.models.pair import KeyValuePair
+from whispers.models.rule import Rule
+
+
+def write_output(secrets: Iterable[KeyValuePair], output: TextIO, fmt: str = "json") -> None:
+    """Write secrets in given format, flushing each one as soon as it is found"""
+    formatter = {"json": format_json, "jsonl": format_jsonl, "sarif": format_sarif}[fmt]
+
+    for text in formatter(secrets):
+        output.write(text)
+        output.flush()
+
+
+def format_json(secrets: Iterable[KeyValuePair]) -> Iterator[str]:
+    """JSON array, same as json.dumps() of all secrets"""
+    separator = "["
+    for secret in secrets:
+        yield separator + json.dumps(secret.to_json())
+        separator = ", "
+
+    yield "[]\n" if separator == "[" else "]\n"
+
+
+def format_jsonl(secrets: Iterable[KeyValuePair]) -> Iterator[str]:
+    """JSON Lines, one secret per line"""
+    for secret in secrets:
+        yield json.dumps(secret.to_json()) + "\n"
+
+
+def format_sarif(secrets: Iterable[KeyValuePair]) -> Iterator[str]:
+    """
+    SARIF 2.1.0 log with one result per line.
+    Results come before the tool description, which lists the rules that were reported.
+    """
+    rules = {}
+    separator = ""
+
+    yield f'{{"$schema": "{SARIF_SCHEMA}", "version": "2.1.0", "runs": [{{"results": ['
+
+    for secret in secrets:
+        rules.setdefault(secret.rule.id, secret.rule)
+        yield f"{separator}\n{json.dumps(sarif_result(secret))}"
+        separator = ","
+
+    driver = {
+        "name": "whispers",
+        "version": __version__,
+        "informationUri": "https://github.com/adeptex/whispers",
+        "rules": [sarif_rule(rule) for rule in rules.values()],
+    }
+
+    yield f'\n], "tool": {{"driver": {json.dumps(driver)}}}}}]}}\n'
+
+
+def sarif_result(secret: KeyValuePair) -> Dict:
+    location = {"artifactLocation": {"uri": secret.file}}
+    if secret.line:
+        location["region"] = {"startLine": secret.line}
+
+    return {
+        "ruleId": secret.rule.id,
+        "level": SARIF_LEVELS.get(secret.rule.severity, "warning"),
+        "message": {"text": f"{secret.rule.message}: {secret.key}"},
+        "locations": [{"physicalLocation": location}],
+        "properties": secret.to_json(),
+    }
+
+
+def sarif_rule(rule: Rule) -> Dict:
+    return {
+        "id": rule.id,
+        "shortDescription": {"text": rule.message},
+        "properties": {"group": rule.group, "severity": rule.severity},
+    }
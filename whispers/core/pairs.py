@@ -1,56 +1,58 @@
 import logging
+from functools import lru_cache
+from importlib import import_module
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
 
-from whispers.core.constants import REGEX_AST_FILE, REGEX_PRIVKEY_FILE
+from whispers.core.archive import archive_members, is_archive
+from whispers.core.constants import REGEX_AST_FILE, REGEX_PRIVKEY_FILE, REGEX_PYTHON_FILE
 from whispers.core.utils import global_exception_handler, is_static, strip_string
 from whispers.models.appconfig import AppConfig
 from whispers.models.pair import KeyValuePair
-from whispers.plugins.config import Config
-from whispers.plugins.dockercfg import Dockercfg
-from whispers.plugins.dockerfile import Dockerfile
-from whispers.plugins.elixir import Elixir
-from whispers.plugins.gradle import Gradle
-from whispers.plugins.html import Html
-from whispers.plugins.htpasswd import Htpasswd
-from whispers.plugins.jproperties import Jproperties
-from whispers.plugins.json import Json
-from whispers.plugins.npmrc import Npmrc
-from whispers.plugins.pip import Pip
-from whispers.plugins.plaintext import Plaintext
-from whispers.plugins.pypirc import Pypirc
-from whispers.plugins.shell import Shell
-from whispers.plugins.xml import Xml
-from whispers.plugins.yml import Yml
-
-
-def make_pairs(config: AppConfig, file: Path) -> Optional[Iterator[KeyValuePair]]:
-    """Generates KeyValuePair objects by parsing given file"""
-    try:
-        if not file.exists():
-            return None
+from whispers.models.source import Source
 
-        if not file.is_file():
-            return None
+if TYPE_CHECKING:
+    from whispers.plugins.semgrep import ASTBatch
+
+logger = logging.getLogger(__name__)
 
-    except Exception:  # pragma: no cover
-        global_exception_handler(file.as_posix(), "make_pairs()")
-        return None
 
+def make_pairs(config: AppConfig, file: Source, asts: Optional["ASTBatch"] = None) -> Optional[Iterator[KeyValuePair]]:
+    """
+    Generates KeyValuePair objects by parsing given file.
+    Expects a regular file or in-memory source, as yielded by load_scope, or an archive member.
+    Optional `asts` provides ASTs dumped ahead of parsing (see prefetch_ast).
+    """
     # First, return file name to check if it is a sensitive file
     pair = KeyValuePair("file", file.as_posix())
     if filter_included(config, pair):
         yield tag_file(file, pair)
 
+    # Archive members are parsed from memory, as if they were files
+    if is_archive(file):
+        for member in archive_members(file):
+            if config.exclude.files and config.exclude.files.match(member.as_posix()):
+                continue  # Excluded member
+
+            yield from make_pairs(config, member)
+
+        return None
+
     # Second, attempt to parse the file with a plugin
     plugin = load_plugin(file, config.ast)
 
-    logging.debug(f"make_pairs '{plugin}' for '{file}'")
+    logger.debug(f"make_pairs '{plugin}' for '{file}'")
 
     if not plugin:
         return None
 
-    pairs = plugin().pairs(file)
+    if asts and plugin is import_plugin("semgrep"):
+        pairs = plugin(asts).pairs(file)
+    elif hasattr(plugin, "from_config"):  # Plugins with options
+        pairs = plugin.from_config(config).pairs(file)
+    else:
+        pairs = plugin().pairs(file)
+
     static = filter(None, map(filter_static, pairs))
     included = filter(None, map(lambda pair: filter_included(config, pair), static))
     tagged = map(lambda pair: tag_file(file, pair), included)
@@ -63,9 +65,15 @@ def make_pairs(config: AppConfig, file: Path) -> Optional[Iterator[KeyValuePair]
         return None
 
 
-def tag_file(file: Path, pair: KeyValuePair) -> KeyValuePair:
-    """Add pair file path"""
+def prefetch_ast(files: Iterable[Path], asts: "ASTBatch") -> Iterator[Path]:
+    """Dump ASTs of upcoming static code files in language batches, ahead of parsing"""
+    return asts.prefetch(files, lambda file: load_plugin(file, ast=True) is import_plugin("semgrep"))
+
+
+def tag_file(file: Source, pair: KeyValuePair) -> KeyValuePair:
+    """Add pair file path, and file for finding line numbers"""
     pair.file = file.as_posix()
+    pair.source = file
     return pair
 
 
@@ -74,15 +82,15 @@ def filter_included(config: AppConfig, pair: KeyValuePair) -> Optional[KeyValueP
     if config.exclude.keys:
         for key in pair.keypath:
             if config.exclude.keys.match(str(key)):
-                logging.debug(f"filter_included excluded key '{key}'")
+                logger.debug(f"filter_included excluded key '{key}'")
                 return None  # Excluded key
 
     if config.exclude.values:
         if config.exclude.values.match(pair.value):
-            logging.debug(f"filter_included excluded value '{pair.value}'")
+            logger.debug(f"filter_included excluded value '{pair.value}'")
             return None  # Excluded value
 
-    logging.debug(f"filter_included included pair '{pair}'")
+    logger.debug(f"filter_included included pair '{pair}'")
     return pair  # Included value
 
 
@@ -92,18 +100,19 @@ def filter_static(pair: KeyValuePair) -> Optional[KeyValuePair]:
     pair.value = strip_string(pair.value)
 
     if not is_static(pair.key, pair.value):
-        logging.debug(f"filter_static excluded value '{pair.value}'")
+        logger.debug(f"filter_static excluded value '{pair.value}'")
         return None  # Dynamic value
 
-    logging.debug(f"filter_static included value '{pair.value}'")
+    logger.debug(f"filter_static included value '{pair.value}'")
     return pair  # Static value
 
 
-def load_plugin(file: Path, ast: bool = False) -> Optional[object]:
+def load_plugin(file: Source, ast: bool = False) -> Optional[object]:
     """
     Loads the correct plugin for a given file.
-    Optional `ast` param enables/disables Semgrep.
+    Optional `ast` param enables/disables static code parsing (Python natively, others with Semgrep).
     Returns None if no plugin found.
+    The plugin module is imported the first time it is selected (see import_plugin).
     """
     if file.suffix in [".dist", ".template"]:
         filetype = file.stem.split(".")[-1]
@@ -111,59 +120,67 @@ def load_plugin(file: Path, ast: bool = False) -> Optional[object]:
         filetype = file.name.split(".")[-1]
 
     if filetype in ["yaml", "yml"]:
-        return Yml
+        return import_plugin("yml")
 
     elif filetype == "json":
-        return Json
+        return import_plugin("json")
 
     elif filetype == "xml":
-        return Xml
+        return import_plugin("xml")
 
     elif filetype.startswith("npmrc"):
-        return Npmrc
+        return import_plugin("npmrc")
 
     elif filetype.startswith("pypirc"):
-        return Pypirc
+        return import_plugin("pypirc")
 
     elif file.name == "pip.conf":
-        return Pip
+        return import_plugin("pip")
 
     elif file.name == "build.gradle":
-        return Gradle
+        return import_plugin("gradle")
 
     elif filetype in ["conf", "cfg", "cnf", "config", "ini", "env", "credentials", "s3cfg"]:
-        return Config
+        return import_plugin("config")
 
     elif filetype == "properties":
-        return Jproperties
+        return import_plugin("jproperties")
 
     elif filetype.startswith(("sh", "bash", "zsh", "env")):
-        return Shell
+        return import_plugin("shell")
 
     elif "dockerfile" in file.name.lower():
-        return Dockerfile
+        return import_plugin("dockerfile")
 
     elif filetype == "dockercfg":
-        return Dockercfg
+        return import_plugin("dockercfg")
 
     elif filetype.startswith("htpasswd"):
-        return Htpasswd
+        return import_plugin("htpasswd")
 
     elif filetype == "txt":
-        return Plaintext
+        return import_plugin("plaintext")
 
     elif filetype.startswith("htm"):
-        return Html
+        return import_plugin("html")
 
     elif filetype == "exs":
-        return Elixir
+        return import_plugin("elixir")
 
     elif REGEX_PRIVKEY_FILE.match(filetype):
-        return Plaintext
+        return import_plugin("plaintext")
 
-    elif ast and REGEX_AST_FILE.match(filetype):
-        from whispers.plugins.semgrep import Semgrep
+    elif ast and REGEX_PYTHON_FILE.match(filetype):
+        return import_plugin("python")  # In-process fast path
 
-        return Semgrep
+    elif ast and REGEX_AST_FILE.match(filetype):
+        return import_plugin("semgrep")
 
     return None
+
+
+@lru_cache(maxsize=None)
+def import_plugin(name: str) -> type:
+    """Plugin class from whispers.plugins.<name>, imported on first use"""
+    module = import_module(f"whispers.plugins.{name}")
+    return getattr(module, name.capitalize())
@@ -1,18 +1,21 @@
 import logging
 from argparse import Namespace
-from typing import List
+from typing import Optional
 
-from whispers.core.utils import default_rules
+from whispers.core.snapshot import load_snapshot
 from whispers.models.appconfig import AppConfig
-from whispers.models.rule import Rule
+from whispers.models.rule import Rule, RuleSet
 
+logger = logging.getLogger(__name__)
 
-def load_rules(args: Namespace, config: AppConfig) -> List[dict]:
+
+def load_rules(args: Optional[Namespace], config: AppConfig) -> RuleSet:
     """Loads applicable rules based on args and config"""
-    applicable_rules = []
+    applicable_rules = RuleSet()
 
     # Load from default rules based on rules/severity config
-    for rule in default_rules():
+    snapshot = load_snapshot()
+    for rule, compiled in zip(snapshot.rules, snapshot.compiled):
         rule_id = rule.get("id", None)
         rule_group = rule.get("group", None)
         rule_severity = rule.get("severity", None)
@@ -35,7 +38,7 @@ def load_rules(args: Namespace, config: AppConfig) -> List[dict]:
         if rule_severity not in config.include.severity:
             continue  # Severity not included
 
-        applicable_rules.append(Rule(rule))
+        applicable_rules.append(compiled or Rule(rule))
 
     # Load inline rules from config file (if any)
     for rule in config.include.rules:
@@ -44,5 +47,5 @@ def load_rules(args: Namespace, config: AppConfig) -> List[dict]:
 
         applicable_rules.append(Rule(rule))
 
-    logging.debug(f"load_rules loaded {len(applicable_rules)} rules")
+    logger.debug(f"load_rules loaded {len(applicable_rules)} rules")
     return applicable_rules
@@ -0,0 +1,88 @@
+from copy import deepcopy
+from pathlib import Path
+from sys import platform
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from whispers.core.config import read_config
+from whispers.core.constants import DEFAULT_PATH
+from whispers.core.rules import load_rules
+from whispers.core.scope import path_scope
+from whispers.core.secrets import scan_files
+from whispers.models.appconfig import AppConfig
+from whispers.models.pair import KeyValuePair
+from whispers.models.source import Buffer, MemoryFile, Source
+
+Target = Union[str, Path, Tuple[str, Union[str, Buffer]]]  # Path, or (name, contents)
+
+
+class Scanner:
+    """
+    Config and rules loaded and compiled once, for any number of scans.
+    A scanner is not modified after construction, so it can be shared across threads.
+    Logging is left to the application: nothing is configured, and records go to `whispers.*` loggers.
+
+    import whispers
+    scanner = whispers.Scanner(config="config.yml")
+    for secret in scanner.scan_text("config.yml", "password: hardcoded123"):
+        print(secret)
+    """
+
+    def __init__(
+        self,
+        config: Union[str, Path, Dict, AppConfig, None] = None,
+        rules: Optional[Iterable[Union[str, Dict]]] = None,
+        jobs: int = 1,
+    ) -> None:
+        """
+        `config` is a config file, a parsed config, or an AppConfig (default: builtin config.yml).
+        `rules` replaces the config rule IDs and inline rules to include.
+        `jobs` is the number of threads dumping Semgrep ASTs ahead of parsing (see scan_files).
+        """
+        self.config = load_scanner_config(config)
+        if rules is not None:
+            self.config.include.rules = list(rules)
+
+        self.rules = load_rules(None, self.config)
+        self.rules.index  # Compile rule index before sharing across threads
+        self.jobs = jobs
+
+    def scan_path(self, path: Union[str, Path]) -> Iterator[KeyValuePair]:
+        """Detect secrets in a file, or in files of a directory included by config"""
+        return scan_files(self.config, self.rules, path_scope(Path(path), self.config), jobs=self.jobs)
+
+    def scan_text(self, name: str, text: Union[str, Buffer]) -> Iterator[KeyValuePair]:
+        """Detect secrets in text or bytes, parsed as a file with given name"""
+        return scan_files(self.config, self.rules, [memory_file(name, text)], jobs=self.jobs)
+
+    def scan_many(self, targets: Iterable[Target]) -> Iterator[KeyValuePair]:
+        """Detect secrets in paths and (name, text) tuples, in given order"""
+        return scan_files(self.config, self.rules, self.sources(targets), jobs=self.jobs)
+
+    def sources(self, targets: Iterable[Target]) -> Iterator[Source]:
+        for target in targets:
+            if isinstance(target, tuple):
+                yield memory_file(*target)
+            else:
+                yield from path_scope(Path(target), self.config)
+
+
+def load_scanner_config(config: Union[str, Path, Dict, AppConfig, None]) -> AppConfig:
+    """Own copy of given config"""
+    if config is None:
+        config = read_config(DEFAULT_PATH.joinpath("config.yml"))
+
+    elif isinstance(config, (str, Path)):
+        config = read_config(Path(config))
+
+    elif isinstance(config, dict):
+        config = AppConfig(config)
+
+    else:
+        config = deepcopy(config)
+
+    config.ast = config.ast and not platform.startswith("win")  # Semgrep does not support Windows
+    return config
+
+
+def memory_file(name: str, text: Union[str, Buffer]) -> MemoryFile:
+    return MemoryFile(name, text.encode("utf-8") if isinstance(text, str) else text)
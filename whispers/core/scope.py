@@ -1,19 +1,101 @@
+import os
 from argparse import Namespace
 from pathlib import Path
-from typing import Iterable
+from sys import stdin
+from typing import Iterable, Iterator, List, Optional, Pattern, Tuple
 
+from whispers.core.git import diff_files, diff_path, diff_revisions, diff_root
+from whispers.core.utils import global_exception_handler, load_globs
+from whispers.models.source import MemoryFile, Source
 
-def load_scope(args: Namespace, config: dict) -> Iterable[Path]:
+
+def load_scope(args: Namespace, config: dict) -> Iterable[Source]:
     """Load a list of files in scope based on args and config"""
     src = Path(args.src)
 
+    if args.src == "-":
+        yield MemoryFile(args.stdin_name, stdin.buffer.read())
+
+    elif args.diff or args.staged:
+        yield from diff_scope(src, diff_revisions(args), config)
+
+    else:
+        yield from path_scope(src, config)
+
+
+def path_scope(src: Path, config: dict) -> Iterator[Path]:
+    """Given file, or files in given directory included by config"""
     if src.is_file():
         yield src
 
-    else:
-        for include in config.include.files:
-            for filepath in src.rglob(include):
-                if config.exclude.files and config.exclude.files.match(filepath.as_posix()):
-                    continue
+    elif src.is_dir():
+        # Single walk for all globs, so each file is yielded at most once
+        globs = load_globs(config.include.files)
+        for filepath, relpath in walk_files(src.as_posix(), config.exclude.files):
+            if globs.match(relpath):
+                yield Path(filepath)
+
+
+def diff_scope(src: Path, revisions: List[str], config: dict) -> Iterator[Path]:
+    """Files changed in given git revisions, filtered as in walk_files"""
+    root = diff_root(src)
+    globs = load_globs(config.include.files)
+    exclude = config.exclude.files
+
+    for relpath in diff_files(src, revisions):
+        if src.is_dir() and not included_path(root, relpath, globs, exclude):
+            continue
+
+        path = Path(diff_path(root, relpath))
+        if path.is_file():
+            yield path
+
+
+def included_path(root: Path, relpath: str, globs: Pattern, exclude: Optional[Pattern] = None) -> bool:
+    """Check a path relative to root against include globs, and exclude regex of the path and its directories"""
+    if exclude:
+        parts = relpath.split("/")
+        paths = ["/".join(parts[:idx]) + "/" for idx in range(1, len(parts))] + [relpath]
+        if any(exclude.match(diff_path(root, path)) for path in paths):
+            return False  # Excluded file or directory
+
+    return bool(globs.match(relpath))
+
+
+def walk_files(root: str, exclude: Optional[Pattern] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Walk directory tree with os.scandir, yielding (path, relative path) of regular files.
+    Excluded directories are pruned instead of being descended into.
+    Reuses DirEntry type information, so files are not stat'ed again.
+    """
+    prefix = "" if root == "." else root.rstrip("/") + "/"
+    stack = [(root, prefix, "")]
+
+    while stack:
+        dirpath, prefix, reldir = stack.pop()
+        subdirs = []
+
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    path = f"{prefix}{entry.name}"
+                    relpath = f"{reldir}{entry.name}"
+
+                    if entry.is_dir(follow_symlinks=False):
+                        if exclude and exclude.match(f"{path}/"):
+                            continue  # Excluded directory
+
+                        subdirs.append((path, f"{path}/", f"{relpath}/"))
+
+                    elif entry.is_file():
+                        if exclude and exclude.match(path):
+                            continue  # Excluded file
+
+                        yield path, relpath
+
+        except OSError:
+            global_exception_handler(dirpath, "walk_files()")
+            continue
 
-                yield filepath
+        # Depth-first, in directory listing order (same as Path.rglob)
+        stack.extend(reversed(subdirs))
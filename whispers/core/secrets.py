@@ -1,27 +1,88 @@
 import logging
-from typing import Iterable, Iterator, List, Optional
+from copy import copy
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
 
-from whispers.core.utils import find_line_number
+from whispers.core.cache import ScanCache
+from whispers.core.pairs import make_pairs, prefetch_ast
+from whispers.core.utils import find_line_number, global_exception_handler
+from whispers.models.appconfig import AppConfig
+from whispers.models.features import PairFeatures
 from whispers.models.pair import KeyValuePair
-from whispers.models.rule import Rule
+from whispers.models.rule import Rule, RuleIndex, RuleSet
+
+if TYPE_CHECKING:
+    from whispers.plugins.semgrep import ASTBatch
+
+logger = logging.getLogger(__name__)
+
+
+def scan_files(
+    config: AppConfig, rules: List[Rule], files: Iterable[Path], cache: Optional[ScanCache] = None, jobs: int = 1
+) -> Iterator[KeyValuePair]:
+    """
+    Detect secrets in given files.
+    With AST enabled, Semgrep dumps run ahead of parsing on up to `jobs` threads.
+    Cached scans skip this, since unchanged files are never parsed.
+    """
+    asts = None
+    if config.ast and not cache:
+        from whispers.plugins.semgrep import ASTBatch  # Imported only when AST is enabled
+
+        asts = ASTBatch(jobs)
+        files = prefetch_ast(files, asts)
+
+    for file in files:
+        yield from scan_file(config, rules, file, cache, asts)
+
+
+def scan_file(
+    config: AppConfig,
+    rules: List[Rule],
+    file: Path,
+    cache: Optional[ScanCache] = None,
+    asts: Optional["ASTBatch"] = None,
+) -> Iterable[KeyValuePair]:
+    """Detect secrets in given file, replaying cached findings for unchanged files"""
+    if not cache:
+        return detect_secrets(rules, make_pairs(config, file, asts))
+
+    try:
+        key = cache.key(file)
+
+    except OSError:
+        global_exception_handler(file.as_posix(), "scan_file()")
+        return detect_secrets(rules, make_pairs(config, file))
+
+    secrets = cache.load(key, file)
+    if secrets is None:
+        # A pair matching several rules is yielded once per rule
+        secrets = list(map(copy, detect_secrets(rules, make_pairs(config, file))))
+        cache.save(key, file, secrets)
+
+    return secrets
 
 
 def detect_secrets(rules: List[Rule], pairs: Iterable[KeyValuePair]) -> Iterator[KeyValuePair]:
-    """Detect pairs with hardcoded secrets"""
+    """Detect pairs with hardcoded secrets, checking each pair against candidate rules only"""
+    index = rules.index if isinstance(rules, RuleSet) else RuleIndex(rules)
+
     for pair in pairs:
-        detected = filter(None, map(lambda rule: filter_rule(rule, pair), rules))
+        features = PairFeatures(pair)  # Computed once, shared by all rules
+        candidates = index.candidates(pair)
+        detected = filter(None, map(lambda rule: filter_rule(rule, pair, features), candidates))
 
         yield from detected
 
 
-def filter_rule(rule: Rule, pair: KeyValuePair) -> Optional[KeyValuePair]:
+def filter_rule(rule: Rule, pair: KeyValuePair, features: Optional[PairFeatures] = None) -> Optional[KeyValuePair]:
     """Filters based on rule"""
-    if not rule.matches(pair):
-        logging.debug(f"filter_rule '{rule.id}' excluded pair '{pair}'")
+    if not rule.matches(pair, features):
+        logger.debug(f"filter_rule '{rule.id}' excluded pair '{pair}'")
         return None
 
     pair.rule = rule
     pair.line = find_line_number(pair)
 
-    logging.debug(f"filter_rule '{rule.id}' included pair '{pair}'")
+    logger.debug(f"filter_rule '{rule.id}' included pair '{pair}'")
     return pair
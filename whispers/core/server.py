@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import signal
+import socket
+import stat
+from argparse import Namespace
+from copy import copy
+from io import TextIOWrapper
+from pathlib import Path
+from socketserver import StreamRequestHandler, UnixStreamServer
+from sys import exit
+from typing import Dict, Iterator, Tuple
+
+from whispers.core.cache import evict_after, load_cache
+from whispers.core.config import load_config
+from whispers.core.constants import DEFAULT_PATH
+from whispers.core.output import write_output
+from whispers.core.rules import load_rules
+from whispers.core.scope import load_scope
+from whispers.core.secrets import scan_files
+from whispers.core.snapshot import clear_snapshot
+from whispers.models.pair import KeyValuePair
+from whispers.models.source import MemoryFile
+
+
+class ScanHandler(StreamRequestHandler):
+    """One JSON request line in, formatted findings streamed out"""
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+            if not isinstance(request, dict):
+                raise ValueError("Request is not an object")
+
+        except ValueError:
+            logging.error("ScanHandler received an invalid request")
+            return
+
+        output = TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+
+        try:
+            write_output(self.server.scan(request), output, request.get("format", "json"))
+
+        except BrokenPipeError:
+            logging.debug("ScanHandler client disconnected")
+
+        finally:
+            output.detach()
+
+
+class ScanServer(UnixStreamServer):
+    """
+    Long-running scanner listening on a Unix socket.
+    Keeps config and compiled rules warm between requests,
+    and reloads them when the config file or rule files change.
+    Requests are served one at a time.
+    """
+
+    def __init__(self, args: Namespace) -> None:
+        self.args = args
+        self.stamp: Dict[str, Tuple[int, int]] = {}
+        self.reload()
+
+        path = Path(args.serve)
+        self.claim(path)
+
+        super().__init__(path.as_posix(), ScanHandler)
+        os.chmod(path, 0o600)  # Findings contain secrets
+
+    @staticmethod
+    def claim(path: Path) -> None:
+        """
+        Make sure only the current user can serve on path, raising RuntimeError otherwise.
+        The socket directory is created private if missing, and must be owned by the current user,
+        or sticky like /tmp, so that other users cannot replace the socket.
+        A socket left by a previous server is removed, unless a server still answers on it.
+        """
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        parent = path.parent.stat()
+        if parent.st_uid != os.getuid() and not parent.st_mode & stat.S_ISVTX:
+            raise RuntimeError(f"{path.parent.as_posix()} is not owned by the current user")
+
+        if not os.path.lexists(path):
+            return
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            if client.connect_ex(path.as_posix()) == 0:
+                raise RuntimeError(f"{path.as_posix()} is in use by another server")
+
+        found = path.lstat()
+        if found.st_uid != os.getuid() or not stat.S_ISSOCK(found.st_mode):
+            raise RuntimeError(f"{path.as_posix()} exists and is not a socket of the current user")
+
+        path.unlink()  # Stale socket from a previous server
+
+    def watched(self) -> Dict[str, Tuple[int, int]]:
+        """Modification time and size of files that affect rules"""
+        configfile = Path(self.args.config) if self.args.config else DEFAULT_PATH.joinpath("config.yml")
+        stamp = {}
+
+        for file in [configfile, *DEFAULT_PATH.joinpath("rules").glob("*.yml")]:
+            try:
+                stat = file.stat()
+                stamp[file.as_posix()] = (stat.st_mtime_ns, stat.st_size)
+
+            except OSError:
+                stamp[file.as_posix()] = (0, 0)
+
+        return stamp
+
+    def reload(self) -> None:
+        """Load config and rules if the files changed since last load"""
+        stamp = self.watched()
+        if stamp == self.stamp:
+            return
+
+        clear_snapshot()
+        self.config = load_config(self.args)
+        self.rules = load_rules(self.args, self.config)
+        self.rules.index  # Compile rule index before the first request
+        self.cache = load_cache(self.args, self.config, self.rules)
+        self.stamp = stamp
+
+        logging.info(f"ScanServer loaded {len(self.rules)} rules")
+
+    def scan(self, request: dict) -> Iterator[KeyValuePair]:
+        """Detect secrets in requested paths (relative to client cwd) and buffers"""
+        self.reload()
+
+        cwd = Path(request.get("cwd", "."))
+        for src in request.get("paths", []):
+            args = copy(self.args)
+            args.src = cwd.joinpath(src).as_posix()
+            scope = load_scope(args, self.config)
+            secrets = scan_files(self.config, self.rules, scope, self.cache, self.args.jobs)
+
+            if self.args.cache:
+                secrets = evict_after(secrets, self.args)
+
+            for secret in secrets:
+                secret = copy(secret)
+                if not Path(src).is_absolute():
+                    secret.file = Path(secret.file).relative_to(cwd).as_posix()
+
+                yield secret
+
+        for buffer in request.get("buffers", []):
+            yield from self.scan_buffer(buffer["name"], buffer["data"])
+
+    def scan_buffer(self, name: str, data: str) -> Iterator[KeyValuePair]:
+        """Detect secrets in a buffer as if it was a file with given name"""
+        file = MemoryFile(name, data.encode("utf-8"))
+        yield from scan_files(self.config, self.rules, [file])
+
+
+def serve(args: Namespace) -> None:  # pragma: no cover
+    """Serve scan requests until interrupted"""
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    try:
+        server = ScanServer(args)
+
+    except RuntimeError as error:
+        exit(f"whispers: {error}")
+
+    with server:
+        logging.warning(f"Listening on {args.serve}")
+
+        try:
+            server.serve_forever()
+
+        except KeyboardInterrupt:
+            pass
+
+        finally:
+            Path(args.serve).unlink(missing_ok=True)
@@ -0,0 +1,116 @@
+import os
+import pickle
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import List, Optional
+
+from yaml import safe_load_all
+
+from whispers.__version__ import __version__
+from whispers.core.constants import DEFAULT_PATH
+from whispers.core.utils import global_exception_handler
+from whispers.models.rule import Rule
+
+SNAPSHOT: Optional["RuleSnapshot"] = None  # Loaded in this process
+
+
+@dataclass
+class RuleSnapshot:
+    """Parsed rule files and pre-built rules, keyed by a hash of the rule files"""
+
+    key: str
+    rules: List[dict]
+    compiled: List[Optional[Rule]]  # None if invalid, so load_rules() raises if it is applicable
+
+
+def snapshot_path() -> Path:
+    """Per-user snapshot file"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home().joinpath(".cache")
+    return Path(cache_home).joinpath("whispers", "rules.pickle")
+
+
+def snapshot_key(files: List[Path]) -> str:
+    """Hash of rule files and their order"""
+    digest = sha256(__version__.encode())
+
+    for file in files:
+        digest.update(file.name.encode() + b"\0")
+        digest.update(sha256(file.read_bytes()).digest())
+
+    return digest.hexdigest()
+
+
+def load_snapshot() -> RuleSnapshot:
+    """
+    Builtin and user rules from whispers/rules, parsed and compiled once.
+    The snapshot is reused across processes until any rule file changes,
+    and rule files are hashed once per process (see clear_snapshot).
+    """
+    global SNAPSHOT
+
+    if SNAPSHOT is None:
+        files = list(DEFAULT_PATH.joinpath("rules").glob("*.yml"))  # Same order as default_rules()
+        key = snapshot_key(files)
+        SNAPSHOT = read_snapshot(snapshot_path(), key) or make_snapshot(files, key)
+
+    return SNAPSHOT
+
+
+def clear_snapshot() -> None:
+    """Forget the snapshot of this process, so that the next load checks rule files again"""
+    global SNAPSHOT
+    SNAPSHOT = None
+
+
+def make_snapshot(files: List[Path], key: str) -> RuleSnapshot:
+    """Parse and compile rule files, and save the result for other processes"""
+    rules = []
+    for file in files:
+        list(map(rules.extend, safe_load_all(file.read_text())))
+
+    snapshot = RuleSnapshot(key, rules, list(map(compile_rule, rules)))
+    write_snapshot(snapshot_path(), snapshot)
+    return snapshot
+
+
+def compile_rule(rule: dict) -> Optional[Rule]:
+    """Pre-built rule, or None if invalid"""
+    try:
+        return Rule(rule)
+
+    except Exception:
+        return None
+
+
+def read_snapshot(path: Path, key: str) -> Optional[RuleSnapshot]:
+    """Snapshot with given key, or None if missing, stale or not owned by current user"""
+    try:
+        if hasattr(os, "getuid") and path.stat().st_uid != os.getuid():
+            return None
+
+        snapshot = pickle.loads(path.read_bytes())
+
+    except Exception:
+        return None
+
+    if not isinstance(snapshot, RuleSnapshot) or snapshot.key != key:
+        return None
+
+    return snapshot
+
+
+def write_snapshot(path: Path, snapshot: RuleSnapshot) -> None:
+    """Atomically store snapshot, readable by owner only"""
+    tmpfile = path.with_suffix(f".{os.getpid()}.tmp")
+
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd = os.open(tmpfile, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as fh:
+            pickle.dump(snapshot, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmpfile, path)
+
+    except OSError:
+        global_exception_handler(path.as_posix(), "write_snapshot()")
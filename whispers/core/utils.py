@@ -1,4 +1,5 @@
 import logging
+import os
 import re
 import string
 from base64 import b64decode
@@ -9,13 +10,26 @@ from jellyfish import jaro_winkler_similarity
 from luhn import verify as luhn_verify
 from yaml import safe_load, safe_load_all
 
-from whispers.core.constants import DEFAULT_PATH, REGEX_ENVVAR, REGEX_IAC, REGEX_PATH, REGEX_SEMVER, REGEX_URI
+from whispers.core.constants import (
+    CGROUP_CPU_MAX,
+    CGROUP_CPU_PERIOD,
+    CGROUP_CPU_QUOTA,
+    DEFAULT_PATH,
+    REGEX_ENVVAR,
+    REGEX_GLOB_RECURSIVE,
+    REGEX_IAC,
+    REGEX_PATH,
+    REGEX_SEMVER,
+    REGEX_URI,
+)
 from whispers.models.pair import KeyValuePair
 
+logger = logging.getLogger(__name__)
+
 
 def global_exception_handler(file: Union[str, Path], data: str = ""):
     """Global Exception Handler"""
-    logging.debug(f"Failed parsing file '{str(file)}'", exc_info=True)
+    logger.debug(f"Failed parsing file '{str(file)}'", exc_info=True)
 
 
 def load_regex(regex: str, flags: Optional[re.RegexFlag] = 0) -> Pattern:
@@ -27,6 +41,58 @@ def load_regex(regex: str, flags: Optional[re.RegexFlag] = 0) -> Pattern:
         raise ValueError(f"Failed compiling RegEx: {regex}")
 
 
+def load_globs(globs: List[str]) -> Pattern:
+    """
+    Compile recursive globs (as in Path.rglob) into a single regex
+    that matches file paths relative to the scanned directory.
+    """
+    regex = "|".join(map(glob_to_regex, globs))
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return load_regex(f"(?:{regex})\\Z", flags=flags)
+
+
+def glob_to_regex(glob: str) -> str:
+    """Translate a recursive glob into a regex statement"""
+    parts = []
+    for segment in f"**/{glob}".split("/"):
+        if segment == "**":
+            if parts and parts[-1] == REGEX_GLOB_RECURSIVE:
+                continue  # Collapse consecutive recursive segments
+
+            parts.append(REGEX_GLOB_RECURSIVE)
+            continue
+
+        regex = ""
+        idx = 0
+        while idx < len(segment):
+            char = segment[idx]
+            idx += 1
+
+            if char == "*":
+                regex += "[^/]*"
+                while idx < len(segment) and segment[idx] == "*":
+                    idx += 1
+
+            elif char == "?":
+                regex += "[^/]"
+
+            elif char == "[" and segment.find("]", idx + 1) > 0:
+                end = segment.find("]", idx + 1)
+                chars = segment[idx:end].replace("\\", "\\\\")
+                if chars.startswith("!"):
+                    chars = "^" + chars[1:]
+
+                regex += f"[{chars}]"
+                idx = end + 1
+
+            else:
+                regex += re.escape(char)
+
+        parts.append(regex + "/")
+
+    return "".join(parts).rstrip("/")
+
+
 def load_yaml_from_file(filepath: Path) -> dict:
     """Safe load yaml from given file path"""
     ret = safe_load(filepath.read_text())
@@ -242,6 +308,9 @@ def is_similar(key: str, value: str, similarity: float) -> bool:
 
 def find_line_number(pair: KeyValuePair) -> int:
     """Finds line number using pair keypath and value"""
+    if callable(pair.line):
+        pair.line = pair.line()  # Deferred by the loader
+
     if pair.line:
         return pair.line  # Already set
 
@@ -250,7 +319,7 @@ def find_line_number(pair: KeyValuePair) -> int:
     foundline = 0
 
     try:
-        with Path(pair.file).open() as fh:
+        with (pair.source or Path(pair.file)).open() as fh:
             for lineno, line in enumerate(fh, 1):
                 founditems = 0
 
@@ -285,3 +354,39 @@ def default_rules() -> List[dict]:
 def list_rule_prop(prop: str, rules: List[dict]) -> List[str]:
     """List rule property given a list of rules"""
     return sorted(set(map(lambda rule: rule[prop], rules)))
+
+
+def cpu_count() -> int:
+    """Number of CPUs available to this process, honoring cgroup CPU quota"""
+    if hasattr(os, "sched_getaffinity"):
+        count = len(os.sched_getaffinity(0))
+    else:  # pragma: no cover
+        count = os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota()
+    if quota:
+        count = min(count, quota)
+
+    return max(count, 1)
+
+
+def cgroup_cpu_quota() -> int:
+    """Reads container CPU quota (cgroup v2, then v1). Returns 0 if unlimited."""
+    try:
+        if CGROUP_CPU_MAX.exists():
+            quota, period = CGROUP_CPU_MAX.read_text().split()[:2]
+
+        elif CGROUP_CPU_QUOTA.exists():
+            quota = CGROUP_CPU_QUOTA.read_text().strip()
+            period = CGROUP_CPU_PERIOD.read_text().strip()
+
+        else:
+            return 0
+
+        if quota == "max" or int(quota) <= 0:
+            return 0  # Unlimited
+
+        return -(-int(quota) // int(period))  # Round up partial CPUs
+
+    except Exception:
+        return 0
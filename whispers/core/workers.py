@@ -0,0 +1,65 @@
+import logging
+from argparse import Namespace
+from copy import copy
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing import Pool, Queue
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+from whispers.core.cache import load_cache
+from whispers.core.config import load_config
+from whispers.core.rules import load_rules
+from whispers.core.secrets import scan_files
+from whispers.models.pair import KeyValuePair
+
+CHUNKSIZE = 16
+
+worker = {}  # Per-process config, rules and cache, set once by init_worker()
+
+
+def init_worker(args: Namespace, log_queue: Queue, log_level: int) -> None:
+    """Compile config and rules once per worker process"""
+    # Forward log records to the main process handlers
+    logger = logging.getLogger()
+    logger.handlers = [QueueHandler(log_queue)]
+    logger.setLevel(log_level)
+
+    worker["config"] = load_config(args)
+    worker["rules"] = load_rules(args, worker["config"])
+    worker["cache"] = load_cache(args, worker["config"], worker["rules"])
+
+
+def scan_worker(files: List[Path]) -> List[KeyValuePair]:
+    """
+    Detect secrets in a chunk of files using worker config and rules.
+    Semgrep ASTs of the chunk are dumped on a thread while earlier files are parsed.
+    """
+    secrets = scan_files(worker["config"], worker["rules"], files, worker["cache"])
+
+    # A pair matching several rules is yielded once per rule
+    return list(map(copy, secrets))
+
+
+def worker_args(args: Namespace) -> Namespace:
+    """Strip file handles and log handlers that cannot be sent to workers"""
+    return Namespace(**{key: value for key, value in vars(args).items() if key not in ["output", "log"]})
+
+
+def scan_parallel(args: Namespace, scope: Iterable[Path]) -> Iterator[KeyValuePair]:
+    """Distribute files across a process pool, preserving scope order"""
+    logger = logging.getLogger()
+    log_queue = Queue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    listener.start()
+
+    try:
+        initargs = (worker_args(args), log_queue, logger.level)
+        with Pool(args.jobs, initializer=init_worker, initargs=initargs) as pool:
+            files = iter(scope)
+            chunks = iter(lambda: list(islice(files, CHUNKSIZE)), [])
+            for secrets in pool.imap(scan_worker, chunks):
+                yield from secrets
+
+    finally:
+        listener.stop()
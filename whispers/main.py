@@ -1,17 +1,22 @@
-import json
 import logging
+import socket
 from argparse import Namespace
-from itertools import chain
+from multiprocessing import freeze_support
 from os import environ
+from pathlib import Path
 from sys import exit
 from typing import Iterator
 
 from whispers.core.args import parse_args
+from whispers.core.cache import evict_after, load_cache
 from whispers.core.config import load_config
-from whispers.core.pairs import make_pairs
+from whispers.core.git import added_lines, diff_revisions, filter_added
+from whispers.core.history import scan_history
+from whispers.core.output import write_output
 from whispers.core.rules import load_rules
 from whispers.core.scope import load_scope
-from whispers.core.secrets import detect_secrets
+from whispers.core.secrets import scan_files
+from whispers.core.workers import scan_parallel
 from whispers.models.pair import KeyValuePair
 
 environ["PYTHONUTF8"] = "1"
@@ -20,26 +25,53 @@ environ["PYTHONIOENCODING"] = "UTF-8"
 
 def main() -> None:  # pragma: no cover
     """Main entry point"""
+    freeze_support()  # Frozen binaries start workers by re-running this entry point
     args = parse_args()
 
-    secrets = []
-    for secret in run(args):
-        logging.warning(str(secret))
-        secrets.append(secret.to_json())
+    if args.serve:
+        if not hasattr(socket, "AF_UNIX"):
+            exit("whispers: --serve requires Unix domain sockets, which are not available on this platform")
 
-    args.output.write(json.dumps(secrets) + "\n")
+        from whispers.core.server import serve  # Imported only for --serve, needs Unix domain sockets
+
+        serve(args)
+        exit()
+
+    write_output(map(log_secret, run(args)), args.output, args.format)
 
     exit(args.exitcode)
 
 
+def log_secret(secret: KeyValuePair) -> KeyValuePair:
+    logging.warning(str(secret))
+    return secret
+
+
 def run(args: Namespace) -> Iterator[KeyValuePair]:
     """Main worker process"""
     config = load_config(args)
-    rules = load_rules(args, config)
+
+    if args.history:
+        return scan_history(config, load_rules(args, config), Path(args.src))
+
     scope = load_scope(args, config)
-    parsed = map(lambda file: make_pairs(config, file), scope)
-    detected = map(lambda pairs: detect_secrets(rules, pairs), parsed)
-    secrets = chain.from_iterable(detected)
+
+    if args.added_only and (args.diff or args.staged):
+        lines = added_lines(Path(args.src), diff_revisions(args))
+
+    if args.jobs > 1 and args.src != "-" and not Path(args.src).is_file():
+        secrets = scan_parallel(args, scope)
+
+    else:
+        rules = load_rules(args, config)
+        cache = load_cache(args, config, rules)
+        secrets = scan_files(config, rules, scope, cache, args.jobs)
+
+    if args.cache:
+        secrets = evict_after(secrets, args)
+
+    if args.added_only and (args.diff or args.staged):
+        secrets = filter_added(secrets, lines)
 
     return secrets
 
@@ -2,10 +2,9 @@ import re
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Pattern
 
-from whispers.core.constants import DEFAULT_SEVERITY
-from whispers.core.utils import default_rules, list_rule_prop, load_regex
-
-DEFAULT_RULES = default_rules()
+from whispers.core.constants import DEFAULT_SEVERITY, JSON_STREAM_SIZE
+from whispers.core.snapshot import load_snapshot
+from whispers.core.utils import list_rule_prop, load_regex
 
 
 @dataclass
@@ -13,8 +12,8 @@ class Include:
     """AppConfig include configuration class"""
 
     files: Optional[List] = field(default_factory=lambda: ["**/*"])  # globs
-    rules: Optional[List] = field(default_factory=lambda: list_rule_prop("id", DEFAULT_RULES))
-    groups: Optional[List] = field(default_factory=lambda: list_rule_prop("group", DEFAULT_RULES))
+    rules: Optional[List] = field(default_factory=lambda: list_rule_prop("id", load_snapshot().rules))
+    groups: Optional[List] = field(default_factory=lambda: list_rule_prop("group", load_snapshot().rules))
     severity: Optional[List] = field(default_factory=lambda: DEFAULT_SEVERITY)
 
 
@@ -53,8 +52,12 @@ class AppConfig:
     include: Include = field(default_factory=Include)
     exclude: Exclude = field(default_factory=Exclude)
     ast: bool = True
+    json_stream_size: int = JSON_STREAM_SIZE  # MB
+    html_scripts: bool = False
 
     def __init__(self, config: Dict = {}) -> None:
         self.include = Include(**config.get("include", {}))
         self.exclude = Exclude(**config.get("exclude", {}))
         self.ast = config.get("ast", False)
+        self.json_stream_size = config.get("json_stream_size", JSON_STREAM_SIZE)
+        self.html_scripts = config.get("html_scripts", False)
@@ -0,0 +1,71 @@
+from base64 import b64decode
+from functools import cached_property
+from typing import Optional, Union
+
+from whispers.core.utils import is_ascii, is_luhn, is_semver, is_uri, similar_strings
+from whispers.models.pair import KeyValuePair
+
+
+class Features:
+    """Properties of a pair key or value, computed on first use and shared by all rules"""
+
+    def __init__(self, data: Union[str, bytes]) -> None:
+        self.data = data
+
+    @cached_property
+    def ascii(self) -> bool:
+        return is_ascii(self.data)
+
+    @cached_property
+    def uri(self) -> bool:
+        return is_uri(self.data)
+
+    @cached_property
+    def luhn(self) -> bool:
+        return is_luhn(self.data)
+
+    @cached_property
+    def semver(self) -> bool:
+        return is_semver(self.data)
+
+    @cached_property
+    def decoded(self) -> Optional[bytes]:
+        """Base64-decoded data, or None if not decodable"""
+        try:
+            return b64decode(self.data)
+
+        except Exception:
+            return None
+
+    @cached_property
+    def base64_text(self) -> Optional["Features"]:
+        """Features of base64-decoded text (see is_base64)"""
+        if not isinstance(self.data, str) or self.decoded is None:
+            return None
+
+        try:
+            return Features(self.decoded.decode("utf-8"))
+
+        except UnicodeDecodeError:
+            return None
+
+    @cached_property
+    def base64_bytes(self) -> Optional["Features"]:
+        """Features of base64-decoded bytes (see is_base64_bytes)"""
+        if not self.decoded:
+            return None
+
+        return Features(self.decoded)
+
+
+class PairFeatures:
+    """Features of a pair, computed on first use and shared by all rules"""
+
+    def __init__(self, pair: KeyValuePair) -> None:
+        self.pair = pair
+        self.key = Features(pair.key)
+        self.value = Features(pair.value)
+
+    @cached_property
+    def similarity(self) -> float:
+        return similar_strings(self.pair.key, self.pair.value)
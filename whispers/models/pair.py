@@ -1,5 +1,7 @@
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Callable, Dict, List, Union
+
+Line = Union[int, Callable[[], int]]  # Line number, or a function finding it when needed (see find_line_number)
 
 
 @dataclass
@@ -10,18 +12,25 @@ class KeyValuePair:
     value: str
     keypath: List = field(default_factory=list)
     file: str = ""
-    line: int = 0
+    line: Line = 0
     rule: object = None
+    commit: str = ""  # Set when scanning git history
+    source: object = field(default=None, repr=False, compare=False)  # Parsed file, to find line numbers
+
+    def __getstate__(self) -> Dict:
+        line = self.line() if callable(self.line) else self.line
+        return {**self.__dict__, "line": line, "source": None}  # Do not copy or pickle file contents held in memory
 
     def __post_init__(self) -> None:
         if self.keypath == []:
             self.keypath = [self.key]
 
     def __repr__(self) -> str:
-        return f"[{self.file}:{self.line}] {self.key} = {self.value}"
+        line = "?" if callable(self.line) else self.line
+        return f"[{self.file}:{line}] {self.key} = {self.value}"
 
     def to_json(self) -> Dict:
-        return {
+        data = {
             "key": self.key,
             "value": self.value,
             "file": self.file,
@@ -30,3 +39,8 @@ class KeyValuePair:
             "message": self.rule.message,
             "severity": self.rule.severity,
         }
+
+        if self.commit:
+            data["commit"] = self.commit
+
+        return data
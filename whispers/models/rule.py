@@ -1,9 +1,11 @@
 import re
-from base64 import b64decode
+from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Pattern
+from functools import cached_property
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Tuple
 
-from whispers.core.utils import is_ascii, is_base64, is_base64_bytes, is_luhn, is_semver, is_similar, is_uri
+from whispers.core.constants import REGEX_BACKREF, REGEX_LITERAL_KEY
+from whispers.models.features import Features, PairFeatures
 from whispers.models.pair import KeyValuePair
 
 
@@ -28,31 +30,34 @@ class Specification:
         flags = re.IGNORECASE if self.ignorecase else 0
         self.regex = re.compile(self.regex, flags=flags)
 
-    def matches(self, target: str) -> bool:
+    def matches(self, target: str, features: Optional[Features] = None) -> bool:
+        """Optional `features` of target are shared across rules"""
         if len(target) < self.minlen:
             return False
 
         if self.regex and not self.regex.match(target):
             return False
 
+        features = features or Features(target)
+
         if self.isBase64 is True:
-            if is_base64(target) and self.isAscii is not False:
-                target = b64decode(target).decode("utf-8")
-            elif is_base64_bytes(target) and self.isAscii is False:
-                target = b64decode(target)
+            if features.base64_text and self.isAscii is not False:
+                features = features.base64_text
+            elif features.base64_bytes and self.isAscii is False:
+                features = features.base64_bytes
             else:
                 return False
 
-        if self.isAscii is not None and self.isAscii is not is_ascii(target):
+        if self.isAscii is not None and self.isAscii is not features.ascii:
             return False
 
-        if self.isUri is not None and self.isUri is not is_uri(target):
+        if self.isUri is not None and self.isUri is not features.uri:
             return False
 
-        if self.isLuhn is not None and self.isLuhn is not is_luhn(target):
+        if self.isLuhn is not None and self.isLuhn is not features.luhn:
             return False
 
-        if is_semver(target):
+        if features.semver:
             return False
 
         return True
@@ -100,17 +105,137 @@ class Rule:
 
         raise ValueError(f"Invalid rule '{idx}' specification: '{rule}'")
 
-    def matches(self, pair: KeyValuePair) -> bool:
-        if self.key and not self.key.matches(pair.key):
+    def matches(self, pair: KeyValuePair, features: Optional[PairFeatures] = None) -> bool:
+        """Optional `features` of pair are shared across rules"""
+        features = features or PairFeatures(pair)
+
+        if self.key and not self.key.matches(pair.key, features.key):
             return False
 
-        if self.value and not self.value.matches(pair.value):
+        if self.value and not self.value.matches(pair.value, features.value):
             return False
 
-        if is_similar(pair.key, pair.value, self.similar):
+        if features.similarity >= self.similar:
             return False
 
         if pair.key == "file" and not self.value.isFile:
             return False
 
         return True
+
+
+class RegexIndex:
+    """
+    Matches many regexes against a target in a single pass, reporting each one that matches.
+    Regexes are combined as optional lookaheads, so none of them consumes the target.
+    """
+
+    def __init__(self, regexes: List[Tuple[int, Pattern]]) -> None:
+        self.positions = [idx for idx, _ in regexes]
+        self.fallback = []  # Matched one by one
+        combined = []
+
+        for idx, regex in regexes:
+            flags = "i" if regex.flags & re.IGNORECASE else ""
+            lookahead = f"(?:(?=(?P<r{idx}>(?{flags}:{regex.pattern})))|)"
+
+            if regex.groupindex or REGEX_BACKREF.search(regex.pattern):
+                self.fallback.append((idx, regex))  # Group names and numbers would clash
+                continue
+
+            try:
+                re.compile(lookahead)
+                combined.append(lookahead)
+
+            except re.error:
+                self.fallback.append((idx, regex))  # Global inline flags, etc.
+
+        self.regex = re.compile("".join(combined)) if combined else None
+
+    def matches(self, target: str) -> Iterator[int]:
+        """Positions of all regexes matching target"""
+        for idx, regex in self.fallback:
+            if regex.match(target):
+                yield idx
+
+        if not self.regex:
+            return
+
+        groups = self.regex.match(target).groupdict()
+        for name, value in groups.items():
+            if value is not None:
+                yield int(name[1:])
+
+
+class RuleIndex:
+    """
+    Dispatch index over a list of rules, so that pairs are only checked against candidate rules:
+    - the "file" key goes to isFile rules only
+    - literal key regexes, such as ^comment$, are looked up by key
+    - other key regexes are matched in a single pass
+    - rules without a key regex are matched by value regex in a single pass
+    """
+
+    def __init__(self, rules: List[Rule]) -> None:
+        self.rules = rules
+        self.files = [idx for idx, rule in enumerate(rules) if rule.value and rule.value.isFile]
+        self.literals = defaultdict(list)
+        self.literals_ignorecase = defaultdict(list)
+        self.always = []
+        keys = []
+        values = []
+
+        for idx, rule in enumerate(rules):
+            key_regex = rule.key.regex if rule.key else None
+            value_regex = rule.value.regex if rule.value else None
+            literal = REGEX_LITERAL_KEY.match(key_regex.pattern) if key_regex else None
+
+            if literal and not key_regex.flags & re.IGNORECASE:
+                self.literals[literal[1]].append(idx)
+
+            elif literal and literal[1].isascii():
+                self.literals_ignorecase[literal[1].lower()].append(idx)
+
+            elif key_regex:
+                keys.append((idx, key_regex))
+
+            elif value_regex:
+                values.append((idx, value_regex))
+
+            else:
+                self.always.append(idx)
+
+        self.keys = RegexIndex(keys)
+        self.values = RegexIndex(values)
+        self.keyed = [idx for idx, rule in enumerate(rules) if rule.key and rule.key.regex]
+
+    def candidates(self, pair: KeyValuePair) -> List[Rule]:
+        """Rules that may match given pair, in rule order"""
+        if pair.key == "file":
+            return [self.rules[idx] for idx in self.files]
+
+        found = set(self.always)
+
+        if isinstance(pair.key, str):
+            found.update(self.literals.get(pair.key, []))
+            found.update(self.literals_ignorecase.get(pair.key.lower(), []))
+            found.update(self.keys.matches(pair.key))
+
+        else:
+            found.update(self.keyed)  # Not indexable
+
+        if isinstance(pair.value, str):
+            found.update(self.values.matches(pair.value))
+
+        else:
+            found.update(self.values.positions)  # Not indexable
+
+        return [self.rules[idx] for idx in sorted(found)]
+
+
+class RuleSet(list):
+    """List of rules with a dispatch index, built on first use (rules must not change afterwards)"""
+
+    @cached_property
+    def index(self) -> RuleIndex:
+        return RuleIndex(self)
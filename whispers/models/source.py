@@ -0,0 +1,88 @@
+import mmap
+import os
+from contextlib import contextmanager
+from io import BytesIO, TextIOWrapper
+from pathlib import Path, PurePosixPath
+from tempfile import TemporaryDirectory
+from typing import IO, Iterator, Optional, Union
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class MemoryFile:
+    """
+    In-memory source: contents (bytes or any buffer, such as a memory-mapped view)
+    and a logical file name, which selects the plugin and is reported as the secret file.
+    Provides the subset of the Path interface that plugins use to read files.
+    """
+
+    def __init__(self, path: str, data: Buffer) -> None:
+        self.path = PurePosixPath(path)
+        self.data = data
+
+    def __repr__(self) -> str:
+        return f"MemoryFile('{self.path}', {len(self.data)} bytes)"
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    @classmethod
+    def map_file(cls, path: Union[str, Path], name: Optional[str] = None) -> "MemoryFile":
+        """Read-only memory-mapped view of a file on disk, optionally under another logical name"""
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+        return cls(name or Path(path).as_posix(), data)
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def suffix(self) -> str:
+        return self.path.suffix
+
+    @property
+    def stem(self) -> str:
+        return self.path.stem
+
+    def as_posix(self) -> str:
+        return self.path.as_posix()
+
+    def exists(self) -> bool:
+        return True
+
+    def is_file(self) -> bool:
+        return True
+
+    def open(self, mode: str = "r", encoding: Optional[str] = None, errors: Optional[str] = None) -> IO:
+        if "b" in mode:
+            return BytesIO(self.data)
+
+        return TextIOWrapper(BytesIO(self.data), encoding=encoding or "utf-8", errors=errors)
+
+    def read_bytes(self) -> bytes:
+        return bytes(self.data)
+
+    def read_text(self, encoding: Optional[str] = None, errors: Optional[str] = None) -> str:
+        return str(self.data, encoding or "utf-8", errors or "strict")
+
+    @contextmanager
+    def on_disk(self) -> Iterator[Path]:
+        """
+        Temporary copy with the same file name, for parsers that only read from disk.
+        Removed on exit.
+        """
+        with TemporaryDirectory() as tmpdir:
+            file = Path(tmpdir).joinpath(self.name)
+            file.write_bytes(self.data)
+            yield file
+
+
+Source = Union[Path, MemoryFile]  # File on disk, or in-memory contents with a logical file name
+
+
+def source_size(file: Source) -> int:
+    """Size in bytes"""
+    return memoryview(file.data).nbytes if isinstance(file, MemoryFile) else file.stat().st_size
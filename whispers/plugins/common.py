@@ -34,7 +34,7 @@ class Common:
         uri = urlparse(text)
 
         if uri.password:
-            yield KeyValuePair("uri_creds", f"{uri.username}:{uri.password}", [*self.keypath, text])
+            yield KeyValuePair("uri_creds", f"{uri.username}:{uri.password}", [*self.keypath, text], line=self.line)
 
         if uri.query:
             for key, value in parse_qsl(uri.query):
@@ -1,55 +1,100 @@
-from configparser import ConfigParser, MissingSectionHeaderError
-from itertools import chain
-from pathlib import Path
-from typing import Iterator, Optional
+from configparser import ConfigParser
+from typing import Dict, Iterable, Iterator, Tuple
 
-from crossplane import parse as nginx_parse
+from crossplane.lexer import _lex_file_object as lex_nginx  # Lexes lines from any iterable, not only files
 
+from whispers.core.constants import REGEX_CONFIG_ASSIGNMENT, REGEX_CONFIG_LINE, REGEX_NGINX_DIRECTIVE
 from whispers.core.utils import strip_string
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import MemoryFile, Source
 from whispers.plugins.common import Common
-from whispers.plugins.traverse import StructuredDocument
-from whispers.plugins.xml import Xml
+from whispers.plugins.lines import match_lines
 
 
 class Config:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        if "<?xml " in filepath.open("r").readline():
-            yield from Xml().pairs(filepath)
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        """
+        Read the file once, classify it cheaply, and parse it with the one parser its format calls for:
+        XML if the first line is an XML prolog, otherwise see config_format.
+        """
+        data = filepath.read_bytes()
+
+        if b"<?xml " in data.split(b"\n", 1)[0]:
+            from whispers.plugins.xml import Xml  # Imported only for XML configs
+
+            yield from Xml().pairs(MemoryFile(filepath.as_posix(), data))
+            return
+
+        text = data.decode("utf-8")
+        found = self.config_format(text)
+
+        if found == "ini":
+            yield from self.parse_as_ini(text, filepath.as_posix())
+
+        elif found == "nginx":
+            yield from self.parse_as_nginx(text)
 
         else:
-            # Attempt to parse as Nginx config
-            yield from self.parse_as_nginx(filepath)
+            yield from self.parse_as_text(text)
 
-            try:
-                # Attempt to parse as Windows INI
-                yield from self.parse_as_ini(filepath)
+    @staticmethod
+    def config_format(text: str) -> str:
+        """
+        Classify config text without parsing it:
+        "ini" if the first line that is not empty or a comment is a section header,
+        "nginx" if it is a directive and there are no key=value lines,
+        otherwise "text".
+        """
+        first = REGEX_CONFIG_LINE.search(text)
+        if not first:
+            return "text"
+
+        if ConfigParser.SECTCRE.match(first.group(1)):
+            return "ini"
+
+        if REGEX_NGINX_DIRECTIVE.match(first.group(1)) and not REGEX_CONFIG_ASSIGNMENT.search(text):
+            return "nginx"
 
-            except MissingSectionHeaderError:
-                # Otherwise, parse as text line by line
-                yield from self.parse_as_text(filepath)
+        return "text"
 
     @staticmethod
-    def parse_as_ini(filepath: Path) -> Optional[KeyValuePair]:
-        """Parse file as Windows .ini"""
+    def parse_as_ini(text: str, name: str = "<string>") -> Iterator[KeyValuePair]:
+        """Parse text as Windows .ini"""
         parser = ConfigParser()
-        parser.read(filepath.as_posix())
-        sections = map(lambda section: section.items(), parser.values())
-        items = chain.from_iterable(sections)
+        parser.read_string(text, name)
+        lines = Config.ini_lines(parser, text)
 
-        for item in items:
-            key, value = item
-            yield KeyValuePair(key, value)
+        for section in parser.values():
+            for key, value in section.items():
+                line = lines.get((section.name, key)) or lines.get((parser.default_section, key), 0)
+                yield KeyValuePair(key, value, line=line)
 
     @staticmethod
-    def parse_as_text(filepath: Path) -> Optional[KeyValuePair]:
-        """Parse as plain text"""
-        for lineno, line in enumerate(filepath.open(), 1):
-            line = line.strip()
-            if "=" not in line:
+    def ini_lines(parser: ConfigParser, text: str) -> Dict[Tuple[str, str], int]:
+        """Line of every (section, option) in .ini text, using the parser's own syntax"""
+        lines = {}
+        section = parser.default_section
+
+        for lineno, line in enumerate(text.splitlines(), 1):
+            if not line.strip() or line[0].isspace():
+                continue  # Empty or continuation line
+
+            header = parser.SECTCRE.match(line)
+            if header:
+                section = header.group("header")
                 continue
 
-            key, value = line.split("=", 1)
+            option = parser.OPTCRE.match(line)
+            if option:
+                lines.setdefault((section, parser.optionxform(option.group("option").rstrip())), lineno)
+
+        return lines
+
+    @staticmethod
+    def parse_as_text(text: str) -> Iterator[KeyValuePair]:
+        """Parse as plain text"""
+        for lineno, line in match_lines(text, "="):
+            key, value = line.strip().split("=", 1)
             key = strip_string(key)
             value = strip_string(value)
 
@@ -57,22 +102,36 @@ class Config:
                 yield KeyValuePair(key, value, line=lineno)
 
     @staticmethod
-    def parse_as_nginx(filepath: Path) -> Optional[Iterator[KeyValuePair]]:
-        """Parse file as nginx.conf"""
-        nginx_conf = nginx_parse(filepath, strict=False, single=True)
-        if nginx_conf.get("status") != "ok":
-            return  # skip failed (ie: not nginx.conf format)
-
-        pairs = StructuredDocument().traverse(nginx_conf)
-        args = filter(lambda pair: pair.key == "args", pairs)
+    def parse_as_nginx(text: str) -> Iterator[KeyValuePair]:
+        """Parse text as nginx.conf"""
+        tokens = lex_nginx(text.splitlines(keepends=True))
+        args = Config.nginx_args(tokens)
 
         while True:
             try:
-                key = next(args).value
-                value = next(args).value
+                key, _ = next(args)
+                value, line = next(args)
                 keypath = [key, value]
-                yield KeyValuePair(key, value, keypath, filepath.as_posix())
-                yield from Common(keypath).parse_uri(value)
+                yield KeyValuePair(key, value, keypath, line=line)
+                yield from Common(keypath, line).parse_uri(value)
 
             except Exception:
                 return
+
+    @staticmethod
+    def nginx_args(tokens: Iterable[Tuple[str, int, bool]]) -> Iterator[Tuple[str, int]]:
+        """Arguments of nginx directives with their line numbers, in document order"""
+        line = 0  # Line of current directive, 0 between directives
+
+        for token, lineno, quoted in tokens:
+            if not quoted and token in [";", "{", "}"]:
+                line = 0
+
+            elif not quoted and token.startswith("#"):
+                continue  # Comment
+
+            elif not line:
+                line = lineno  # Directive name
+
+            else:
+                yield token, line
@@ -1,12 +1,12 @@
 import json
-from pathlib import Path
 from typing import Iterator
 
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
 
 
 class Dockercfg:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
         config = json.loads(filepath.read_text())
         key = "auth"
         keypath = ["auths", key]
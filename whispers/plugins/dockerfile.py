@@ -1,12 +1,13 @@
-from pathlib import Path
 from typing import Iterator
 
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+from whispers.plugins.lines import scan_lines
 
 
 class Dockerfile:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        for lineno, line in enumerate(filepath.open(), 1):
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        for lineno, line in scan_lines(filepath, "ENV "):
             # ENV key=value
             if line.startswith("ENV "):
                 item = line.replace("ENV ", "", 1)
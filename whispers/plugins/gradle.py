@@ -1,19 +1,16 @@
-from pathlib import Path
 from typing import Iterator
 
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+from whispers.plugins.lines import scan_lines
 
 
 class Gradle:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
         key = "password"
 
-        for lineno, line in enumerate(filepath.open(), 1):
+        for lineno, line in scan_lines(filepath, key):
             line = line.strip()
-
-            if key not in line:
-                continue
-
             value = line.split(key)[-1].strip(":) ")
             if value:
                 yield KeyValuePair(key, value, line=lineno)
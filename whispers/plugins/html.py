@@ -1,17 +1,94 @@
-from pathlib import Path
-from typing import Iterator
-
-from bs4 import BeautifulSoup, Comment
+from html.parser import HTMLParser
+from typing import Iterator, List, Optional, Tuple
 
+from whispers.core.constants import HTML_CHUNK, REGEX_SCRIPT_STRING
 from whispers.core.utils import truncate_all_space
+from whispers.models.appconfig import AppConfig
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+from whispers.plugins.common import Common
 
 
 class Html:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        soup = BeautifulSoup(filepath.read_text(), "lxml")
+    def __init__(self, scripts: bool = False) -> None:
+        self.scripts = scripts  # Also report string literals of inline <script> elements
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "Html":
+        """Plugin with options from config (html_scripts)"""
+        return cls(config.html_scripts)
+
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        """Comments, read in chunks and tokenized without building a document tree"""
+        parser = HtmlTokenizer(self.scripts)
+
+        with filepath.open() as fh:
+            for chunk in iter(lambda: fh.read(HTML_CHUNK), ""):
+                parser.feed(chunk)
+                yield from parser.flush()
+
+        parser.close()
+        yield from parser.flush()
+
+
+class HtmlTokenizer(HTMLParser):
+    """Collects comments and inline script string literals with their line numbers, as they are parsed"""
+
+    def __init__(self, scripts: bool = False) -> None:
+        super().__init__()
+        self.scripts = scripts
+        self.found: List[KeyValuePair] = []
+        self.script: Optional[List[str]] = None  # Text of current inline <script>, if scripts
+        self.script_line = 0
+
+    def flush(self) -> Iterator[KeyValuePair]:
+        """Pairs found since last flush"""
+        found, self.found = self.found, []
+        yield from found
+
+    def handle_comment(self, data: str) -> None:
         key = "comment"
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment = truncate_all_space(comment.extract()).strip()
-            if comment:
-                yield KeyValuePair(key, comment, [key])
+        comment = truncate_all_space(data).strip()
+        if comment:
+            line = self.getpos()[0] + data.count("\n", 0, len(data) - len(data.lstrip()))  # Where text starts
+            self.found.append(KeyValuePair(key, comment, [key], line=line))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self.scripts and tag == "script" and "src" not in dict(attrs):
+            self.script = []
+
+    def handle_data(self, data: str) -> None:
+        if self.script is None:
+            return
+
+        if not self.script:
+            self.script_line = self.getpos()[0]
+
+        self.script.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag != "script" or self.script is None:
+            return
+
+        self.found.extend(self.script_strings("".join(self.script), self.script_line))
+        self.script = None
+
+    @staticmethod
+    def script_strings(code: str, line: int) -> Iterator[KeyValuePair]:
+        """
+        String literals in JavaScript code, keyed by the name they are assigned to, if any.
+        Examples:
+            var password = "hardcoded"
+            {"apiKey": 'hardcoded'}
+        """
+        pos = 0
+
+        for match in REGEX_SCRIPT_STRING.finditer(code):
+            key, value = match.group("key") or "script", match.group("value")
+            if not value:
+                continue
+
+            line += code.count("\n", pos, match.start())
+            pos = match.start()
+            yield KeyValuePair(key, value, [key], line=line)
+            yield from Common([key], line).pairs(value)
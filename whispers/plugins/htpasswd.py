@@ -1,16 +1,14 @@
-from pathlib import Path
 from typing import Iterator
 
 from whispers.core.utils import strip_string
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+from whispers.plugins.lines import scan_lines
 
 
 class Htpasswd:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        for lineno, line in enumerate(filepath.open(), 1):
-            if ":" not in line:
-                continue
-
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        for lineno, line in scan_lines(filepath, ":"):
             creds = line.strip().split(":")
             value = strip_string(creds[1])
             if value:
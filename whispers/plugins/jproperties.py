@@ -1,14 +1,28 @@
-from pathlib import Path
 from typing import Iterator
 
 from jproperties import Properties
 
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+
+
+class LineProperties(Properties):
+    """Properties that records the line of every key"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines = {}
+
+    def _parse_key(self, single_line_only: bool = False) -> str:
+        line = self._line_number  # Key may span multiple lines
+        key = super()._parse_key(single_line_only)
+        self.lines[key] = line
+        return key
 
 
 class Jproperties:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        props = Properties()
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        props = LineProperties()
         props.load(filepath.read_text(), "utf-8")
         for key, value in props.properties.items():
-            yield KeyValuePair(key, value, [key])
+            yield KeyValuePair(key, value, [key], line=props.lines.get(key, 0))
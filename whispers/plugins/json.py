@@ -1,43 +1,341 @@
 import json
 import re
-from pathlib import Path
-from typing import Dict, Iterator
+from functools import partial
+from json.decoder import scanstring
+from json.scanner import make_scanner
+from typing import Any, Callable, Dict, Generator, Iterator, List, Optional, TextIO, Tuple
 
+from whispers.core.constants import JSON_STREAM_CHUNK, JSON_STREAM_SIZE, REGEX_JSON_SCALAR, REGEX_JSON_WHITESPACE
 from whispers.core.utils import global_exception_handler
+from whispers.models.appconfig import AppConfig
 from whispers.models.pair import KeyValuePair
-from whispers.plugins.traverse import StructuredDocument
+from whispers.models.source import Source, source_size
+from whispers.plugins.traverse import Lines, StructuredDocument
+
+
+class JsonLines:
+    """
+    Lines of values in JSON text loaded with the C decoder, found only when needed (see find_line_number).
+    Lookups return functions that scan the text for containers on the path to the value, each container once,
+    counting line breaks from the last offset found, as findings come in document order.
+    """
+
+    def __init__(self, document: str, code: Any) -> None:
+        self.document = document
+        self.code = code
+        self.parents: Dict[int, Tuple[int, Any]] = {}  # id(container): (id(parent), key), on first lookup
+        self.offsets: Dict[int, Dict[Any, int]] = {}  # id(container): {key or index: offset of value}
+        self.scan_once = make_scanner(json.JSONDecoder())
+        self.offset = 0  # Last offset found
+        self.lineno = 1  # Line at offset
+
+    def get(self, item: Tuple[int, Any], default: int = 0) -> Callable[[], int]:
+        """Function finding the line of (id(container), key or index)"""
+        return partial(self.line, *item)
+
+    def line(self, container: int, key: Any) -> int:
+        offset = self.find(container, key)
+        if offset is None:
+            return 0
+
+        if offset < self.offset:
+            self.offset, self.lineno = 0, 1
+
+        self.lineno += self.document.count("\n", self.offset, offset)
+        self.offset = offset
+        return self.lineno
+
+    def find(self, container: int, key: Any) -> Optional[int]:
+        """Offset of the value of container[key] in the text"""
+        if container not in self.offsets:
+            start = self.start(container)
+            self.offsets[container] = {} if start is None else self.members(start)
+
+        return self.offsets[container].get(key)
+
+    def start(self, container: int) -> Optional[int]:
+        """Offset of container in the text"""
+        if container == id(self.code):
+            return self.whitespace(0)
+
+        if not self.parents:
+            self.parents = dict(self.nested(self.code))
+
+        if container not in self.parents:
+            return None
+
+        return self.find(*self.parents[container])
+
+    @staticmethod
+    def nested(code: Any) -> Iterator[Tuple[int, Tuple[int, Any]]]:
+        """Nested containers, as (id(container), (id(parent), key or index))"""
+        stack = [code]
+        while stack:
+            container = stack.pop()
+            for key, value in container.items() if isinstance(container, dict) else enumerate(container):
+                if isinstance(value, (dict, list)):
+                    yield id(value), (id(container), key)
+                    stack.append(value)
+
+    def whitespace(self, pos: int) -> int:
+        return REGEX_JSON_WHITESPACE.match(self.document, pos).end()
+
+    def members(self, start: int) -> Dict[Any, int]:
+        """Offsets of the values of the object or array at start, skipping each value with the C scanner"""
+        document = self.document
+        offsets = {}
+        is_object = document[start] == "{"
+        pos = self.whitespace(start + 1)
+
+        while document[pos] not in "}]":
+            if is_object:
+                key, pos = scanstring(document, pos + 1)
+                pos = self.whitespace(self.whitespace(pos) + 1)  # After ":"
+            else:
+                key = len(offsets)
+
+            offsets[key] = pos  # The last of duplicate keys, as loaded
+            _, pos = self.scan_once(document, pos)
+            pos = self.whitespace(pos)
+
+            if document[pos] == ",":
+                pos = self.whitespace(pos + 1)
+
+        return offsets
+
+
+class JsonStream(StructuredDocument):
+    """
+    Incremental JSON parser for very large files, in memory bounded by chunk size and the longest string.
+    Yields the same pairs as StructuredDocument.traverse, with keypaths and lines, while reading.
+    Differences: CloudFormation parameters are only recognized if AWSTemplateFormatVersion comes first,
+    and the special key/value format only applies to scalar values.
+    """
+
+    CONTAINER = object()  # Returned by value() for objects and arrays
+
+    def __init__(self, fh: TextIO, chunk: int = JSON_STREAM_CHUNK) -> None:
+        self.fh = fh
+        self.chunk = chunk
+        self.buffer = ""
+        self.pos = 0
+        self.line = 1  # Line at pos
+        self.eof = False
+        self.cloudformation = False
+
+    def pairs(self) -> Iterator[KeyValuePair]:
+        code = yield from self.value([], None)
+        if isinstance(code, str):
+            yield from self.string(code, [], 0)
+
+        if self.skip():
+            raise self.error("Extra data")
+
+    def fill(self) -> bool:
+        """Read next chunk, dropping parsed text. False at end of file"""
+        data = "" if self.eof else self.fh.read(self.chunk)
+        self.eof = not data
+        pos, self.pos = self.pos, 0
+        self.buffer = self.buffer[pos:] + data
+        return not self.eof
+
+    def skip(self) -> str:
+        """Skip whitespace, returning next character, or "" at end of file"""
+        while True:
+            end = REGEX_JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            self.line += self.buffer.count("\n", self.pos, end)
+            self.pos = end
+
+            if end < len(self.buffer):
+                return self.buffer[end]
+
+            if not self.fill():
+                return ""
+
+    def error(self, message: str) -> ValueError:
+        return ValueError(f"{message} at line {self.line}")
+
+    def expect(self, delimiters: str, message: str) -> str:
+        char = self.skip()
+        if not char or char not in delimiters:
+            raise self.error(message)
+
+        self.pos += 1
+        return char
+
+    def value(self, keypath: List, key: Any) -> Generator[KeyValuePair, None, Any]:
+        """Pairs in the value at current position. Returns the value if scalar"""
+        char = self.skip()
+        if char == "{":
+            yield from self.object(keypath)
+            return self.CONTAINER
+
+        if char == "[":
+            yield from self.array(keypath, key)
+            return self.CONTAINER
+
+        if char == '"':
+            return self.scan_string()
+
+        return self.scan_scalar()
+
+    def object(self, keypath: List) -> Iterator[KeyValuePair]:
+        self.pos += 1
+        special = {}  # Scalar "key" and "value" members, with line
+        cloudformation = self.cloudformation and len(keypath) == 2 and keypath[0] == "Parameters"
+
+        if self.skip() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            if self.skip() != '"':
+                raise self.error("Expecting property name enclosed in double quotes")
+
+            key = self.scan_string()
+            self.expect(":", "Expecting ':' delimiter")
+            self.skip()
+
+            line = self.line
+            v_keypath = [*keypath, key]
+            v = yield from self.value(v_keypath, key)
+
+            if not keypath and key == "AWSTemplateFormatVersion":
+                self.cloudformation = True
+
+            if v is not self.CONTAINER:
+                if key in ["key", "value"]:
+                    special[key] = (v, line)
+
+                if cloudformation and key == "Default":
+                    yield KeyValuePair(keypath[1], v, ["Parameters", "Default", keypath[1]], line=line)
+
+                if isinstance(v, (str, int)):
+                    yield KeyValuePair(key, v, v_keypath, line=line)
+
+                if isinstance(v, str):
+                    yield from self.string(v, v_keypath, line)
+
+            if self.expect(",}", "Expecting ',' delimiter") == "}":
+                break
+
+        # Special key/value format
+        if "key" in special and "value" in special:
+            yield KeyValuePair(special["key"][0], special["value"][0], list(keypath), line=special["value"][1])
+
+    def array(self, keypath: List, key: Any) -> Iterator[KeyValuePair]:
+        self.pos += 1
+
+        if self.skip() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            self.skip()
+            line = self.line
+            item = yield from self.value(keypath, key)
+
+            if item is not self.CONTAINER and isinstance(item, (str, int)):
+                yield KeyValuePair(key, item, list(keypath), line=line)
+
+            if isinstance(item, str):
+                yield from self.string(item, keypath, line)
+
+            if self.expect(",]", "Expecting ',' delimiter") == "]":
+                break
+
+    def scan_string(self) -> str:
+        """String at current position, reading more chunks until it is terminated"""
+        while True:
+            try:
+                value, self.pos = scanstring(self.buffer, self.pos + 1)
+                return value
+
+            except json.JSONDecodeError as error:
+                truncated = error.msg.startswith("Unterminated") or error.pos >= len(self.buffer) - 6
+                if not (truncated and self.fill()):
+                    raise self.error(error.msg)
+
+    def scan_scalar(self) -> Any:
+        """Number, true, false or null at current position"""
+        while True:
+            match = REGEX_JSON_SCALAR.match(self.buffer, self.pos)
+            if (not match or len(self.buffer) - match.end() < 3) and not self.eof:
+                self.fill()
+                continue  # Possibly truncated, such as "1." before "5" or "1e" before "-5"
+
+            if not match:
+                raise self.error("Expecting value")
+
+            self.pos = match.end()
+            integer, fraction, exponent = match.groups()
+
+            if integer is None:
+                return {"true": True, "false": False, "null": None}[match[0]]
+
+            if fraction or exponent:
+                return float(match[0])
+
+            return int(integer)
 
 
 class Json(StructuredDocument):
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
+    def __init__(self, stream_size: int = JSON_STREAM_SIZE) -> None:
+        self.stream_size = stream_size  # MB
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "Json":
+        """Plugin with options from config (json_stream_size)"""
+        return cls(config.json_stream_size)
+
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
         """
         Try to load JSON as is. Otherwise, try as a custom format.
+        Files larger than stream_size are parsed incrementally instead (see JsonStream).
         """
+        if source_size(filepath) > self.stream_size * 1024 * 1024:
+            yield from self.stream(filepath)
+            return
+
         try:
-            document = json.load(filepath.open())
+            document, lines = self.load_json(filepath.read_text())
 
         except json.decoder.JSONDecodeError:
-            document = self.load_custom_json(filepath)
+            document, lines = self.load_custom_json(filepath)
 
-        yield from self.traverse(document)
+        yield from self.traverse(document, lines)
 
     @staticmethod
-    def load_custom_json(filepath: Path) -> Dict:
+    def stream(filepath: Source) -> Iterator[KeyValuePair]:
+        try:
+            with filepath.open("r") as fh:
+                yield from JsonStream(fh).pairs()
+
+        except ValueError:  # Invalid JSON or encoding
+            global_exception_handler(filepath.as_posix(), "Json.stream()")
+
+    @staticmethod
+    def load_json(document: str) -> Tuple[Any, Lines]:
+        """Load JSON with the C decoder. Lines of values are found later, for findings only (see JsonLines)"""
+        code = json.loads(document)
+        return code, JsonLines(document, code)
+
+    def load_custom_json(self, filepath: Source) -> Tuple[Dict, Lines]:
         """
-        Try converting custom JSON to a parsable format:
+        Try converting custom JSON to a parsable format, preserving line numbers:
         - Remove lines that start with // comments
         - Strip // comments from the end the line
         """
         document = ""
         for line in filepath.open("r").readlines():
             if line.startswith("//"):
-                continue
+                line = "\n"
             line = re.sub(r" // ?.*$", "", line)
             document += line
 
         try:
-            return json.loads(document)
+            return self.load_json(document)
 
         except Exception:
             global_exception_handler(filepath.as_posix(), document)
-            return {}
+            return {}, {}
@@ -0,0 +1,67 @@
+import mmap
+from typing import Iterator, Tuple
+
+from whispers.models.source import MemoryFile, Source
+
+SPARSE_LINES = 4  # Lines per marker, above which marked lines are found directly instead of checking every line
+
+
+def read_text(filepath: Source) -> str:
+    """Contents decoded at once, from a memory-mapped view for files on disk"""
+    if isinstance(filepath, MemoryFile):
+        return filepath.read_text()
+
+    file = MemoryFile.map_file(filepath)
+    try:
+        return file.read_text()
+
+    finally:
+        if isinstance(file.data, mmap.mmap):
+            file.data.close()
+
+
+def match_lines(text: str, marker: str = "") -> Iterator[Tuple[int, str]]:
+    """
+    Lines of text containing marker (all lines if empty), with their line numbers.
+    Lines are split as in files opened in text mode, without line breaks.
+    Sparse markers are searched in the whole text, so that other lines cost nothing,
+    otherwise the text is split once and every line is checked.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    if marker and text.count(marker) * SPARSE_LINES < text.count("\n"):
+        yield from find_lines(text, marker)
+        return
+
+    lines = text.split("\n")
+    if not lines[-1]:
+        lines.pop()  # After the last line break
+
+    for lineno, line in enumerate(lines, 1):
+        if marker in line:
+            yield lineno, line
+
+
+def find_lines(text: str, marker: str) -> Iterator[Tuple[int, str]]:
+    """Lines of text containing marker, counting line breaks only between them"""
+    lineno = 1
+    pos = 0
+    start = text.find(marker)
+
+    while start != -1:
+        begin = text.rfind("\n", 0, start) + 1
+        end = text.find("\n", start)
+        if end == -1:
+            end = len(text)
+
+        lineno += text.count("\n", pos, begin)
+        pos = begin
+        yield lineno, text[begin:end]
+
+        start = text.find(marker, end)
+
+
+def scan_lines(filepath: Source, marker: str = "") -> Iterator[Tuple[int, str]]:
+    """Lines of a file containing marker, with their line numbers (see match_lines)"""
+    yield from match_lines(read_text(filepath), marker)
@@ -1,15 +1,13 @@
-from pathlib import Path
 from typing import Iterator
 
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+from whispers.plugins.lines import scan_lines
 
 
 class Npmrc:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        for lineno, line in enumerate(filepath.open(), 1):
-            if ":_authToken=" not in line:
-                continue
-
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        for lineno, line in scan_lines(filepath, ":_authToken="):
             value = line.split(":_authToken=")[-1].strip()
             if value:
                 key = "npm authToken"
@@ -1,16 +1,14 @@
-from pathlib import Path
 from typing import Iterator
 from urllib.parse import urlparse
 
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+from whispers.plugins.lines import scan_lines
 
 
 class Pip:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        for lineno, line in enumerate(filepath.open(), 1):
-            if "http" not in line:
-                continue
-
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        for lineno, line in scan_lines(filepath, "http"):
             value = urlparse(line.split("=")[-1].strip()).password
             if value:
                 key = "pip password"
@@ -1,14 +1,15 @@
-from pathlib import Path
 from typing import Iterator
 
 from whispers.core.utils import strip_string
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
 from whispers.plugins.common import Common
+from whispers.plugins.lines import scan_lines
 
 
 class Plaintext:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        for lineno, line in enumerate(filepath.open(), 1):
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        for lineno, line in scan_lines(filepath):
             line = strip_string(line)
             if not line:
                 continue
@@ -0,0 +1,130 @@
+import ast
+from typing import Iterator, List, Optional
+
+from whispers.core.utils import global_exception_handler
+from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+
+
+class Python:
+    """
+    In-process Python extractor built on the stdlib `ast` module.
+    Yields the same pairs as Semgrep.traverse, with exact line numbers.
+    """
+
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        try:
+            tree = ast.parse(filepath.read_bytes(), filepath.as_posix())
+
+        except (SyntaxError, ValueError, RecursionError):
+            global_exception_handler(filepath.as_posix(), "Python.pairs()")
+            return
+
+        yield from filter(lambda pair: pair.key and pair.value, self.traverse(tree))
+
+    def traverse(self, tree: ast.AST) -> Iterator[KeyValuePair]:
+        """Walk AST in source order yielding pairs"""
+        stack = [tree]
+
+        while stack:
+            node = stack.pop()
+
+            if isinstance(node, ast.Assign):
+                for target in node.targets:
+                    yield from self.assign(target, node.value)
+
+            elif isinstance(node, ast.AnnAssign) and node.value:
+                yield from self.assign(node.target, node.value)
+
+            elif isinstance(node, ast.Call):
+                yield from self.call(node)
+
+            elif isinstance(node, ast.Dict):
+                for key, value in zip(node.keys, node.values):
+                    yield self.pair(self.literal(key), value)
+
+            elif isinstance(node, ast.Compare):
+                yield from self.compare(node)
+
+            stack.extend(reversed(list(ast.iter_child_nodes(node))))
+
+    def assign(self, target: ast.AST, value: ast.AST) -> Iterator[KeyValuePair]:
+        """Assignment of a literal, including tuple unpacking"""
+        if isinstance(target, (ast.Tuple, ast.List)):
+            values = value.elts if isinstance(value, (ast.Tuple, ast.List)) else [value] * len(target.elts)
+            for key, item in zip(target.elts, values):
+                yield from self.assign(key, item)
+
+        elif isinstance(value, ast.Call) and self.literal(getattr(value.func, "value", None)) is not None:
+            # "{}".format("literal")
+            yield self.pair(self.name(target), value.args[0] if value.args else None)
+
+        elif isinstance(value, ast.BoolOp) and isinstance(value.op, ast.Or):
+            # getenv("KEY") or "default"
+            yield self.pair(self.name(target), value.values[-1])
+
+        else:
+            yield self.pair(self.name(target), value)
+
+    def call(self, node: ast.Call) -> Iterator[KeyValuePair]:
+        """Keyword arguments, and getenv-style (key, default) arguments"""
+        for keyword in node.keywords:
+            if keyword.arg:
+                yield self.pair(keyword.arg, keyword.value)
+
+        if len(node.args) >= 2:
+            default = node.args[1]
+            if isinstance(default, ast.IfExp):
+                default = default.orelse
+
+            yield self.pair(self.literal(node.args[0]), default)
+
+    def compare(self, node: ast.Compare) -> Iterator[KeyValuePair]:
+        """Equality comparisons of a name and a literal"""
+        operands = [node.left, *node.comparators]
+
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if not isinstance(op, (ast.Eq, ast.NotEq)):
+                continue
+
+            if self.literal(right) is not None:
+                yield self.pair(self.name(left), right)
+
+            else:
+                yield self.pair(self.name(right), left)
+
+    def pair(self, key: Optional[str], node: Optional[ast.AST]) -> KeyValuePair:
+        """Pair of key and literal value node, at the line of the value"""
+        value = self.literal(node)
+        line = getattr(node, "lineno", 0) if value else 0
+        return KeyValuePair(key or "", value or "", line=line)
+
+    @staticmethod
+    def name(node: ast.AST) -> str:
+        """Key name of a variable, attribute or subscript"""
+        if isinstance(node, ast.Name):
+            return node.id
+
+        elif isinstance(node, ast.Attribute):
+            return node.attr
+
+        elif isinstance(node, ast.Subscript):
+            index = node.slice
+            if isinstance(index, getattr(ast, "Index", ())):
+                index = index.value  # Python 3.8
+
+            return Python.literal(index) or Python.name(index)
+
+        return ""
+
+    @staticmethod
+    def literal(node: Optional[ast.AST]) -> Optional[str]:
+        """String literal value, including f-strings without placeholders"""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+
+        elif isinstance(node, ast.JoinedStr):
+            parts: List[Optional[str]] = list(map(Python.literal, node.values))
+            return None if None in parts else "".join(parts)
+
+        return None
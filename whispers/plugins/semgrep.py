@@ -1,13 +1,21 @@
-from itertools import zip_longest
+import logging
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from itertools import islice, zip_longest
 from json import loads as json_loads
-from logging import debug
 from pathlib import Path
-from subprocess import check_output
-from typing import Any, Dict, Iterable, List, Tuple
+from shutil import which
+from subprocess import DEVNULL, PIPE, CalledProcessError, run
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from whispers.core.constants import MAP_AST_LANG, REGEX_AST_FILE_VERSION
+from whispers.core.constants import AST_PREFETCH_WINDOW, MAP_AST_LANG, REGEX_AST_FILE_VERSION
 from whispers.core.utils import global_exception_handler
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
+
+logger = logging.getLogger(__name__)
 
 
 class AST:
@@ -48,24 +56,52 @@ class AST:
         lang = REGEX_AST_FILE_VERSION.sub("", ext)
         return MAP_AST_LANG.get(lang, lang)
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def semgrep_core() -> Optional[str]:
+        """
+        Locate the semgrep-core binary shipped with Semgrep.
+        Calling it directly skips the start-up cost of the `semgrep` CLI wrapper.
+        """
+        core = which("semgrep-core")
+        if core:
+            return core
+
+        spec = find_spec("semgrep")
+        if not spec or not spec.submodule_search_locations:
+            return None  # pragma: no cover
+
+        core = Path(spec.submodule_search_locations[0]).joinpath("bin", "semgrep-core")
+        return core.as_posix() if core.is_file() else None
+
     @staticmethod
     def dump(filepath: str) -> str:
         """Dump AST using Semgrep"""
-        argv = [
-            "semgrep",
-            "scan",
-            "--metrics=off",
-            "--quiet",
-            "--dump-ast",
-            "--json",
-            f"--lang={AST.language(filepath)}",
-            filepath,
-        ]
-
-        debug(f"{__name__}.AST.dump: {' '.join(argv)}")
+        core = AST.semgrep_core()
+        if core:
+            argv = [core, "-lang", AST.language(filepath), "-json", "-dump_ast", filepath]
+
+        else:  # pragma: no cover
+            argv = [
+                "semgrep",
+                "scan",
+                "--metrics=off",
+                "--quiet",
+                "--dump-ast",
+                "--json",
+                f"--lang={AST.language(filepath)}",
+                filepath,
+            ]
+
+        logger.debug(f"AST.dump: {' '.join(argv)}")
 
         try:
-            return check_output(argv).decode()
+            # semgrep-core exits with 1 on partial parsing errors, but still dumps the AST
+            result = run(argv, stdout=PIPE, stderr=DEVNULL)
+            if not result.stdout.strip():
+                raise CalledProcessError(result.returncode, argv)
+
+            return result.stdout.decode()
 
         except Exception:
             global_exception_handler(filepath)
@@ -220,9 +256,97 @@ class AST:
         yield from pairs
 
 
+class ASTBatch:
+    """
+    Dumps ASTs of upcoming files ahead of parsing, so that Semgrep runs
+    while previous files are being traversed and checked.
+    Files are grouped by language and split into batches,
+    which are dumped with bounded parallelism across languages.
+    """
+
+    def __init__(self, jobs: int = 1, window: int = AST_PREFETCH_WINDOW) -> None:
+        self.jobs = max(jobs, 1)
+        self.window = window
+        self.pending: Dict[str, Future] = {}
+
+    def prefetch(self, files: Iterable[Path], select: Callable[[Path], bool]) -> Iterator[Path]:
+        """Pass files through, dumping ASTs of selected files one window ahead"""
+        files = iter(files)
+
+        with ThreadPoolExecutor(self.jobs) as pool:
+            try:
+                block = list(islice(files, self.window))
+                self.submit(pool, filter(select, block))
+
+                while block:
+                    upcoming = list(islice(files, self.window))
+                    self.submit(pool, filter(select, upcoming))
+                    yield from block
+                    self.discard(block)
+                    block = upcoming
+
+            finally:
+                self.discard(list(self.pending))
+
+    def submit(self, pool: ThreadPoolExecutor, files: Iterable[Path]) -> None:
+        """Submit per-language batches of (filepath, future) to the pool"""
+        languages = defaultdict(list)
+        for file in files:
+            filepath = file.as_posix()
+            future = Future()
+            self.pending[filepath] = future
+            languages[AST.language(filepath)].append((filepath, future))
+
+        for batch in languages.values():
+            jobs = min(self.jobs, len(batch))
+            for idx in range(jobs):
+                pool.submit(ASTBatch.run, batch[idx::jobs])
+
+    def discard(self, files: Iterable) -> None:
+        """Cancel and forget prefetched ASTs that were never parsed"""
+        for file in files:
+            future = self.pending.pop(file if isinstance(file, str) else file.as_posix(), None)
+            if future:
+                future.cancel()
+
+    def dump(self, filepath: str) -> str:
+        """Prefetched AST of given file, or dump it now if not prefetched"""
+        future = self.pending.pop(filepath, None)
+        if not future or future.cancelled():
+            return AST.dump(filepath)
+
+        try:
+            return future.result()
+
+        except Exception:
+            global_exception_handler(filepath)
+            return "{}"
+
+    @staticmethod
+    def run(batch: List[Tuple[str, Future]]) -> None:
+        for filepath, future in batch:
+            if not future.set_running_or_notify_cancel():
+                continue  # Discarded
+
+            try:
+                future.set_result(AST.dump(filepath))
+
+            except BaseException as error:
+                future.set_exception(error)
+
+
 class Semgrep:
-    def pairs(self, filepath: Path) -> Iterable[KeyValuePair]:
-        ast = json_loads(AST.dump(filepath.as_posix()))
+    def __init__(self, batch: Optional[ASTBatch] = None) -> None:
+        self.dump = batch.dump if batch else AST.dump
+
+    def pairs(self, filepath: Source) -> Iterable[KeyValuePair]:
+        if not isinstance(filepath, Path):
+            with filepath.on_disk() as tmpfile:  # semgrep-core reads files from disk
+                yield from self.pairs(tmpfile)
+
+            return
+
+        ast = json_loads(self.dump(filepath.as_posix()))
         pairs = filter(lambda pair: pair.key and pair.value, self.traverse(ast))
         yield from pairs
 
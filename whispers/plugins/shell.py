@@ -1,13 +1,14 @@
 import shlex
-from pathlib import Path
 from typing import Iterator, List, Tuple
 
 from whispers.core.constants import ESCAPED_CHARS
 from whispers.core.utils import KeyValuePair, global_exception_handler, strip_string
+from whispers.models.source import Source
+from whispers.plugins.lines import scan_lines
 
 
 class Shell:
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
         for cmdline, lineno in self.read_commands(filepath):
             try:
                 cmd = shlex.split(cmdline)
@@ -23,9 +24,9 @@ class Shell:
             if cmd[0].lower() == "curl":
                 yield from self.curl(cmd, lineno)
 
-    def read_commands(self, filepath: Path) -> Tuple[str, int]:
+    def read_commands(self, filepath: Source) -> Tuple[str, int]:
         ret = []
-        for lineno, line in enumerate(filepath.open(), 1):
+        for lineno, line in scan_lines(filepath):
             line = line.strip()
             if line.startswith("#"):  # Comments
                 line = line.lstrip("#").strip()
@@ -75,7 +76,7 @@ class Shell:
 
             credentials = strip_string(cmd[idx + 1])
             if indicator in indicators_single:
-                yield KeyValuePair(key, credentials, [key])
+                yield KeyValuePair(key, credentials, [key], line=lineno)
 
             else:
                 if ":" not in credentials:
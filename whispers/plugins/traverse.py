@@ -1,46 +1,63 @@
-from typing import Iterator, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
-from whispers.models.pair import KeyValuePair
+from whispers.models.pair import KeyValuePair, Line
 from whispers.plugins.common import Common
 from whispers.plugins.shell import Shell
 
+Lines = Dict[tuple, Line]  # (id(container), key or index): line, recorded by the loader (or see JsonLines)
+
 
 class StructuredDocument:
-    def __init__(self):
-        self.keypath = []
+    """
+    Traversal of loaded YAML/JSON documents.
+    Keypath and lines are passed along instead of kept on the instance, so traversal is re-entrant.
+    """
+
+    @staticmethod
+    def line(lines: Lines, container: Any, key: Any) -> Line:
+        """Line of the value at container[key], or 0 if unknown"""
+        return lines.get((id(container), key), 0)
 
-    def traverse(self, code, key=None) -> Optional[Iterator[KeyValuePair]]:
+    def traverse(
+        self, code, lines: Lines = {}, keypath: List = [], key=None, line=0
+    ) -> Optional[Iterator[KeyValuePair]]:
         """Recursively traverse YAML/JSON document"""
         if isinstance(code, dict):
-            yield from self.cloudformation(code)
+            yield from self.cloudformation(code, lines, keypath)
 
             for k, v in code.items():
-                self.keypath.append(k)
+                v_keypath = [*keypath, k]
+                v_line = self.line(lines, code, k)
                 if isinstance(v, (str, int)):
-                    yield KeyValuePair(k, v, list(self.keypath))
+                    yield KeyValuePair(k, v, v_keypath, line=v_line)
 
-                yield from self.traverse(v, key=k)
-                self.keypath.pop()
+                yield from self.traverse(v, lines, v_keypath, key=k, line=v_line)
 
             # Special key/value format
             elements = list(code.keys())
             if "key" in elements and "value" in elements:
-                yield KeyValuePair(code["key"], code["value"], list(self.keypath))
+                yield KeyValuePair(code["key"], code["value"], list(keypath), line=self.line(lines, code, "value"))
 
         elif isinstance(code, list):
-            for item in code:
+            for idx, item in enumerate(code):
+                item_line = self.line(lines, code, idx)
                 if isinstance(item, (str, int)):
-                    yield KeyValuePair(key, item, list(self.keypath))
+                    yield KeyValuePair(key, item, list(keypath), line=item_line)
 
-                yield from self.traverse(item, key=key)
+                yield from self.traverse(item, lines, keypath, key=key, line=item_line)
 
         elif isinstance(code, str):
-            yield from Shell().variables([code])
-            yield from Common(self.keypath).pairs(code)
+            yield from self.string(code, keypath, line)
+
+    @staticmethod
+    def string(code: str, keypath: List, line: int) -> Iterator[KeyValuePair]:
+        """Pairs embedded in a string value"""
+        yield from Shell().variables([code], line)
+        yield from Common(keypath, line).pairs(code)
 
-    def cloudformation(self, code: dict) -> Iterator[KeyValuePair]:
+    def cloudformation(self, code: dict, lines: Lines, keypath: List) -> Iterator[KeyValuePair]:
         """AWS CloudFormation format"""
-        if self.keypath:
+        if keypath:
             return  # Not tree root
 
         if "AWSTemplateFormatVersion" not in code:
@@ -54,4 +71,4 @@ class StructuredDocument:
                 continue  # No default value
 
             keypath = ["Parameters", "Default", key]
-            yield KeyValuePair(key, values["Default"], keypath)
+            yield KeyValuePair(key, values["Default"], keypath, line=self.line(lines, values, "Default"))
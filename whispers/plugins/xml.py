@@ -1,76 +1,107 @@
-from pathlib import Path
-from typing import Iterator
+from typing import Iterator, List, Optional
 
 from lxml import etree as ElementTree
 
 from whispers.core.utils import global_exception_handler
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
 from whispers.plugins.common import Common
 
 
 class Xml:
-    def __init__(self):
-        self.keypath = []
-
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        def _traverse(tree):
-            """Traverse XML document"""
-            for event, element in tree:
-                if event == "end":
-                    self.keypath.pop()
-                    continue
-
-                self.keypath.append(element.tag)
-
-                # Format: <elem key="value">
-                for key, value in element.attrib.items():
-                    self.keypath.append(key)
-                    yield KeyValuePair(key, value, list(self.keypath))
-
-                    # Format: <elem name="jdbc:mysql://host?k1=v1&amp;k2=v2">
-                    yield from Common(self.keypath).pairs(value)
-
-                    self.keypath.pop()
-
-                # Format: <elem key=a value=b>
-                if "key" in element.attrib and "value" in element.attrib:
-                    yield KeyValuePair(element.attrib["key"], element.attrib["value"], list(self.keypath))
-
-                # Format: <key>value</key>
-                if not element.text:
-                    continue
-
-                yield KeyValuePair(element.tag, element.text, list(self.keypath))
-                yield from Common(self.keypath).pairs(element.text)
-
-                # Format: <elem>key=value</elem>
-                if "=" in element.text:
-                    item = element.text.split("=")
-                    if len(item) == 2:
-                        self.keypath.append(item[0])
-                        yield KeyValuePair(item[0], item[1], list(self.keypath))
-                        self.keypath.pop()
-
-                # Format: <key>name</key><value>string</value>
-                found_key = None
-                found_value = None
-                for item in element:
-                    if str(item.tag).lower() == "key":
-                        found_key = item.text
-                    elif str(item.tag).lower() == "value":
-                        found_value = item.text
-
-                if found_key and found_value:
-                    self.keypath.append(found_key)
-                    yield KeyValuePair(found_key, found_value, list(self.keypath))
-                    yield from Common(self.keypath).pairs(found_value)
-                    self.keypath.pop()
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        """
+        Parse XML incrementally, clearing each element once it is processed,
+        so that memory does not grow with document size.
+        Attributes are reported when an element starts, its text and <key>/<value> children when it ends.
+        """
+        keypath = []  # Per call, so pairs() is re-entrant
+        children = []  # Per open element: [key, value, value line] from its <key>/<value> children
 
         try:
-            parser = ElementTree.XMLParser(recover=True)
-            tree = ElementTree.parse(filepath.as_posix(), parser)
-            tree = ElementTree.iterwalk(tree, events=("start", "end"))
-            yield from _traverse(tree)
+            with filepath.open("rb") as fh:
+                for event, element in ElementTree.iterparse(fh, events=("start", "end"), recover=True):
+                    if event == "start":
+                        keypath.append(element.tag)
+                        children.append([None, None, 0])
+                        yield from self.attributes(element, keypath)
+                        continue
+
+                    yield from self.text(element, keypath)
+                    yield from self.key_value(keypath, *children.pop())
+
+                    if children:
+                        self.child(element, children[-1])
+
+                    keypath.pop()
+                    self.release(element)
 
         except Exception:
-            global_exception_handler(filepath.as_posix(), tree)
+            global_exception_handler(filepath.as_posix(), "Xml.pairs()")
+
+    @staticmethod
+    def attributes(element, keypath: List[str]) -> Iterator[KeyValuePair]:
+        line = element.sourceline or 0
+
+        # Format: <elem key="value">
+        for key, value in element.attrib.items():
+            keypath.append(key)
+            yield KeyValuePair(key, value, list(keypath), line=line)
+
+            # Format: <elem name="jdbc:mysql://host?k1=v1&amp;k2=v2">
+            yield from Common(keypath, line).pairs(value)
+
+            keypath.pop()
+
+        # Format: <elem key=a value=b>
+        if "key" in element.attrib and "value" in element.attrib:
+            yield KeyValuePair(element.attrib["key"], element.attrib["value"], list(keypath), line=line)
+
+    @staticmethod
+    def text(element, keypath: List[str]) -> Iterator[KeyValuePair]:
+        """Pairs from element text, which is complete once the element ends"""
+        if not element.text:
+            return
+
+        line = element.sourceline or 0
+
+        # Format: <key>value</key>
+        yield KeyValuePair(element.tag, element.text, list(keypath), line=line)
+        yield from Common(keypath, line).pairs(element.text)
+
+        # Format: <elem>key=value</elem>
+        if "=" in element.text:
+            item = element.text.split("=")
+            if len(item) == 2:
+                keypath.append(item[0])
+                yield KeyValuePair(item[0], item[1], list(keypath), line=line)
+                keypath.pop()
+
+    @staticmethod
+    def key_value(keypath: List[str], key: Optional[str], value: Optional[str], line: int) -> Iterator[KeyValuePair]:
+        # Format: <key>name</key><value>string</value>
+        if key and value:
+            keypath.append(key)
+            yield KeyValuePair(key, value, list(keypath), line=line)
+            yield from Common(keypath, line).pairs(value)
+            keypath.pop()
+
+    @staticmethod
+    def child(element, parent: list) -> None:
+        """Remember <key> and <value> children in their parent, before they are cleared"""
+        tag = str(element.tag).lower()
+        if tag == "key":
+            parent[0] = element.text
+
+        elif tag == "value":
+            parent[1] = element.text
+            parent[2] = element.sourceline or 0
+
+    @staticmethod
+    def release(element) -> None:
+        """Free a processed element and its preceding siblings, keeping the tree as deep as the current path"""
+        element.clear(keep_tail=True)
+
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
@@ -1,56 +1,103 @@
-import re
-from pathlib import Path
 from typing import Iterator
 
 import yaml
 from yaml.parser import ParserError
-from yaml.resolver import Resolver
 
+from whispers.core.constants import REGEX_YAML_TEMPLATE, REGEX_YAML_UNQUOTED
 from whispers.core.utils import global_exception_handler
 from whispers.models.pair import KeyValuePair
+from whispers.models.source import Source
 from whispers.plugins.traverse import StructuredDocument
 
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml
+
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader
+
+
+class YmlLoader(SafeLoader):
+    """
+    SafeLoader (libyaml if available) that records the line of every mapping value and sequence item.
+    Resolvers and constructors are customized on this class only, so SafeLoader is left unchanged.
+    """
+
+    def __init__(self, stream: str) -> None:
+        super().__init__(stream)
+        self.lines = {}
+
+    def construct_yaml_map(self, node: yaml.MappingNode) -> Iterator[dict]:
+        data = {}
+        yield data
+        data.update(self.construct_mapping(node))
+
+        for key_node, value_node in node.value:
+            key = self.construct_object(key_node)
+            self.lines[(id(data), key)] = value_node.start_mark.line + 1
+
+    def construct_yaml_seq(self, node: yaml.SequenceNode) -> Iterator[list]:
+        data = []
+        yield data
+        data.extend(self.construct_sequence(node))
+
+        for idx, item_node in enumerate(node.value):
+            self.lines[(id(data), idx)] = item_node.start_mark.line + 1
+
+    def construct_tagged(self, tag_suffix: str, node: yaml.Node) -> str:
+        """Values with custom tags, such as IaC syntax"""
+        return f"{tag_suffix} {self.construct_scalar(node)}"
+
+
+# Remove resolvers for on/off/yes/no
+YmlLoader.yaml_implicit_resolvers = {
+    first: list(resolvers)
+    for first, resolvers in SafeLoader.yaml_implicit_resolvers.items()
+    if first not in list("OoYyNn")
+}
+YmlLoader.add_constructor("tag:yaml.org,2002:map", YmlLoader.construct_yaml_map)
+YmlLoader.add_constructor("tag:yaml.org,2002:seq", YmlLoader.construct_yaml_seq)
+YmlLoader.add_multi_constructor("", YmlLoader.construct_tagged)
+
 
 class Yml(StructuredDocument):
-    def __init__(self):
-        super().__init__()
+    def pairs(self, filepath: Source) -> Iterator[KeyValuePair]:
+        with filepath.open("r") as fh:
+            document = self.preprocess(fh.read())
 
-        # Remove resolvers for on/off/yes/no
-        list(map(lambda idx: Resolver.yaml_implicit_resolvers.pop(idx, None), "OoYyNn"))
+        try:
+            loader = YmlLoader(document)
+            try:
+                # Documents separated by --- are traversed one at a time
+                while loader.check_data():
+                    loader.lines = {}
+                    code = loader.get_data()
+                    yield from self.traverse(code, loader.lines)
 
-    def pairs(self, filepath: Path) -> Iterator[KeyValuePair]:
-        def _constructor(loader, tag_suffix, node):
-            """This is needed to parse IaC syntax"""
-            ret = loader.construct_scalar(node)
-            return f"{tag_suffix} {ret}"
+            finally:
+                loader.dispose()
+
+        except ParserError:
+            global_exception_handler(filepath.as_posix(), document)
 
+    @staticmethod
+    def preprocess(document: str) -> str:
         """
-        Convert custom YAML to parsable YAML
-        - Skip ---
+        Convert custom YAML to parsable YAML in linear time, preserving line numbers
         - Quote unquoted values such as {{ placeholder }}
         - Remove text between <% %> and {% %}
-        - Remove comments that start with #
         """
-        regex_unquoted = re.compile(r".+(\[)?\{\{.*\}\}(\])?")
-        document = ""
-
-        for line in filepath.open("r").readlines():
-            if line.startswith("---"):
-                continue
+        if "{{" in document:
+            lines = document.split("\n")
+            document = "\n".join(map(quote_placeholders, lines))
 
-            if regex_unquoted.match(line):
-                line = line.replace("{{", "'{{").replace("}}", "}}'")
+        if "<%" in document or "{%" in document:
+            document = REGEX_YAML_TEMPLATE.sub(lambda match: "\n" * match[0].count("\n"), document)
 
-            document += line
+        return document
 
-        document = re.sub(r"[<{]%.*?%[}>]", "", document, flags=re.MULTILINE | re.DOTALL)
-        document = re.sub(r"^#.*$", "", document)
 
-        # Load converted YAML
-        try:
-            yaml.add_multi_constructor("", _constructor, Loader=yaml.SafeLoader)
-            code = yaml.safe_load(document)
-            yield from self.traverse(code)
+def quote_placeholders(line: str) -> str:
+    if "{{" not in line or not REGEX_YAML_UNQUOTED.match(line):
+        return line
 
-        except ParserError:
-            global_exception_handler(filepath.as_posix(), document)
+    return line.replace("{{", "'{{").replace("}}", "}}'")